@@ -4,3 +4,16 @@ from django.apps import AppConfig
 class BillsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.bills"
+
+    def ready(self):
+        from apps.bills.models import Bill
+        from apps.bills.serializers import (
+            FullFetchBillSerilizer,
+            UserFetchBillSerilizer,
+        )
+        from utils.cache_utils import register_generation_signals
+        from utils.serializer_cache import register_serialized_cache
+
+        # Drops cached counts on writes
+        register_generation_signals(Bill)
+        register_serialized_cache(Bill, FullFetchBillSerilizer, UserFetchBillSerilizer)
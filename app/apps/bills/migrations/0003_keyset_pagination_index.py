@@ -0,0 +1,18 @@
+# Generated by Django 5.2.2 on 2026-10-18 12:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bills", "0002_alter_bill_sponsored_by_alter_bill_supported_by"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="bill",
+            index=models.Index(
+                fields=["created_at", "id"], name="bills_bill_created_14e160_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.2 on 2026-10-18 12:10
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+SEARCH_VECTOR_EXPRESSION = """
+    setweight(to_tsvector('english', coalesce({row}title, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce({row}bill_no, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce({row}topics_in_the_bill, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce({row}summary, '')), 'C')
+"""
+
+CREATE_SEARCH_VECTOR_TRIGGER = f"""
+CREATE OR REPLACE FUNCTION bills_bill_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := {SEARCH_VECTOR_EXPRESSION.format(row="NEW.")};
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER bills_bill_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, bill_no, topics_in_the_bill, summary, search_vector
+    ON bills_bill
+    FOR EACH ROW EXECUTE FUNCTION bills_bill_search_vector_update();
+
+UPDATE bills_bill SET search_vector = {SEARCH_VECTOR_EXPRESSION.format(row="")};
+"""
+
+DROP_SEARCH_VECTOR_TRIGGER = """
+DROP TRIGGER IF EXISTS bills_bill_search_vector_trigger ON bills_bill;
+DROP FUNCTION IF EXISTS bills_bill_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bills", "0003_keyset_pagination_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bill",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="bill",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="bills_bill_search_vector_idx"
+            ),
+        ),
+        migrations.RunSQL(
+            CREATE_SEARCH_VECTOR_TRIGGER, reverse_sql=DROP_SEARCH_VECTOR_TRIGGER
+        ),
+    ]
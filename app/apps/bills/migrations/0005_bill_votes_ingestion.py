@@ -0,0 +1,31 @@
+# Generated by Django 5.2.2 on 2026-10-18 12:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bills", "0004_bill_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bill",
+            name="votes_ingestion_status",
+            field=models.CharField(
+                choices=[
+                    ("PENDING", "Pending"),
+                    ("PROCESSING", "Processing"),
+                    ("COMPLETED", "Completed"),
+                    ("FAILED", "Failed"),
+                ],
+                max_length=15,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="bill",
+            name="votes_ingestion_summary",
+            field=models.JSONField(null=True),
+        ),
+    ]
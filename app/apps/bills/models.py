@@ -1,4 +1,6 @@
 import uuid
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from utils.enum_utils import HouseChoices
 
@@ -13,6 +15,13 @@ class BillStatus(models.TextChoices):
     ASCENTED = "ASSENTED"
 
 
+class VoteIngestionStatus(models.TextChoices):
+    PENDING = "PENDING"
+    PROCESSING = "PROCESSING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
 class Bill(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     title = models.CharField(max_length=150)
@@ -46,10 +55,22 @@ class Bill(models.Model):
     metadata = models.JSONField(null=True)
     file_url = models.CharField(max_length=100, null=True)
     last_updated_by = models.CharField(max_length=20, null=True)
+    # Maintained by a DB trigger from title, bill_no, topics_in_the_bill and summary
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Parsing of the last uploaded vote file (apps.votes.tasks.ingest_vote_file)
+    votes_ingestion_status = models.CharField(
+        max_length=15, choices=VoteIngestionStatus.choices, null=True
+    )
+    votes_ingestion_summary = models.JSONField(null=True)  # file, row counts, errors
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name_plural = "bills"
         ordering = ["-created_at"]
-        indexes = [models.Index(fields=["summary", "topics_in_the_bill"])]
+        indexes = [
+            models.Index(fields=["summary", "topics_in_the_bill"]),
+            # Keyset (cursor) pagination
+            models.Index(fields=["created_at", "id"]),
+            GinIndex(fields=["search_vector"], name="bills_bill_search_vector_idx"),
+        ]
@@ -5,7 +5,10 @@ from apps.helpers.general import GenericFilterSerializer
 from apps.representatives.models import Representative
 from utils.enum_utils import HouseChoices
 from apps.bills.models import Bill, BillStatus
-from utils.file_utils.models import GenericFileUploadSerilizer
+from utils.file_utils.models import (
+    GenericFileUploadSerilizer,
+    GenericMultipartFileUploadSerializer,
+)
 
 logger = logging.getLogger("app_logger")
 
@@ -13,7 +16,7 @@ logger = logging.getLogger("app_logger")
 class FullFetchBillSerilizer(serializers.ModelSerializer):
     class Meta:
         model = Bill
-        fields = "__all__"
+        exclude = ("search_vector",)
 
 
 class UserFetchBillSerilizer(serializers.ModelSerializer):
@@ -28,6 +31,7 @@ class UserFetchBillSerilizer(serializers.ModelSerializer):
             "last_updated_by",
             "created_at",
             "updated_at",
+            "search_vector",
         )
 
 
@@ -129,6 +133,13 @@ class BillFileUploadSerializer(GenericFileUploadSerilizer):
     )
 
 
+class BillMultipartFileUploadSerializer(GenericMultipartFileUploadSerializer):
+    id = serializers.CharField(
+        default="6134fc82-0faa-4bed-b7a2-edbcf541a3c9",
+        help_text="Id of the bill",
+    )
+
+
 class BillUpdateSerializer(serializers.Serializer):
     title = serializers.CharField(default="Finance Bill 2024", required=False)
     status = serializers.ChoiceField(
@@ -165,3 +176,30 @@ class BillUpdateSerializer(serializers.Serializer):
         required=False, help_text="E.g agriculture, local seeds, radioactive waste"
     )
     metadata = serializers.DictField(required=False)
+
+    def update(self, instance, validated_data):
+        for field, value in validated_data.items():
+            setattr(instance, field, value)
+        # Bill.save sets updated_at and bumps the Bill cache generation
+        instance.save()
+        return instance
+
+
+class BillSearchSerializer(serializers.Serializer):
+    q = serializers.CharField(
+        required=True,
+        help_text='Search terms e.g finance "kengen tax" -agriculture',
+    )
+    search_type = serializers.ChoiceField(
+        # No "raw", a to_tsquery syntax error in user input would be a 500
+        choices=["websearch", "phrase", "plain"],
+        default="websearch",
+        help_text="websearch supports quoted phrases, OR and -exclusions",
+    )
+    highlight = serializers.BooleanField(
+        default=True, help_text="Adds title/summary snippets with <mark> tags"
+    )
+    house = serializers.ChoiceField(required=False, choices=HouseChoices.choices)
+    status = serializers.ChoiceField(required=False, choices=BillStatus.choices)
+    page = serializers.IntegerField(default=1)
+    items_per_page = serializers.IntegerField(default=10)
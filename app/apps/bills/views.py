@@ -1,27 +1,45 @@
-import math
 import os
 from rest_framework.generics import CreateAPIView, GenericAPIView
 from rest_framework import status
-from utils.file_utils.models import GenericObjectResponse
+from utils.file_utils.models import FileDeliverySerializer, GenericObjectResponse
 from utils.error_handler import process_error_response
 from utils.generics import add_request_data_to_span
 from utils.auth import has_expected_permissions, CustomTokenAuthentication
+from utils.cache_utils import cache_response
+from utils.serializer_cache import serialize_cached, serialize_object_cached
 from apps.bills.models import Bill
+from apps.helpers.conditional import (
+    etag_headers,
+    model_condition,
+    not_modified_response,
+)
+from apps.helpers.pagination import add_count_to_pagination, paginate_queryset
 from utils.enum_utils import FileTypeEnum
-from utils.file_utils.generic_file_utils import file_upload_to_s3, get_s3_file_data
+from utils.file_utils.generic_file_utils import (
+    UPLOAD_PARSER_CLASSES,
+    file_upload_to_s3,
+    get_s3_file_data,
+    get_s3_file_etag,
+    get_upload_request_data,
+    presigned_file_response,
+    split_s3_url,
+)
 from apps.bills import serializers
 from drf_spectacular.utils import extend_schema
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db.models import F
 import logging
 from rest_framework.response import Response
 from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
-from django.views.decorators.vary import vary_on_cookie
 from opentelemetry import trace
 
 
 tracer = trace.get_tracer(__name__)
 logger = logging.getLogger("app_logger")
 
+# Must match the config used by the search_vector trigger (bills migration 0004)
+BILL_SEARCH_CONFIG = "english"
+
 
 class CreateBill(CreateAPIView):
     serializer_class = serializers.UserFetchBillSerilizer
@@ -64,8 +82,7 @@ class FilterBills(GenericAPIView):
             return serializers.FullFetchBillSerilizer
 
     @extend_schema(tags=["Bills"], parameters=[serializers.BillFilterSerializer])
-    @method_decorator(cache_page(7200))
-    @method_decorator(vary_on_cookie)
+    @cache_response(Bill)
     def get(self, request):
         return self.get_queryset()
 
@@ -126,23 +143,15 @@ class FilterBills(GenericAPIView):
         if self.request.GET.get("updated_at_end"):
             filter_params["updated_at__lte"] = self.request.GET.get("updated_at_end")
 
-        page = int(self.request.GET.get("page", "1"))
-        items_per_page = int(self.request.GET.get("items_per_page", "10"))
-        offset = (page - 1) * items_per_page
-
         bill_objects = Bill.objects
-        queryset = bill_objects.filter(**filter_params)[
-            offset : (offset + items_per_page)
-        ]
-        object_count = bill_objects.count()
-        pagination_info = {
-            "page": page,
-            "items_per_page": items_per_page,
-            "total_pages": int(math.ceil(object_count / items_per_page)),
-        }
+        queryset, pagination_info = paginate_queryset(
+            self.request, bill_objects.filter(**filter_params)
+        )
+        if pagination_info.get("page"):
+            add_count_to_pagination(pagination_info, Bill, filter_params)
         return Response(
             {
-                "data": serializer_class(queryset, many=True).data,
+                "data": serialize_cached(serializer_class, queryset),
                 "pagination": pagination_info,
             },
             status=status.HTTP_200_OK,
@@ -162,6 +171,107 @@ class ApiFilterBills(FilterBills):
             return process_error_response(e)
 
 
+class SearchBills(GenericAPIView):
+    def get_serializer_class(self):
+        if not self.request.user:
+            return serializers.UserFetchBillSerilizer
+        else:
+            return serializers.FullFetchBillSerilizer
+
+    @extend_schema(tags=["Bills"], parameters=[serializers.BillSearchSerializer])
+    @cache_response(Bill)
+    def get(self, request):
+        """
+        Ranked full text search over bill title, bill_no, topics and summary
+        """
+        try:
+            span = trace.get_current_span()
+            add_request_data_to_span(span, request)
+
+            search_serializer = serializers.BillSearchSerializer(data=request.GET)
+            if not search_serializer.is_valid():
+                return Response(
+                    {"error": search_serializer.errors},
+                    status=status.HTTP_417_EXPECTATION_FAILED,
+                )
+            search_params = search_serializer.validated_data
+            logger.info(f"Searching Bills with {search_params}")
+
+            query = SearchQuery(
+                search_params["q"],
+                search_type=search_params["search_type"],
+                config=BILL_SEARCH_CONFIG,
+            )
+            # Served by the GIN index on search_vector
+            queryset = Bill.objects.filter(search_vector=query).annotate(
+                rank=SearchRank(F("search_vector"), query)
+            )
+            if search_params.get("house"):
+                queryset = queryset.filter(house=search_params["house"])
+            if search_params.get("status"):
+                queryset = queryset.filter(status=search_params["status"])
+
+            if search_params["highlight"]:
+                queryset = queryset.annotate(
+                    title_highlight=SearchHeadline(
+                        "title",
+                        query,
+                        config=BILL_SEARCH_CONFIG,
+                        start_sel="<mark>",
+                        stop_sel="</mark>",
+                    ),
+                    summary_highlight=SearchHeadline(
+                        "summary",
+                        query,
+                        config=BILL_SEARCH_CONFIG,
+                        start_sel="<mark>",
+                        stop_sel="</mark>",
+                    ),
+                )
+
+            page = search_params["page"]
+            items_per_page = search_params["items_per_page"]
+            offset = (page - 1) * items_per_page
+            bills = list(
+                queryset.order_by("-rank", "-created_at")[
+                    offset : (offset + items_per_page)
+                ]
+            )
+
+            serializer_class = self.get_serializer_class()
+            data = serialize_cached(serializer_class, bills)
+            for bill, bill_data in zip(bills, data):
+                bill_data["rank"] = bill.rank
+                if search_params["highlight"]:
+                    bill_data["highlight"] = {
+                        "title": bill.title_highlight,
+                        "summary": bill.summary_highlight,
+                    }
+
+            return Response(
+                {
+                    "data": data,
+                    "pagination": {"page": page, "items_per_page": items_per_page},
+                },
+                status=status.HTTP_200_OK,
+            )
+        except Exception as e:
+            return process_error_response(e)
+
+
+class ApiSearchBills(SearchBills):
+    authentication_classes = [CustomTokenAuthentication]
+    serializer_class = serializers.FullFetchBillSerilizer
+
+    @extend_schema(tags=["Bills"], parameters=[serializers.BillSearchSerializer])
+    @has_expected_permissions(["view_bill"])
+    def get(self, request):
+        try:
+            return super().get(request)
+        except Exception as e:
+            return process_error_response(e)
+
+
 class GUDBill(GenericAPIView):
     def get_serializer_class(self):
         if not self.request.user:
@@ -173,14 +283,13 @@ class GUDBill(GenericAPIView):
         tags=["Bills"],
         responses={200: serializers.FullFetchBillSerilizer},
     )
-    @method_decorator(cache_page(60 * 60 * 2))
-    @method_decorator(vary_on_cookie)
+    @method_decorator(model_condition(Bill))
+    @cache_response(Bill)
     def get(self, request, **kwargs):
         try:
             logger.info(f'Getting bill with ID {kwargs.get("id")}')
-            response_data = Bill.objects.get(pk=kwargs.get("id"))
             serializer_class = self.get_serializer_class()
-            response = serializer_class(response_data).data
+            response = serialize_object_cached(serializer_class, kwargs.get("id"))
 
             return Response(
                 {"data": response},
@@ -225,7 +334,9 @@ class GUDBill(GenericAPIView):
                 data=request.data, partial=True
             )
             if update_serializer.is_valid():
-                update_serializer.update(bill_to_update, request.data)
+                update_serializer.update(
+                    bill_to_update, update_serializer.validated_data
+                )
                 serializer_class = self.get_serializer_class()
                 return Response(
                     {
@@ -246,13 +357,18 @@ class GUDBill(GenericAPIView):
 
 
 class AddBillFile(CreateAPIView):
+    parser_classes = UPLOAD_PARSER_CLASSES
+
     # Removes --> should either include a `serializer_class` attribute, or override the `get_serializer_class()` method.
     def get_serializer(self, *args, **kwargs):
         return
 
     @extend_schema(
         tags=["Bills"],
-        request={"application/json": serializers.BillFileUploadSerializer},
+        request={
+            "application/json": serializers.BillFileUploadSerializer,
+            "multipart/form-data": serializers.BillMultipartFileUploadSerializer,
+        },
         responses={200: GenericObjectResponse},
     )
     @has_expected_permissions(["add_bill_file"])
@@ -260,11 +376,13 @@ class AddBillFile(CreateAPIView):
         try:
             span = trace.get_current_span()
             add_request_data_to_span(span, request)
+            fields, file_data = get_upload_request_data(request)
 
-            response_data = Bill.objects.get(pk=request.data["id"])
+            response_data = Bill.objects.get(pk=fields["id"])
             if response_data.id:
                 bills_data_bucket_name = os.environ.get("BILLS_DATA_BUCKET_NAME")
-                file_name = request.data.get("file_name")
+                file_name = fields.get("file_name")
+                folder_name = fields.get("file_type").lower() + "s"
 
                 logger.info(
                     f"Initiating bill file upload --- > to S3 for {response_data.title}"
@@ -274,27 +392,27 @@ class AddBillFile(CreateAPIView):
                     "creation_date": response_data.created_at.strftime(
                         "%d/%m/%Y %H:%M:%S"
                     ),
-                    "source": request.data.get("image_source") or "",
-                    "content_type": request.data["file_extension"],
-                    "string_encoding_fmt": request.data["string_encoding_fmt"],
+                    "source": fields.get("image_source") or "",
+                    "content_type": fields["file_extension"],
+                    "string_encoding_fmt": fields["string_encoding_fmt"],
                 }
 
                 # # File path should allow for replacement of images
                 response = file_upload_to_s3(
                     bills_data_bucket_name,
-                    FileTypeEnum[request.data.get("file_type")],
-                    "bills",
+                    FileTypeEnum[fields.get("file_type")],
                     file_name,
-                    request.data.get("base64_encoding"),
+                    file_data,
                     id=str(response_data.id),
                     metadata=metadata,
+                    house=response_data.house,
+                    folder=folder_name,
                 )
 
                 if (
                     response.get("ResponseMetadata")
                     and response["ResponseMetadata"]["HTTPStatusCode"] == 200
                 ):
-                    folder_name = request.data.get("file_type").lower() + "s"
                     file_url = f"s3://{bills_data_bucket_name}/bills/{response_data.house}/{folder_name}/{file_name}"
                     response_data.file_url = file_url
                     response_data.save()
@@ -316,13 +434,36 @@ class GetBillFile(GenericAPIView):
     def get_serializer(self, *args, **kwargs):
         return
 
-    @extend_schema(tags=["Bills"], responses={200: GenericObjectResponse})
+    @extend_schema(
+        tags=["Bills"],
+        parameters=[FileDeliverySerializer],
+        responses={200: GenericObjectResponse},
+    )
     def get(self, request, **kwargs):
         try:
             response_data = Bill.objects.get(pk=kwargs.get("id"))
-            file_data = get_s3_file_data(os.environ.get(), response_data.file_url)
+            bucket_name, file_url = split_s3_url(
+                response_data.file_url, os.environ.get("BILLS_DATA_BUCKET_NAME")
+            )
+
+            presigned_response = presigned_file_response(
+                request, bucket_name, file_url, FileTypeEnum.BILL
+            )
+            if presigned_response:
+                return presigned_response
 
-            return Response({"data": file_data}, status=status.HTTP_200_OK)
+            etag = get_s3_file_etag(bucket_name, file_url)
+            not_modified = not_modified_response(request, etag)
+            if not_modified:
+                return not_modified
+
+            file_data = get_s3_file_data(bucket_name, file_url, etag=etag)
+
+            return Response(
+                {"data": file_data},
+                status=status.HTTP_200_OK,
+                headers=etag_headers(etag),
+            )
         except Exception as e:
             return process_error_response(e)
 
@@ -333,10 +474,14 @@ class ApiGetBillFile(GetBillFile):
     def get_serializer(self, *args, **kwargs):
         return
 
-    @extend_schema(tags=["Bills"], responses={200: GenericObjectResponse})
+    @extend_schema(
+        tags=["Bills"],
+        parameters=[FileDeliverySerializer],
+        responses={200: GenericObjectResponse},
+    )
     @has_expected_permissions(["view_bill_file"])
-    def get(self, request):
+    def get(self, request, **kwargs):
         try:
-            return super().get(request)
+            return super().get(request, **kwargs)
         except Exception as e:
             return process_error_response(e)
@@ -0,0 +1,28 @@
+from apps.bills.serializers import FullFetchBillSerilizer, UserFetchBillSerilizer
+from apps.props.serializers import (
+    ConfigFetchSerializer,
+    FAQFullFetchSerializer,
+    FAQUserFetchSerializer,
+)
+from apps.representatives.serializers import (
+    FullFetchRepresentativeSerializer,
+    UserFetchRepresentativeSerializer,
+)
+from apps.users.serializers import FullUserFetchSerializer, UserFetchSerializer
+from apps.votes.serializers import FullFetchVoteSerializer, UserFetchVoteSerializer
+
+# List endpoint serializers whose rows are built with .values() (see values_serializer),
+# compared against DRF by the benchmark_serializers command and the tests
+BENCHMARKED_SERIALIZERS = [
+    FullFetchBillSerilizer,
+    UserFetchBillSerilizer,
+    FullFetchVoteSerializer,
+    UserFetchVoteSerializer,
+    FullFetchRepresentativeSerializer,
+    UserFetchRepresentativeSerializer,
+    FullUserFetchSerializer,
+    UserFetchSerializer,
+    ConfigFetchSerializer,
+    FAQFullFetchSerializer,
+    FAQUserFetchSerializer,
+]
@@ -0,0 +1,73 @@
+import logging
+from django.utils.cache import get_conditional_response
+from django.views.decorators.http import condition
+
+logger = logging.getLogger("app_logger")
+
+
+def model_condition(
+    model,
+    lookup_kwarg: str = "id",
+    version_field: str | None = None,
+):
+    """
+    Conditional GET (If-None-Match/If-Modified-Since ---> 304) for a detail endpoint of <model>
+
+    The weak ETag and Last-Modified come from the row's updated_at (and <version_field>),
+    read with a single query of those columns so an unchanged resource is answered
+    without loading or serializing it. Apply with method_decorator
+
+    Parameters
+    ----------
+    model: django model with an updated_at field
+    lookup_kwarg [Optional]: str
+        URL kwarg holding the primary key
+    version_field [Optional]: str
+        Counter bumped on updates that skip updated_at e.g queryset .update()
+    """
+    fields = ["updated_at"] + ([version_field] if version_field else [])
+
+    def row_state(request, **kwargs):
+        # condition() asks for the ETag and Last-Modified separately, one query for both
+        if not hasattr(request, "_conditional_row_state"):
+            request._conditional_row_state = (
+                model.objects.filter(pk=kwargs.get(lookup_kwarg))
+                .values(*fields)
+                .first()
+            )
+        return request._conditional_row_state
+
+    def etag_func(request, **kwargs):
+        state = row_state(request, **kwargs)
+        if state is None:
+            # Left to the view to 404
+            return None
+        version = f"-{state[version_field]}" if version_field else ""
+        # Detail views serialize differently for authenticated users
+        variant = "full" if request.user else "public"
+        return f'W/"{kwargs.get(lookup_kwarg)}-{state["updated_at"].timestamp()}{version}-{variant}"'
+
+    def last_modified_func(request, **kwargs):
+        state = row_state(request, **kwargs)
+        return state["updated_at"] if state else None
+
+    return condition(etag_func=etag_func, last_modified_func=last_modified_func)
+
+
+def not_modified_response(request, etag: str | None):
+    """
+    304 response if the client's If-None-Match matches <etag>, None otherwise
+    """
+    if not etag:
+        return None
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        response["ETag"] = etag
+    return response
+
+
+def etag_headers(etag: str | None) -> dict:
+    """
+    Headers kwarg for the response of a file endpoint
+    """
+    return {"ETag": etag} if etag else {}
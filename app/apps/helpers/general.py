@@ -16,3 +16,12 @@ class GenericFilterSerializer(serializers.Serializer):
     )
     page = serializers.IntegerField(default=1)
     items_per_page = serializers.IntegerField(default=10)
+    pagination = serializers.ChoiceField(
+        choices=["page", "cursor"],
+        default="page",
+        help_text="cursor pages on (created_at, id) and costs the same for every page",
+    )
+    cursor = serializers.CharField(
+        required=False,
+        help_text="next_cursor/prev_cursor of a previous response. Implies pagination=cursor",
+    )
@@ -0,0 +1,214 @@
+import base64
+import binascii
+import datetime
+import json
+import logging
+import math
+import os
+from typing import Sequence
+from django.db import connection
+from django.db.models import Q, QuerySet
+from rest_framework import exceptions
+from utils.cache_utils import (
+    get_model_generation,
+    get_or_compute,
+    params_signature,
+)
+
+logger = logging.getLogger("app_logger")
+
+PAGE_MODE = "page"
+CURSOR_MODE = "cursor"
+
+COUNT_CACHE_TTL = int(os.environ.get("COUNT_CACHE_TTL", "3600"))
+# Unfiltered tables estimated above this many rows use the planner estimate
+APPROXIMATE_COUNT_THRESHOLD = int(
+    os.environ.get("APPROXIMATE_COUNT_THRESHOLD", "500000")
+)
+
+
+def _row_value(row, key):
+    # Rows can be model instances or dicts from .values()
+    value = row[key] if isinstance(row, dict) else getattr(row, key)
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_cursor(row, keys: Sequence[str], direction: str) -> str:
+    payload = {"v": [_row_value(row, key) for key in keys], "d": direction}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("utf-8")
+
+
+def decode_cursor(cursor: str, keys: Sequence[str]) -> tuple[list, str]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("utf-8")))
+        values, direction = payload["v"], payload["d"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise exceptions.ValidationError(f"Invalid cursor <{cursor}>")
+
+    if len(values) != len(keys) or direction not in ("next", "prev"):
+        raise exceptions.ValidationError(f"Invalid cursor <{cursor}>")
+    return values, direction
+
+
+def _keyset_condition(keys: Sequence[str], values: list, lookup: str) -> Q:
+    # (k1, k2) < (v1, v2)  ---> k1 < v1 OR (k1 = v1 AND k2 < v2)
+    condition = Q()
+    for i, key in enumerate(keys):
+        equal_parts = {keys[j]: values[j] for j in range(i)}
+        condition |= Q(**equal_parts, **{f"{key}__{lookup}": values[i]})
+    return condition
+
+
+def paginate_queryset(
+    request,
+    queryset: QuerySet,
+    keys: Sequence[str] = ("created_at", "id"),
+    descending: bool = True,
+):
+    """
+    Pages a filtered queryset in either of the supported modes
+
+    page (default): page/items_per_page turned into an OFFSET slice. Used by the portal
+    cursor: keyset pagination on <keys>, selected by passing pagination=cursor or a cursor.
+            Every page costs the same regardless of how deep it is
+
+    Parameters
+    ----------
+    request: Request
+        Request carrying the page/items_per_page/pagination/cursor query params
+    queryset: QuerySet
+        Already filtered queryset
+    keys: Sequence[str]
+        Unique (combined) ordering used for cursor mode, last key should be the pk
+    descending: bool
+        Newest first if the keys are timestamps
+
+    Returns
+    -------
+    (rows, pagination_info)
+    """
+    items_per_page = int(request.GET.get("items_per_page", "10"))
+    cursor = request.GET.get("cursor")
+
+    if request.GET.get("pagination", PAGE_MODE) != CURSOR_MODE and not cursor:
+        page = int(request.GET.get("page", "1"))
+        offset = (page - 1) * items_per_page
+        return queryset[offset : (offset + items_per_page)], {
+            "page": page,
+            "items_per_page": items_per_page,
+        }
+
+    order = [f"-{key}" if descending else key for key in keys]
+    reverse_order = [key if descending else f"-{key}" for key in keys]
+
+    direction = "next"
+    if cursor:
+        values, direction = decode_cursor(cursor, keys)
+        # Rows after the cursor in display order or before it for prev pages
+        lookup = "lt" if (direction == "next") == descending else "gt"
+        queryset = queryset.filter(_keyset_condition(keys, values, lookup))
+
+    if direction == "next":
+        rows = list(queryset.order_by(*order)[: items_per_page + 1])
+    else:
+        rows = list(queryset.order_by(*reverse_order)[: items_per_page + 1])
+
+    has_more = len(rows) > items_per_page
+    rows = rows[:items_per_page]
+    if direction == "prev":
+        rows.reverse()
+
+    next_cursor = None
+    prev_cursor = None
+    if rows:
+        if direction == "prev" or has_more:
+            next_cursor = encode_cursor(rows[-1], keys, "next")
+        if (direction == "next" and cursor) or (direction == "prev" and has_more):
+            prev_cursor = encode_cursor(rows[0], keys, "prev")
+
+    return rows, {
+        "pagination": CURSOR_MODE,
+        "items_per_page": items_per_page,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
+    }
+
+
+def paginate_list(request, items: list):
+    """
+    page/items_per_page pagination of an in memory list e.g a cached S3 listing
+
+    Returns
+    -------
+    (rows, pagination_info)
+    """
+    items_per_page = int(request.GET.get("items_per_page", "10"))
+    page = int(request.GET.get("page", "1"))
+    offset = (page - 1) * items_per_page
+    return items[offset : (offset + items_per_page)], {
+        "page": page,
+        "items_per_page": items_per_page,
+        "total_items": len(items),
+        "total_pages": int(math.ceil(len(items) / items_per_page)),
+    }
+
+
+def _estimated_row_count(model) -> int | None:
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+            [model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    # reltuples is -1 for tables that have never been analyzed
+    return row[0] if row and row[0] >= 0 else None
+
+
+def get_filtered_count(model, filter_params: dict) -> tuple[int, bool]:
+    """
+    Count of <model> rows matching <filter_params>
+
+    Counts are cached per normalized filter signature and the models write generation,
+    so any save/delete on the model drops them.
+    Large unfiltered tables fall back to the planner estimate
+
+    Returns
+    -------
+    (count, approximate)
+    """
+    if not filter_params:
+        estimate = _estimated_row_count(model)
+        if estimate is not None and estimate >= APPROXIMATE_COUNT_THRESHOLD:
+            return estimate, True
+
+    count_key = ":".join(
+        [
+            "count",
+            model._meta.label_lower,
+            str(get_model_generation(model)),
+            params_signature(filter_params),
+        ]
+    )
+    object_count = get_or_compute(
+        count_key,
+        lambda: model.objects.filter(**filter_params).count(),
+        COUNT_CACHE_TTL,
+    )
+    return object_count, False
+
+
+def add_count_to_pagination(pagination_info: dict, model, filter_params: dict):
+    """
+    Adds total_items/total_pages to a page-mode pagination block
+    """
+    object_count, approximate = get_filtered_count(model, filter_params)
+    pagination_info["total_items"] = object_count
+    pagination_info["total_pages"] = int(
+        math.ceil(object_count / pagination_info["items_per_page"])
+    )
+    pagination_info["approximate"] = approximate
+    return pagination_info
@@ -0,0 +1,160 @@
+import functools
+import logging
+from collections import defaultdict
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models import QuerySet
+from rest_framework import serializers
+from rest_framework.relations import (
+    ManyRelatedField,
+    PrimaryKeyRelatedField,
+    RelatedField,
+)
+
+logger = logging.getLogger("app_logger")
+
+
+class UnsupportedField(Exception):
+    pass
+
+
+def _converter(field, model_field):
+    """
+    Callable turning a column value into field.to_representation(value),
+    None where the column value already is the representation
+    """
+    if isinstance(field, PrimaryKeyRelatedField) and not field.pk_field:
+        # values_list gives the raw <field>_id, to_representation expects an instance
+        return None
+    if isinstance(field, RelatedField):
+        raise UnsupportedField(field.field_name)
+    if isinstance(field, serializers.JSONField) and not field.binary:
+        return None
+    if isinstance(field, serializers.CharField) and isinstance(
+        model_field, (models.CharField, models.TextField)
+    ):
+        return None
+    if isinstance(field, serializers.UUIDField) and field.uuid_format == "hex_verbose":
+        return str
+    return field.to_representation
+
+
+_MANY_TO_MANY = object()
+
+
+class ValuesSerializer:
+    """
+    Read only stand-in for a ModelSerializer (many=True) that builds the rows from a
+    .values_list() projection of exactly the serializer's columns, skipping model
+    instances and DRF's per field attribute lookups.
+
+    Output matches serializer_class(queryset, many=True).data field for field,
+    the fields are read off the serializer so the two can't drift apart.
+    Many to many primary keys are read in one query per relation.
+    Serializers with fields it can't project (method fields, dotted sources,
+    nested serializers ...) raise UnsupportedField
+    """
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        self.model = serializer_class.Meta.model
+        self.columns = ["pk"]
+        # (name, converter) per field in the serializer's order,
+        # many to many fields are filled in after the columns
+        self.converters = []
+        self.many_to_many = []
+
+        for name, field in serializer_class().fields.items():
+            if not field.source or "." in field.source or field.source == "*":
+                raise UnsupportedField(name)
+            try:
+                model_field = self.model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                raise UnsupportedField(name) from None
+
+            if isinstance(field, ManyRelatedField):
+                if (
+                    not isinstance(field.child_relation, PrimaryKeyRelatedField)
+                    or field.child_relation.pk_field
+                ):
+                    raise UnsupportedField(name)
+                self.many_to_many.append((name, model_field))
+                self.converters.append((name, _MANY_TO_MANY))
+            elif isinstance(field, serializers.Serializer) or not model_field.concrete:
+                raise UnsupportedField(name)
+            else:
+                self.columns.append(model_field.attname)
+                self.converters.append((name, _converter(field, model_field)))
+
+    def _many_to_many_pks(self, model_field, pks) -> dict:
+        # Same order as instance.<relation>.all() i.e the related model's ordering
+        through = model_field.remote_field.through
+        source = model_field.m2m_field_name()
+        target = model_field.m2m_reverse_field_name()
+        ordering = [
+            f"-{target}__{key[1:]}" if key.startswith("-") else f"{target}__{key}"
+            for key in model_field.related_model._meta.ordering
+        ] or ["pk"]
+
+        related = defaultdict(list)
+        for source_pk, target_pk in (
+            through.objects.filter(**{f"{source}__in": pks})
+            .order_by(*ordering)
+            .values_list(
+                through._meta.get_field(source).attname,
+                through._meta.get_field(target).attname,
+            )
+        ):
+            related[source_pk].append(target_pk)
+        return related
+
+    def serialize_by_pk(self, queryset: QuerySet) -> dict:
+        """
+        {pk: representation} of the rows of <queryset> in its order
+        """
+        rows = {}
+        for pk, *values in queryset.values_list(*self.columns):
+            representation = {}
+            values = iter(values)
+            for name, convert in self.converters:
+                if convert is _MANY_TO_MANY:
+                    # Placeholder keeping the field order
+                    representation[name] = None
+                    continue
+                value = next(values)
+                representation[name] = (
+                    value if convert is None or value is None else convert(value)
+                )
+            rows[pk] = representation
+
+        for name, model_field in self.many_to_many:
+            related = self._many_to_many_pks(model_field, list(rows))
+            for pk, representation in rows.items():
+                representation[name] = related.get(pk, [])
+        return rows
+
+    def serialize(self, queryset: QuerySet) -> list[dict]:
+        return list(self.serialize_by_pk(queryset).values())
+
+
+@functools.cache
+def get_values_serializer(serializer_class) -> ValuesSerializer | None:
+    try:
+        return ValuesSerializer(serializer_class)
+    except UnsupportedField as e:
+        logger.warning(
+            f"{serializer_class.__name__} field {e} can't be read with .values(), "
+            "serializing model instances instead"
+        )
+        return None
+
+
+def serialize_values(serializer_class, rows) -> list:
+    """
+    serializer_class(rows, many=True).data, built from a .values_list() projection
+    when <rows> is a queryset and the serializer allows it
+    """
+    values_serializer = get_values_serializer(serializer_class)
+    if values_serializer is None or not isinstance(rows, QuerySet):
+        return serializer_class(rows, many=True).data
+    return values_serializer.serialize(rows)
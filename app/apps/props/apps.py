@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class PropsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.props"
+
+    def ready(self):
+        from apps.props.models import FAQ, Config
+        from utils.cache_utils import register_generation_signals
+
+        # Drops cached responses and reloads config_registry on writes
+        register_generation_signals(FAQ, Config)
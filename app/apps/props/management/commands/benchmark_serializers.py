@@ -0,0 +1,172 @@
+import datetime
+import logging
+import timeit
+import uuid
+from django.contrib.auth.models import Group, Permission
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from apps.bills.models import Bill, BillStatus
+from apps.helpers.benchmarked_serializers import BENCHMARKED_SERIALIZERS
+from apps.helpers.values_serializer import get_values_serializer
+from apps.props.models import FAQ, Config
+from apps.representatives.models import Representative
+from apps.users.models import User
+from apps.votes.models import Vote
+from utils.enum_utils import HouseChoices, VoteTypeChoices
+
+logger = logging.getLogger("app_logger")
+
+
+def _create_rows(row_count: int):
+    # bulk_create keeps the cache/tally signals out of it
+    now = timezone.now()
+    representatives = Representative.objects.bulk_create(
+        Representative(
+            full_name=f"Benchmark Representative {i}",
+            area_represented=f"Constituency {i}",
+            phone_number="0700000000",
+            representation_summary={"bills_sponsored": i, "attendance": 0.9},
+            image_variants={"version": 1, "sizes": [64, 256], "formats": ["webp"]},
+        )
+        for i in range(row_count)
+    )
+    bills = Bill.objects.bulk_create(
+        Bill(
+            title=f"Benchmark Bill {i}",
+            status=BillStatus.IN_PROGRESS,
+            sponsored_by=str(representatives[i].id),
+            house=HouseChoices.NATIONAL,
+            bill_no=f"{i} of 2024",
+            gazette_no=f"G{i}",
+            date_introduced=datetime.date(2024, 1, 1) + datetime.timedelta(days=i),
+            summary="A bill to amend the law relating to " * 5,
+            metadata={"readings": [1, 2], "committee": "Finance"},
+        )
+        for i in range(row_count)
+    )
+    Vote.objects.bulk_create(
+        Vote(
+            bill_id=str(bills[i].id),
+            representative_id=str(representatives[i].id),
+            vote_type=VoteTypeChoices.INDIVIDUAL,
+            house=HouseChoices.NATIONAL,
+            vote="YES",
+        )
+        for i in range(row_count)
+    )
+    users = User.objects.bulk_create(
+        User(
+            username=f"benchmark_{uuid.uuid4().hex[:12]}",
+            email=f"benchmark_{i}@fuatilia.com",
+            first_name="Bench",
+            last_name="Mark",
+            user_type="USER",
+            parent_organization="fuatilia",
+            date_joined=now,
+        )
+        for i in range(row_count)
+    )
+    groups = Group.objects.bulk_create(
+        Group(name=f"benchmark_{uuid.uuid4().hex[:12]}") for _ in range(2)
+    )
+    permissions = list(Permission.objects.all()[:3])
+    User.groups.through.objects.bulk_create(
+        User.groups.through(user_id=user.id, group_id=group.id)
+        for user in users
+        for group in groups
+    )
+    User.user_permissions.through.objects.bulk_create(
+        User.user_permissions.through(user_id=user.id, permission_id=permission.id)
+        for user in users
+        for permission in permissions
+    )
+    Config.objects.bulk_create(
+        Config(
+            name=f"benchmark_{uuid.uuid4().hex[:12]}",
+            value="on",
+            created_by="benchmark",
+            last_updated_by="benchmark",
+        )
+        for _ in range(row_count)
+    )
+    FAQ.objects.bulk_create(
+        FAQ(
+            faq=f"benchmark_{uuid.uuid4().hex[:12]}",
+            answer="Yes",
+            created_by="benchmark",
+            last_updated_by="benchmark",
+        )
+        for _ in range(row_count)
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the DRF model serializers of the list endpoints with their "
+        ".values() based stand-ins, checking that both render the same JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--page-sizes",
+            default="10,50,100",
+            help="Comma separated rows per page to time",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=20, help="Timed runs per page size"
+        )
+        parser.add_argument(
+            "--existing-rows",
+            action="store_true",
+            help="Time the rows already in the database instead of generated ones",
+        )
+
+    def handle(self, *args, **options):
+        page_sizes = [int(size) for size in options["page_sizes"].split(",")]
+        mismatches = []
+
+        with transaction.atomic():
+            if not options["existing_rows"]:
+                logger.info(f"Generating {max(page_sizes)} rows per model")
+                _create_rows(max(page_sizes))
+
+            self.stdout.write(
+                f"{'serializer':<36}{'rows':>6}{'drf ms':>10}{'values ms':>11}{'speedup':>9}"
+            )
+            for serializer_class in BENCHMARKED_SERIALIZERS:
+                values_serializer = get_values_serializer(serializer_class)
+                if values_serializer is None:
+                    mismatches.append(f"{serializer_class.__name__} (unsupported)")
+                    continue
+
+                model = serializer_class.Meta.model
+                for page_size in page_sizes:
+                    queryset = model.objects.all()[:page_size]
+
+                    def drf():
+                        return serializer_class(queryset.all(), many=True).data
+
+                    def values():
+                        return values_serializer.serialize(queryset.all())
+
+                    if JSONRenderer().render(drf()) != JSONRenderer().render(values()):
+                        mismatches.append(f"{serializer_class.__name__} ({page_size})")
+
+                    repeat = options["repeat"]
+                    drf_ms = timeit.timeit(drf, number=repeat) / repeat * 1000
+                    values_ms = timeit.timeit(values, number=repeat) / repeat * 1000
+                    self.stdout.write(
+                        f"{serializer_class.__name__:<36}{page_size:>6}"
+                        f"{drf_ms:>10.2f}{values_ms:>11.2f}{drf_ms / values_ms:>8.1f}x"
+                    )
+
+            # Generated rows are never kept
+            transaction.set_rollback(True)
+
+        if mismatches:
+            raise CommandError(f"Output differs for {', '.join(mismatches)}")
+        self.stdout.write(
+            self.style.SUCCESS("Both implementations render the same JSON")
+        )
@@ -0,0 +1,73 @@
+import binascii
+import logging
+import os
+from django.core.management.base import BaseCommand
+from utils.file_utils.generic_file_utils import (
+    convert_s3_object_to_binary,
+    representative_s3_processor,
+)
+from utils.file_utils.s3_utils import BINARY_BODY_ENCODING, get_body_encoding
+
+logger = logging.getLogger("app_logger")
+
+
+class Command(BaseCommand):
+    help = "Rewrites base64 encoded S3 objects in place as raw bytes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--bucket",
+            action="append",
+            dest="buckets",
+            help="Bucket to convert, can be repeated. Defaults to the bills, representatives and votes buckets",
+        )
+        parser.add_argument("--prefix", default="", help="Only convert keys under it")
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the objects that would be converted",
+        )
+
+    def handle(self, *args, **options):
+        buckets = options["buckets"] or [
+            bucket_name
+            for bucket_name in (
+                os.environ.get("BILLS_DATA_BUCKET_NAME"),
+                os.environ.get("REPS_DATA_BUCKET_NAME"),
+                os.environ.get("VOTES_DATA_BUCKET_NAME"),
+            )
+            if bucket_name
+        ]
+
+        counts = {"converted": 0, "binary": 0, "invalid": 0}
+        for bucket_name in buckets:
+            for s3_object in representative_s3_processor.iter_bucket_objects(
+                bucket_name, options["prefix"]
+            ):
+                file_name = s3_object["Key"]
+
+                if options["dry_run"]:
+                    head = representative_s3_processor.head_file(bucket_name, file_name)
+                    if get_body_encoding(head) == BINARY_BODY_ENCODING:
+                        counts["binary"] += 1
+                    else:
+                        counts["converted"] += 1
+                        self.stdout.write(f"Would convert {bucket_name}/{file_name}")
+                    continue
+
+                try:
+                    if convert_s3_object_to_binary(bucket_name, file_name):
+                        counts["converted"] += 1
+                    else:
+                        counts["binary"] += 1
+                except (binascii.Error, ValueError) as e:
+                    # Not base64 i.e put there by something else, left as is
+                    counts["invalid"] += 1
+                    logger.error(f"Skipping {bucket_name}/{file_name} :: {e}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{'Would convert' if options['dry_run'] else 'Converted'} {counts['converted']} objects, "
+                f"{counts['binary']} already binary, {counts['invalid']} not base64"
+            )
+        )
@@ -1,7 +1,9 @@
+from django.utils import timezone
 from rest_framework import serializers
 from apps.helpers.general import GenericFilterSerializer
 from apps.users.models import User
 from apps.props.models import FAQ, Config
+from utils.cache_utils import bump_model_generation_on_commit
 
 
 class ConfigCreationSerializer(serializers.Serializer):
@@ -29,7 +31,11 @@ class ConfigUpdateSerializer(serializers.Serializer):
             return data
 
     def update(self, config: Config, validated_data) -> None:
-        Config.objects.filter(pk=config.id).update(**validated_data)
+        Config.objects.filter(pk=config.id).update(
+            **validated_data, updated_at=timezone.now()
+        )
+        # Queryset updates skip post_save, the bump reloads config_registry
+        bump_model_generation_on_commit(Config)
         config.refresh_from_db()
 
 
@@ -60,7 +66,11 @@ class FAQUpdateSerializer(serializers.Serializer):
             return data
 
     def update(self, faq: FAQ, validated_data) -> None:
-        FAQ.objects.filter(pk=faq.id).update(**validated_data)
+        FAQ.objects.filter(pk=faq.id).update(
+            **validated_data, updated_at=timezone.now()
+        )
+        # Queryset updates skip post_save
+        bump_model_generation_on_commit(FAQ)
         faq.refresh_from_db()
 
 
@@ -4,10 +4,10 @@ from drf_spectacular.utils import extend_schema
 from utils.auth import has_expected_permissions
 from utils.error_handler import process_error_response
 from utils.generics import add_request_data_to_span
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
-from django.views.decorators.vary import vary_on_cookie
+from utils.cache_utils import cache_response
 from apps.props.models import FAQ, Config
+from apps.helpers.pagination import paginate_queryset
+from apps.helpers.values_serializer import serialize_values
 from apps.props import serializers
 from rest_framework.response import Response
 from rest_framework import status
@@ -106,17 +106,14 @@ class FilterConfigs(GenericAPIView):
                     "updated_at_end"
                 )
 
-            page = int(self.request.GET.get("page", "1"))
-            items_per_page = int(self.request.GET.get("items_per_page", "10"))
-            offset = (page - 1) * items_per_page
-
-            queryset = Config.objects.filter(**filter_params)[
-                offset : (offset + items_per_page)
-            ]
+            queryset, pagination_info = paginate_queryset(
+                self.request, Config.objects.filter(**filter_params)
+            )
 
             return Response(
                 {
-                    "data": self.serializer_class(queryset, many=True).data,
+                    "data": serialize_values(self.serializer_class, queryset),
+                    "pagination": pagination_info,
                 },
                 status=status.HTTP_200_OK,
             )
@@ -240,10 +237,9 @@ class FilterFAQs(GenericAPIView):
         else:
             return serializers.FAQFullFetchSerializer
 
-    @method_decorator(cache_page(60 * 60 * 2))
-    @method_decorator(vary_on_cookie)
     @extend_schema(tags=["FAQs"], parameters=[serializers.FilterFAQsBody])
     @has_expected_permissions(["view_faq"])
+    @cache_response(FAQ)
     def get(self, request):
         span = trace.get_current_span()
         add_request_data_to_span(span, request)
@@ -277,17 +273,14 @@ class FilterFAQs(GenericAPIView):
                     "updated_at_end"
                 )
 
-            page = int(self.request.GET.get("page", "1"))
-            items_per_page = int(self.request.GET.get("items_per_page", "10"))
-            offset = (page - 1) * items_per_page
-
-            queryset = FAQ.objects.filter(**filter_params)[
-                offset : (offset + items_per_page)
-            ]
+            queryset, pagination_info = paginate_queryset(
+                self.request, FAQ.objects.filter(**filter_params)
+            )
             serializer_class = self.get_serializer_class()
             return Response(
                 {
-                    "data": serializer_class(queryset, many=True).data,
+                    "data": serialize_values(serializer_class, queryset),
+                    "pagination": pagination_info,
                 },
                 status=status.HTTP_200_OK,
             )
@@ -4,3 +4,20 @@ from django.apps import AppConfig
 class RepresentativesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.representatives"
+
+    def ready(self):
+        from apps.representatives.models import Representative
+        from apps.representatives.serializers import (
+            FullFetchRepresentativeSerializer,
+            UserFetchRepresentativeSerializer,
+        )
+        from utils.cache_utils import register_generation_signals
+        from utils.serializer_cache import register_serialized_cache
+
+        # Drops cached counts on writes
+        register_generation_signals(Representative)
+        register_serialized_cache(
+            Representative,
+            FullFetchRepresentativeSerializer,
+            UserFetchRepresentativeSerializer,
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.2 on 2026-10-18 12:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("representatives", "0003_alter_representative_last_updated_by"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="representative",
+            index=models.Index(
+                fields=["created_at", "id"], name="representat_created_cd0f1d_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.2 on 2026-10-18 12:11
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("representatives", "0004_keyset_pagination_index"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="representative",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["full_name"],
+                name="representative_name_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="representative",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["area_represented"],
+                name="representative_area_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.2 on 2026-10-18 12:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("representatives", "0005_representative_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="representative",
+            name="image_variants",
+            field=models.JSONField(null=True),
+        ),
+    ]
@@ -1,4 +1,5 @@
 import uuid
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from utils.enum_utils import HouseChoices
 from utils.enum_utils import PositionChoices, PositionClassChoices, GenderChoices
@@ -16,6 +17,9 @@ class Representative(models.Model):
     area_represented = models.CharField(max_length=100)
     phone_number = models.CharField(max_length=15, null=True)
     image_url = models.CharField(max_length=250, null=True)
+    # {"version": <hash of the original>, "sizes": [...], "formats": [...]}
+    # of the thumbnails generated from the last uploaded image
+    image_variants = models.JSONField(null=True)
     gender = models.CharField(max_length=10, choices=GenderChoices.choices, null=True)
     current_parliamentary_roles = models.CharField(
         max_length=100, null=True
@@ -34,3 +38,18 @@ class Representative(models.Model):
         db_table = "representatives"
         ordering = ["-created_at"]
         verbose_name_plural = "representatives"
+        indexes = [
+            # Keyset (cursor) pagination
+            models.Index(fields=["created_at", "id"]),
+            # Fuzzy search/autocomplete (pg_trgm)
+            GinIndex(
+                fields=["full_name"],
+                name="representative_name_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+            GinIndex(
+                fields=["area_represented"],
+                name="representative_area_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
@@ -1,12 +1,19 @@
 import logging
 from apps.helpers.general import GenericFilterSerializer
-from utils.file_utils.models import GenericFileUploadSerilizer
+from utils.file_utils.models import (
+    GenericFileUploadSerilizer,
+    GenericMultipartFileUploadSerializer,
+)
 from apps.representatives.models import (
     PositionChoices,
     PositionClassChoices,
     Representative,
 )
+from django.utils import timezone
 from rest_framework import serializers
+from utils.cache_utils import bump_model_generation
+from utils.enum_utils import HouseChoices
+from utils.serializer_cache import invalidate_serialized
 
 
 logger = logging.getLogger("app_logger")
@@ -82,8 +89,13 @@ class RepresentativeUpdateSerializer(serializers.Serializer):
             f"Updating Representative with validated data  ====== >>>  {validated_data}"
         )
         update_resp = Representative.objects.filter(id=representative_id).update(
-            **validated_data
+            # Queryset updates skip auto_now, Last-Modified of the detail endpoint reads it
+            **validated_data,
+            updated_at=timezone.now(),
         )
+        # Queryset updates skip post_save
+        bump_model_generation(Representative)
+        invalidate_serialized(Representative, [representative_id])
         rep_exists.refresh_from_db()
         logger.info(
             f"Update response  -- {update_resp} --- representative {representative_id} now has  :: {rep_exists.__dict__}"
@@ -104,8 +116,43 @@ class RepresentativeFilterSerilizer(GenericFilterSerializer):
     # representation_summary = serializers.CharField(required=False)
 
 
+class RepresentativeSearchSerializer(serializers.Serializer):
+    q = serializers.CharField(
+        required=True,
+        help_text="Full name or area, tolerates typos e.g Kipchumba Murkomn",
+    )
+    field = serializers.ChoiceField(
+        choices=["all", "full_name", "area_represented"], default="all"
+    )
+    threshold = serializers.FloatField(
+        required=False,
+        min_value=0,
+        max_value=1,
+        help_text="Minimum similarity (0-1) for a match, lower is fuzzier",
+    )
+    house = serializers.ChoiceField(required=False, choices=HouseChoices.choices)
+    page = serializers.IntegerField(default=1, min_value=1)
+    items_per_page = serializers.IntegerField(default=10, min_value=1)
+
+
+class RepresentativeAutocompleteSerializer(serializers.Serializer):
+    q = serializers.CharField(required=True, help_text="Partial name or area")
+    field = serializers.ChoiceField(
+        choices=["all", "full_name", "area_represented"], default="all"
+    )
+    house = serializers.ChoiceField(required=False, choices=HouseChoices.choices)
+    limit = serializers.IntegerField(default=10, min_value=1, max_value=25)
+
+
 class RepresentativeFileUploadSerializer(GenericFileUploadSerilizer):
     id = serializers.CharField(
         default="6134fc82-0faa-4bed-b7a2-edbcf541a3c9",
         help_text="Id of the representative",
     )
+
+
+class RepresentativeMultipartFileUploadSerializer(GenericMultipartFileUploadSerializer):
+    id = serializers.CharField(
+        default="6134fc82-0faa-4bed-b7a2-edbcf541a3c9",
+        help_text="Id of the representative",
+    )
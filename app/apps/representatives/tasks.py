@@ -0,0 +1,86 @@
+import logging
+import os
+from celery import shared_task
+from PIL import UnidentifiedImageError
+from django.utils import timezone
+from apps.representatives.models import Representative
+from utils.cache_utils import bump_model_generation
+from utils.file_utils.generic_file_utils import (
+    get_s3_file_bytes,
+    invalidate_s3_caches,
+    representative_s3_processor,
+)
+from utils.file_utils.image_utils import (
+    DISPLAY_IMAGE_FORMATS,
+    generate_image_variants,
+    image_variant_key,
+    image_version,
+)
+from utils.generics import add_string_data_to_span
+from utils.serializer_cache import invalidate_serialized
+from opentelemetry import trace
+
+logger = logging.getLogger("app_logger")
+tracer = trace.get_tracer(__name__)
+
+
+@shared_task(bind=True, max_retries=3)
+def generate_representative_image_variants(self, representative_id, file_url):
+    """
+    Generates the square WebP/JPEG thumbnails of an uploaded representative image
+    under representatives/<id>/images/variants/<version>/ and records them on the
+    representative.
+
+    Variant keys contain the hash of the original so they never change once written
+    and can be served with immutable cache headers
+    """
+    span = trace.get_current_span()
+    add_string_data_to_span(
+        span,
+        f"Generating image variants of {file_url} for {representative_id}",
+        "celery.task",
+    )
+
+    bucket_name = os.environ.get("REPS_DATA_BUCKET_NAME")
+    directory = f"representatives/{representative_id}/images"
+    try:
+        image_data = get_s3_file_bytes(bucket_name, file_url)
+        version = image_version(image_data)
+
+        sizes = set()
+        for size, extension, variant_data in generate_image_variants(image_data):
+            variant_key = image_variant_key(directory, version, size, extension)
+            response = representative_s3_processor.upload_file(
+                variant_data,
+                bucket_name,
+                file_name=variant_key,
+                metadata={"rep_id": str(representative_id), "source": file_url},
+                content_type=DISPLAY_IMAGE_FORMATS[extension][1],
+            )
+            if response.get("error"):
+                raise Exception(response["error"])
+            invalidate_s3_caches(bucket_name, variant_key)
+            sizes.add(size)
+    except UnidentifiedImageError:
+        # Not an image, a retry would fail the same way
+        logger.error(f"{file_url} of {representative_id} is not a readable image")
+        raise
+    except Exception as e:
+        # S3 reads/uploads, variants already written are overwritten by the retry
+        logger.exception(e)
+        raise self.retry(exc=e, countdown=30 * 2**self.request.retries)
+
+    image_variants = {
+        "version": version,
+        "sizes": sorted(sizes),
+        "formats": list(DISPLAY_IMAGE_FORMATS),
+    }
+    Representative.objects.filter(pk=representative_id).update(
+        image_variants=image_variants, updated_at=timezone.now()
+    )
+    # .update() skips the generation and serialized cache signals
+    bump_model_generation(Representative)
+    invalidate_serialized(Representative, [representative_id])
+
+    logger.info(f"Image variants for {representative_id} ---> {image_variants}")
+    return image_variants
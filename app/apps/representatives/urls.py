@@ -4,7 +4,10 @@ from apps.representatives import views
 urlpatterns = [
     path("portal/v1/create", views.CreateRepresentative().as_view()),
     path("portal/v1/filter", views.FilterRepresentatives.as_view()),
+    path("portal/v1/search", views.SearchRepresentatives().as_view()),
+    path("portal/v1/autocomplete", views.AutocompleteRepresentatives().as_view()),
     path("portal/v1/<str:id>", views.GUDRepresentative().as_view()),
+    path("portal/v1/<str:id>/export", views.ExportRepresentativeFiles().as_view()),
     path("portal/v1/approve/<str:id>", views.ApproveRepresentative().as_view()),
     path("portal/v1/upload/file", views.AddRepresentativeFile().as_view()),
     path(
@@ -19,8 +22,15 @@ urlpatterns = [
         "portal/v1/display-image/<str:id>",
         views.GetRepresentativeDisplayImage().as_view(),
     ),
+    path(
+        "portal/v1/display-image/<str:id>/<str:version>/<int:size>",
+        views.GetRepresentativeImageVariant().as_view(),
+    ),
     # For Api Clients
+    path("api/v1/<str:id>/export", views.ApiExportRepresentativeFiles().as_view()),
     path("api/v1/filter", views.ApiFilterRepresentatives().as_view()),
+    path("api/v1/search", views.ApiSearchRepresentatives().as_view()),
+    path("api/v1/autocomplete", views.ApiAutocompleteRepresentatives().as_view()),
     path(
         "api/v1/<str:id>/file/<str:file_type>",
         views.ApiGetRepresentativeFilesList().as_view(),
@@ -1,26 +1,60 @@
 import logging
-import math
 import os
-from apps.props.models import Config
-from utils.file_utils.models import GenericObjectResponse, GenericStringResponse
+from utils.file_utils.models import (
+    FileDeliverySerializer,
+    FileListPaginationSerializer,
+    GenericObjectResponse,
+    GenericStringResponse,
+)
 from utils.error_handler import process_error_response
 from utils.auth import has_expected_permissions
+from utils.cache_utils import cache_response
+from utils.serializer_cache import serialize_cached, serialize_object_cached
+from utils.config_utils import REPRESENTATIVE_UPDATE_MODE, config_registry
 from utils.generics import add_request_data_to_span
 from utils.enum_utils import FileTypeEnum
 from utils.file_utils.generic_file_utils import (
+    UPLOAD_PARSER_CLASSES,
+    BinaryContentNegotiation,
     file_upload_to_s3,
+    get_s3_file_bytes,
     get_s3_file_data,
+    get_s3_file_etag,
     get_s3_folder_objects,
+    get_upload_request_data,
+    presigned_file_response,
+    streaming_content,
+)
+from utils.file_utils.zip_utils import stream_s3_zip
+from utils.file_utils.image_utils import (
+    DISPLAY_IMAGE_FORMATS,
+    best_fit_size,
+    image_variant_key,
 )
 from utils.auth import CustomTokenAuthentication
+from utils.async_views import AsyncGenericAPIView
 from apps.representatives.models import Representative
+from apps.representatives.tasks import generate_representative_image_variants
+from apps.helpers.conditional import (
+    etag_headers,
+    model_condition,
+    not_modified_response,
+)
+from apps.helpers.pagination import (
+    add_count_to_pagination,
+    paginate_list,
+    paginate_queryset,
+)
 from apps.representatives import serializers
 from rest_framework.generics import CreateAPIView, GenericAPIView
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connection, transaction
+from django.db.models import Q
+from django.db.models.functions import Greatest
+from django.http import HttpResponse, StreamingHttpResponse
 from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
-from django.views.decorators.vary import vary_on_cookie
 from rest_framework import status
 from opentelemetry import trace
 
@@ -28,6 +62,68 @@ from opentelemetry import trace
 tracer = trace.get_tracer(__name__)
 logger = logging.getLogger("app_logger")
 
+REPRESENTATIVE_SIMILARITY_THRESHOLD = float(
+    os.environ.get("REPRESENTATIVE_SIMILARITY_THRESHOLD", "0.3")
+)
+TRIGRAM_SEARCH_FIELDS = ("full_name", "area_represented")
+AUTOCOMPLETE_FIELDS = ("id", "full_name", "area_represented", "house", "position")
+
+
+def trigram_search_representatives(
+    search_params: dict, offset: int, limit: int, values: tuple | None = None
+) -> list:
+    """
+    Representatives whose full_name/area_represented fuzzily match search_params["q"]
+
+    Matching uses pg_trgm word similarity (the %> operator) which is served by the
+    trigram GIN indexes, best matches first
+
+    Parameters
+    ----------
+    search_params: dict
+        Validated search params (q, field, house and optionally threshold)
+    offset: int
+    limit: int
+    values: tuple | None
+        Return dicts of just these fields (plus similarity) instead of model instances
+
+    Returns
+    -------
+    list of Representatives/dicts annotated with similarity
+    """
+    term = search_params["q"]
+    fields = (
+        TRIGRAM_SEARCH_FIELDS
+        if search_params.get("field", "all") == "all"
+        else (search_params["field"],)
+    )
+    threshold = search_params.get("threshold")
+    if threshold is None:
+        threshold = REPRESENTATIVE_SIMILARITY_THRESHOLD
+
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{f"{field}__trigram_word_similar": term})
+    similarities = [TrigramWordSimilarity(term, field) for field in fields]
+
+    queryset = Representative.objects.filter(condition).annotate(
+        similarity=Greatest(*similarities) if len(similarities) > 1 else similarities[0]
+    )
+    if search_params.get("house"):
+        queryset = queryset.filter(house=search_params["house"])
+    queryset = queryset.order_by("-similarity", "full_name")
+    if values:
+        queryset = queryset.values(*values, "similarity")
+
+    with transaction.atomic():
+        # %> matches on pg_trgm.word_similarity_threshold, scope it to this transaction
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)",
+                [str(threshold)],
+            )
+        return list(queryset[offset : (offset + limit)])
+
 
 class CreateRepresentative(CreateAPIView):
     serializer_class = serializers.UserFetchRepresentativeSerializer
@@ -74,8 +170,7 @@ class FilterRepresentatives(GenericAPIView):
     @extend_schema(
         tags=["Representatives"], parameters=[serializers.RepresentativeFilterSerilizer]
     )
-    @method_decorator(cache_page(60 * 60 * 2))
-    @method_decorator(vary_on_cookie)
+    @cache_response(Representative)
     def get(self, request):
         span = trace.get_current_span()
         add_request_data_to_span(span, request)
@@ -131,24 +226,16 @@ class FilterRepresentatives(GenericAPIView):
                 self.request.GET.get("current_parliamentary_roles")
             )
 
-        page = int(self.request.GET.get("page", "1"))
-        items_per_page = int(self.request.GET.get("items_per_page", "10"))
-        offset = (page - 1) * items_per_page
-
         representative_objects = Representative.objects
-        queryset = representative_objects.filter(**filter_params)[
-            offset : (offset + items_per_page)
-        ]
-        object_count = representative_objects.count()
-        pagination_info = {
-            "page": page,
-            "items_per_page": items_per_page,
-            "total_pages": int(math.ceil(object_count / items_per_page)),
-        }
+        queryset, pagination_info = paginate_queryset(
+            self.request, representative_objects.filter(**filter_params)
+        )
+        if pagination_info.get("page"):
+            add_count_to_pagination(pagination_info, Representative, filter_params)
         serializer_class = self.get_serializer_class()
         return Response(
             {
-                "data": serializer_class(queryset, many=True).data,
+                "data": serialize_cached(serializer_class, queryset),
                 "pagination": pagination_info,
             },
             status=status.HTTP_200_OK,
@@ -169,6 +256,123 @@ class ApiFilterRepresentatives(FilterRepresentatives):
             return process_error_response(e)
 
 
+class SearchRepresentatives(GenericAPIView):
+    def get_serializer_class(self):
+        if not self.request.user:
+            return serializers.UserFetchRepresentativeSerializer
+        else:
+            return serializers.FullFetchRepresentativeSerializer
+
+    @extend_schema(
+        tags=["Representatives"],
+        parameters=[serializers.RepresentativeSearchSerializer],
+    )
+    @cache_response(Representative)
+    def get(self, request):
+        """
+        Typo tolerant search over representative names and areas represented
+        """
+        try:
+            span = trace.get_current_span()
+            add_request_data_to_span(span, request)
+
+            search_serializer = serializers.RepresentativeSearchSerializer(
+                data=request.GET
+            )
+            if not search_serializer.is_valid():
+                return Response(
+                    {"error": search_serializer.errors},
+                    status=status.HTTP_417_EXPECTATION_FAILED,
+                )
+            search_params = search_serializer.validated_data
+            logger.info(f"Searching Reps with {search_params}")
+
+            page = search_params["page"]
+            items_per_page = search_params["items_per_page"]
+            representatives = trigram_search_representatives(
+                search_params, (page - 1) * items_per_page, items_per_page
+            )
+
+            serializer_class = self.get_serializer_class()
+            data = serialize_cached(serializer_class, representatives)
+            for representative, representative_data in zip(representatives, data):
+                representative_data["similarity"] = representative.similarity
+
+            return Response(
+                {
+                    "data": data,
+                    "pagination": {"page": page, "items_per_page": items_per_page},
+                },
+                status=status.HTTP_200_OK,
+            )
+        except Exception as e:
+            return process_error_response(e)
+
+
+class ApiSearchRepresentatives(SearchRepresentatives):
+    authentication_classes = [CustomTokenAuthentication]
+
+    @extend_schema(
+        tags=["Representatives"],
+        parameters=[serializers.RepresentativeSearchSerializer],
+    )
+    @has_expected_permissions(["view_representative"])
+    def get(self, request):
+        try:
+            return super().get(request)
+        except Exception as e:
+            return process_error_response(e)
+
+
+class AutocompleteRepresentatives(GenericAPIView):
+    def get_serializer(self, *args, **kwargs):
+        return
+
+    @extend_schema(
+        tags=["Representatives"],
+        parameters=[serializers.RepresentativeAutocompleteSerializer],
+        responses={200: GenericObjectResponse},
+    )
+    @cache_response(Representative)
+    def get(self, request):
+        """
+        Lightweight suggestions for search boxes, matches on partial words
+        """
+        try:
+            autocomplete_serializer = serializers.RepresentativeAutocompleteSerializer(
+                data=request.GET
+            )
+            if not autocomplete_serializer.is_valid():
+                return Response(
+                    {"error": autocomplete_serializer.errors},
+                    status=status.HTTP_417_EXPECTATION_FAILED,
+                )
+            search_params = autocomplete_serializer.validated_data
+
+            suggestions = trigram_search_representatives(
+                search_params, 0, search_params["limit"], values=AUTOCOMPLETE_FIELDS
+            )
+            return Response({"data": suggestions}, status=status.HTTP_200_OK)
+        except Exception as e:
+            return process_error_response(e)
+
+
+class ApiAutocompleteRepresentatives(AutocompleteRepresentatives):
+    authentication_classes = [CustomTokenAuthentication]
+
+    @extend_schema(
+        tags=["Representatives"],
+        parameters=[serializers.RepresentativeAutocompleteSerializer],
+        responses={200: GenericObjectResponse},
+    )
+    @has_expected_permissions(["view_representative"])
+    def get(self, request):
+        try:
+            return super().get(request)
+        except Exception as e:
+            return process_error_response(e)
+
+
 class GUDRepresentative(GenericAPIView):
     def get_serializer_class(self):
         if not self.request.user:
@@ -180,14 +384,13 @@ class GUDRepresentative(GenericAPIView):
         tags=["Representatives"],
         responses={200: serializers.FullFetchRepresentativeSerializer},
     )
-    @method_decorator(cache_page(60 * 60 * 2))
-    @method_decorator(vary_on_cookie)
+    @method_decorator(model_condition(Representative, version_field="version"))
+    @cache_response(Representative)
     def get(self, request, **kwargs):
         try:
             logger.info(f"Getting represenatative with ID {kwargs.get('id')}")
-            response_data = Representative.objects.get(pk=kwargs.get("id"))
             serializer_class = self.get_serializer_class()
-            response = serializer_class(response_data).data
+            response = serialize_object_cached(serializer_class, kwargs.get("id"))
 
             return Response(
                 {"data": response},
@@ -248,8 +451,7 @@ class GUDRepresentative(GenericAPIView):
                 )
 
             # Check if maker-checker is on for representative update
-            config = Config.objects.filter(name="representative_update_mode").first()
-            if config and config.value == "maker_checker":
+            if config_registry.get(REPRESENTATIVE_UPDATE_MODE) == "maker_checker":
                 update_dict = {"pending_update_json": full_update_data}
 
                 updated_representative = rep_serializer.update(
@@ -311,8 +513,7 @@ class ApproveRepresentative(GenericAPIView):
                 )
 
             # Check if maker checker is on for representative update
-            config = Config.objects.filter(name="representative_update_mode").first()
-            if config and config.value == "maker_checker":
+            if config_registry.get(REPRESENTATIVE_UPDATE_MODE) == "maker_checker":
                 update_dict = {"pending_update_json": full_update_data}
 
                 updated_representative = rep_serializer.update(
@@ -339,24 +540,30 @@ class ApproveRepresentative(GenericAPIView):
 
 
 class AddRepresentativeFile(GenericAPIView):
+    parser_classes = UPLOAD_PARSER_CLASSES
+
     # Removes --> should either include a `serializer_class` attribute, or override the `get_serializer_class()` method.
     def get_serializer(self, *args, **kwargs):
         return
 
     @extend_schema(
         tags=["Representatives"],
-        request={"application/json": serializers.RepresentativeFileUploadSerializer},
+        request={
+            "application/json": serializers.RepresentativeFileUploadSerializer,
+            "multipart/form-data": serializers.RepresentativeMultipartFileUploadSerializer,
+        },
     )
     @has_expected_permissions(["add_representative_file"])
     def post(self, request):
         try:
             span = trace.get_current_span()
             add_request_data_to_span(span, request)
+            fields, file_data = get_upload_request_data(request)
 
-            response_data = Representative.objects.get(pk=request.data["id"])
+            response_data = Representative.objects.get(pk=fields["id"])
             if response_data.id:
                 reps_data_bucket_name = os.environ.get("REPS_DATA_BUCKET_NAME")
-                file_name = request.data.get("file_name")
+                file_name = fields.get("file_name")
 
                 logger.info(
                     f"Initiating representative file upload --- > to S3 for {response_data.full_name}"
@@ -366,18 +573,18 @@ class AddRepresentativeFile(GenericAPIView):
                     "creation_date": response_data.created_at.strftime(
                         "%d/%m/%Y %H:%M:%S"
                     ),
-                    "source": request.data.get("image_source") or "",
+                    "source": fields.get("image_source") or "",
                     "representative_name": response_data.full_name,
-                    "content_type": request.data["file_extension"],
-                    "string_encoding_fmt": request.data["string_encoding_fmt"],
+                    "content_type": fields["file_extension"],
+                    "string_encoding_fmt": fields["string_encoding_fmt"],
                 }
 
                 # # File path should allow for replacement of images
                 response = file_upload_to_s3(
                     reps_data_bucket_name,
-                    FileTypeEnum[request.data.get("file_type")],
+                    FileTypeEnum[fields.get("file_type")],
                     file_name,
-                    request.data.get("base64_encoding"),
+                    file_data,
                     id=str(response_data.id),
                     metadata=metadata,
                     folder="representatives",
@@ -389,6 +596,14 @@ class AddRepresentativeFile(GenericAPIView):
                 ):
                     response_data.image_url = response["file_url"]
                     response_data.save()
+                    # Don't do celery stuff in pytest mode -Git actions
+                    if (
+                        FileTypeEnum[fields.get("file_type")] == FileTypeEnum.IMAGE
+                        and os.environ.get("ENVIRONMENT", "") != "test"
+                    ):
+                        generate_representative_image_variants.delay(
+                            str(response_data.id), response["file_url"]
+                        )
                     response = {
                         "message": "Image successfully uploaded",
                         "url": response["file_url"],
@@ -408,12 +623,20 @@ class GetRepresentativeFilesList(GenericAPIView):
     def get_serializer(self, *args, **kwargs):
         return
 
-    @extend_schema(tags=["Representatives"], responses={200: GenericObjectResponse})
+    @extend_schema(
+        tags=["Representatives"],
+        parameters=[FileListPaginationSerializer],
+        responses={200: GenericObjectResponse},
+    )
     def get(self, request, **kwargs):
+        """
+        Names of the files of a representative, a page at a time.
+        Listings are cached until a file is uploaded for the representative
+        """
         try:
             if kwargs.get("file_type") == FileTypeEnum.IMAGE.value.lower():
                 file_url = (
-                    f'representatives/{kwargs.get("id")}/{kwargs.get("file_type")}'
+                    f'representatives/{kwargs.get("id")}/{kwargs.get("file_type")}s/'
                 )
             else:
                 return process_error_response(
@@ -422,11 +645,21 @@ class GetRepresentativeFilesList(GenericAPIView):
                     )
                 )
 
-            file_data = get_s3_folder_objects(
-                os.environ.get("REPS_DATA_BUCKET_NAME"), file_url, name_only=True
+            # Delimiter leaves out generated images/variants/
+            file_data, pagination_info = paginate_list(
+                request,
+                get_s3_folder_objects(
+                    os.environ.get("REPS_DATA_BUCKET_NAME"),
+                    file_url,
+                    name_only=True,
+                    delimiter="/",
+                ),
             )
 
-            return Response({"data": file_data}, status=status.HTTP_200_OK)
+            return Response(
+                {"data": file_data, "pagination": pagination_info},
+                status=status.HTTP_200_OK,
+            )
         except Exception as e:
             return process_error_response(e)
 
@@ -437,19 +670,35 @@ class ApiGetRepresentativeFilesList(GenericAPIView):
     def get_serializer(self, *args, **kwargs):
         return
 
-    @extend_schema(tags=["Representatives"], responses={200: GenericObjectResponse})
+    @extend_schema(
+        tags=["Representatives"],
+        parameters=[FileListPaginationSerializer],
+        responses={200: GenericObjectResponse},
+    )
     @has_expected_permissions(["view_representative_file"])
-    def get(self, request, kwargs):
+    def get(self, request, **kwargs):
         try:
-            return super().get(request, kwargs)
+            return super().get(request, **kwargs)
         except Exception as e:
             return process_error_response(e)
 
 
 class GetRepresentativeDisplayImage(GenericAPIView):
-    @method_decorator(cache_page(60 * 60 * 2))
-    @method_decorator(vary_on_cookie)
-    @extend_schema(tags=["Representatives"], responses={200: GenericStringResponse})
+    @cache_response(Representative)
+    def display_image_response(self, request, file_url, etag):
+        # Keyed on the ETag so a new upload misses at once,
+        # and on the Representative generation for renames
+        file_data = get_s3_file_data(
+            os.environ.get("REPS_DATA_BUCKET_NAME"), file_url, etag=etag
+        )
+        # Return the base 64 encoded version
+        return Response({"data": file_data}, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        tags=["Representatives"],
+        parameters=[FileDeliverySerializer],
+        responses={200: GenericStringResponse},
+    )
     def get(self, request, **kwargs):
         try:
             rep_data = Representative.objects.get(pk=kwargs.get("id"))
@@ -460,11 +709,81 @@ class GetRepresentativeDisplayImage(GenericAPIView):
 
             logger.info(file_url)
 
-            file_data = get_s3_file_data(
-                os.environ.get("REPS_DATA_BUCKET_NAME"), file_url
+            presigned_response = presigned_file_response(
+                request,
+                os.environ.get("REPS_DATA_BUCKET_NAME"),
+                file_url,
+                FileTypeEnum.IMAGE,
             )
-            # Return the base 64 encoded version
-            return Response({"data": file_data}, status=status.HTTP_200_OK)
+            if presigned_response:
+                return presigned_response
+
+            etag = get_s3_file_etag(os.environ.get("REPS_DATA_BUCKET_NAME"), file_url)
+            not_modified = not_modified_response(request, etag)
+            if not_modified:
+                return not_modified
+
+            response = self.display_image_response(
+                request, file_url=file_url, etag=etag
+            )
+            # Cached entries only hold the data
+            for header, value in etag_headers(etag).items():
+                response[header] = value
+            return response
+
+        except Exception as e:
+            return process_error_response(e)
+
+
+class GetRepresentativeImageVariant(GenericAPIView):
+    content_negotiation_class = BinaryContentNegotiation
+
+    def get_serializer(self, *args, **kwargs):
+        return
+
+    @extend_schema(tags=["Representatives"], responses={200: "Image bytes"})
+    def get(self, request, **kwargs):
+        """
+        Display image thumbnail closest to <size> px (square) as binary,
+        WebP for clients accepting it and JPEG otherwise.
+
+        <version> comes from the representative's image_variants, a new upload
+        gets a new version so responses are cached as immutable
+        """
+        try:
+            rep_data = Representative.objects.get(pk=kwargs.get("id"))
+            image_variants = rep_data.image_variants or {}
+            if image_variants.get("version") != kwargs.get("version"):
+                return Response(
+                    {"error": "Image variant not found"},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+
+            size = best_fit_size(kwargs.get("size"), image_variants["sizes"])
+            extension = (
+                "webp" if "image/webp" in request.headers.get("Accept", "") else "jpeg"
+            )
+            file_url = image_variant_key(
+                f"representatives/{rep_data.id}/images",
+                image_variants["version"],
+                size,
+                extension,
+            )
+            # Variant keys never change, no need to ask S3
+            etag = f'"{image_variants["version"]}-{size}-{extension}"'
+            not_modified = not_modified_response(request, etag)
+            if not_modified:
+                not_modified["Vary"] = "Accept"
+                return not_modified
+
+            response = HttpResponse(
+                get_s3_file_bytes(os.environ.get("REPS_DATA_BUCKET_NAME"), file_url),
+                content_type=DISPLAY_IMAGE_FORMATS[extension][1],
+            )
+            response["Cache-Control"] = "public, max-age=31536000, immutable"
+            response["ETag"] = etag
+            response["Vary"] = "Accept"
+            return response
 
         except Exception as e:
             return process_error_response(e)
@@ -474,19 +793,49 @@ class GetRepresentativeFile(GenericAPIView):
     def get_serializer(self, *args, **kwargs):
         return
 
-    @extend_schema(tags=["Representatives"], responses={200: GenericObjectResponse})
+    @extend_schema(
+        tags=["Representatives"],
+        parameters=[FileDeliverySerializer],
+        responses={200: GenericObjectResponse},
+    )
     def get(self, request, **kwargs):
         try:
             if kwargs.get("file_type") and kwargs.get("file_name"):
+                if kwargs.get("file_type").upper() not in FileTypeEnum.__members__:
+                    return Response(
+                        {"error": f"file type <{kwargs.get("file_type")}> not found"},
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+
                 file_url = f'representatives/{kwargs.get("id")}/{kwargs.get("file_type")}s/{kwargs.get("file_name")}'
 
                 logger.info(file_url)
 
-                file_data = get_s3_file_data(
+                presigned_response = presigned_file_response(
+                    request,
+                    os.environ.get("REPS_DATA_BUCKET_NAME"),
+                    file_url,
+                    FileTypeEnum[kwargs.get("file_type").upper()],
+                )
+                if presigned_response:
+                    return presigned_response
+
+                etag = get_s3_file_etag(
                     os.environ.get("REPS_DATA_BUCKET_NAME"), file_url
                 )
+                not_modified = not_modified_response(request, etag)
+                if not_modified:
+                    return not_modified
+
+                file_data = get_s3_file_data(
+                    os.environ.get("REPS_DATA_BUCKET_NAME"), file_url, etag=etag
+                )
                 # Return the base 64 encoded version
-                return Response({"data": file_data}, status=status.HTTP_200_OK)
+                return Response(
+                    {"data": file_data},
+                    status=status.HTTP_200_OK,
+                    headers=etag_headers(etag),
+                )
             return Response(
                 {"error": "Invalid argument for <file_type>"}, status=status.HTTP_200_OK
             )
@@ -494,16 +843,71 @@ class GetRepresentativeFile(GenericAPIView):
             return process_error_response(e)
 
 
-class ApiGetRepresentativeFile(GenericAPIView):
+class ApiGetRepresentativeFile(GetRepresentativeFile):
+    authentication_classes = [CustomTokenAuthentication]
+
+    @extend_schema(
+        tags=["Representatives"],
+        parameters=[FileDeliverySerializer],
+        responses={200: GenericObjectResponse},
+    )
+    @has_expected_permissions(["view_representative_file"])
+    def get(self, request, **kwargs):
+        try:
+            return super().get(request, **kwargs)
+        except Exception as e:
+            return process_error_response(e)
+
+
+class ExportRepresentativeFiles(AsyncGenericAPIView):
+    def get_serializer(self, *args, **kwargs):
+        return
+
+    @extend_schema(
+        tags=["Representatives"],
+        responses={200: "ZIP of the representative's files"},
+    )
+    async def get(self, request, **kwargs):
+        """
+        Downloads all files of a representative as a ZIP, streamed as the files are fetched.
+        Generated image variants are left out
+        """
+        try:
+            rep_data = await Representative.objects.aget(pk=kwargs.get("id"))
+            directory = f"representatives/{rep_data.id}/"
+
+            response = StreamingHttpResponse(
+                streaming_content(
+                    request,
+                    stream_s3_zip(
+                        os.environ.get("REPS_DATA_BUCKET_NAME"),
+                        directory,
+                        exclude_prefixes=(f"{directory}images/variants/",),
+                    ),
+                ),
+                content_type="application/zip",
+            )
+            response["Content-Disposition"] = (
+                f'attachment; filename="{rep_data.full_name}.zip"'
+            )
+            return response
+        except Exception as e:
+            return process_error_response(e)
+
+
+class ApiExportRepresentativeFiles(ExportRepresentativeFiles):
     authentication_classes = [CustomTokenAuthentication]
 
     def get_serializer(self, *args, **kwargs):
         return
 
-    @extend_schema(tags=["Representatives"], responses={200: GenericObjectResponse})
+    @extend_schema(
+        tags=["Representatives"],
+        responses={200: "ZIP of the representative's files"},
+    )
     @has_expected_permissions(["view_representative_file"])
-    def get(self, request, **kwargs):
+    async def get(self, request, **kwargs):
         try:
-            return super().get(request, **kwargs)
+            return await super().get(request, **kwargs)
         except Exception as e:
             return process_error_response(e)
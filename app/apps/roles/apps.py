@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class RolesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.roles"
+
+    def ready(self):
+        # Registers the permission cache invalidation receivers
+        from apps.roles import signals  # noqa: F401
@@ -5,6 +5,7 @@ from utils.error_handler import process_error_response
 from utils.auth import has_expected_permissions
 from utils.generics import add_request_data_to_span
 from apps.roles import serializers
+from apps.helpers.pagination import paginate_queryset
 from drf_spectacular.utils import extend_schema
 from rest_framework.response import Response
 from opentelemetry import trace
@@ -72,17 +73,18 @@ class FilterPermissions(GenericAPIView):
             if self.request.GET.get("definition"):
                 filter_params["name__contains"] = self.request.GET.get("definition")
 
-            page = int(self.request.GET.get("page", "1"))
-            items_per_page = int(self.request.GET.get("items_per_page", "10"))
-            offset = (page - 1) * items_per_page
-
-            queryset = Permission.objects.filter(**filter_params)[
-                offset : (offset + items_per_page)
-            ]
+            # Groups/Permissions have no timestamps, the pk is the only stable order
+            queryset, pagination_info = paginate_queryset(
+                self.request,
+                Permission.objects.filter(**filter_params),
+                keys=("id",),
+                descending=False,
+            )
 
             return Response(
                 {
                     "data": self.serializer_class(queryset, many=True).data,
+                    "pagination": pagination_info,
                 },
                 status=status.HTTP_200_OK,
             )
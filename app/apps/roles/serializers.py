@@ -57,6 +57,15 @@ class RoleCreationSerializer(serializers.Serializer):
 class FilterSerializer(serializers.Serializer):
     page = serializers.IntegerField(default=1)
     items_per_page = serializers.IntegerField(default=10)
+    pagination = serializers.ChoiceField(
+        choices=["page", "cursor"],
+        default="page",
+        help_text="cursor pages on id and costs the same for every page",
+    )
+    cursor = serializers.CharField(
+        required=False,
+        help_text="next_cursor/prev_cursor of a previous response. Implies pagination=cursor",
+    )
 
 
 class PermissionFilterSerializer(FilterSerializer):
@@ -0,0 +1,23 @@
+import logging
+from django.contrib.auth.models import Group, Permission
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from apps.users.models import User
+from utils.permission_utils import invalidate_permissions_cache
+
+logger = logging.getLogger("app_logger")
+
+
+@receiver([post_save, post_delete], sender=Group)
+@receiver([post_save, post_delete], sender=Permission)
+@receiver(post_delete, sender=User)
+@receiver(m2m_changed, sender=Group.permissions.through)
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_cached_permissions(sender, **kwargs):
+    # m2m_changed fires on both pre_* and post_* actions, only the post_* ones matter
+    action = kwargs.get("action")
+    if action and not action.startswith("post_"):
+        return
+
+    logger.info(f"Role/permission change from {sender} ---> invalidating permissions")
+    invalidate_permissions_cache()
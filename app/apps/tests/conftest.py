@@ -13,6 +13,10 @@ from tests import factories
 from rest_framework.test import APIClient
 from pytest_factoryboy import register
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from utils.file_utils import generic_file_utils, zip_utils
+from utils.file_utils.object_cache import S3ObjectCache
+from utils.file_utils.storage import InMemoryStorageBackend
 
 register(factories.UserFactory)
 register(factories.BillFactory)
@@ -27,6 +31,14 @@ register(factories.FAQFactory)
 pytestmark = pytest.mark.django_db
 
 
+@pytest.fixture(autouse=True)
+def clear_cache_fixt():
+    # Cached responses, counts and serialized rows would leak between tests
+    cache.clear()
+    yield
+    cache.clear()
+
+
 @pytest.fixture
 def super_user_fixt():
     return factories.UserFactory.create(
@@ -77,7 +89,7 @@ def api_client_fixt():
 @pytest.fixture
 def superuser_token_api_client_fixt(super_user_fixt):
     response = APIClient().post(
-        "/api/users/v1/login/user",
+        "/users/portal/v1/login/user",
         {"username": super_user_fixt.username, "password": "test_password"},
     )
 
@@ -216,3 +228,19 @@ def client_app_perm_fix():
         name="view_representatives",
         content_type=ContentType.objects.get_for_model(User),
     )
+
+
+# FILES
+@pytest.fixture
+def storage_backend_fixt(monkeypatch, tmp_path):
+    # File endpoints read/write a fresh in memory store instead of S3
+    backend = InMemoryStorageBackend()
+    monkeypatch.setattr(generic_file_utils, "representative_s3_processor", backend)
+    monkeypatch.setattr(zip_utils, "representative_s3_processor", backend)
+    monkeypatch.setattr(
+        generic_file_utils,
+        "s3_object_cache",
+        S3ObjectCache(backend, directory=str(tmp_path / "s3_object_cache")),
+    )
+    monkeypatch.setenv("VOTES_DATA_BUCKET_NAME", "test-votes")
+    return backend
@@ -0,0 +1,141 @@
+import asyncio
+import io
+import zipfile
+import pytest
+from asgiref.sync import async_to_sync
+from django.http import HttpResponse
+from django.test import AsyncClient, RequestFactory
+from django.test.client import AsyncRequestFactory
+from utils.auth import get_tokens_for_user
+from utils.custom_middlewares.OTL import RequestInjectorMiddleware
+from utils.file_utils.generic_file_utils import iterate_in_thread, streaming_content
+
+pytestmark = pytest.mark.django_db
+
+VOTE_FILE = b'{"votes": ["YES", "NO"]}' * 1000
+
+
+async def read_streaming_content(response) -> bytes:
+    assert response.is_async
+    return b"".join([chunk async for chunk in response.streaming_content])
+
+
+@pytest.fixture
+def vote_file_fixt(storage_backend_fixt, bill_fixt):
+    storage_backend_fixt.upload_file(
+        VOTE_FILE,
+        "test-votes",
+        f"votes/{bill_fixt.house.lower()}/{bill_fixt.title}/votes.json",
+    )
+    return bill_fixt
+
+
+def test_stream_vote_file_under_asgi(vote_file_fixt):
+    @async_to_sync
+    async def stream():
+        client = AsyncClient()
+        url = f"/votes/portal/v1/{vote_file_fixt.id}/file/stream/votes.json"
+        full = await client.get(url)
+        partial = await client.get(url, headers={"Range": "bytes=100-199"})
+        return (
+            full,
+            await read_streaming_content(full),
+            partial,
+            await read_streaming_content(partial),
+        )
+
+    full, full_body, partial, partial_body = stream()
+
+    assert full.status_code == 200
+    assert full_body == VOTE_FILE
+    assert full["span-id"] and full["trace-id"]
+    assert partial.status_code == 206
+    assert partial_body == VOTE_FILE[100:200]
+
+
+def test_export_vote_files_under_asgi(vote_file_fixt):
+    @async_to_sync
+    async def export():
+        response = await AsyncClient().get(
+            f"/votes/portal/v1/{vote_file_fixt.id}/file/export"
+        )
+        return response, await read_streaming_content(response)
+
+    response, body = export()
+
+    assert response.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(body)) as archive:
+        assert archive.read("votes.json") == VOTE_FILE
+
+
+def test_async_views_check_permissions(
+    vote_file_fixt, regular_user_fixt, super_user_fixt
+):
+    url = f"/votes/api/v1/{vote_file_fixt.id}/file/stream/votes.json"
+
+    @async_to_sync
+    async def stream(token):
+        response = await AsyncClient().get(
+            url, headers={"Authorization": f"Bearer {token}"}
+        )
+        body = await read_streaming_content(response) if response.streaming else None
+        return response, body
+
+    response, _ = stream(
+        get_tokens_for_user(regular_user_fixt, "token_login")["access"]
+    )
+    assert response.status_code == 403
+    assert "view_votes_file" in str(response.data)
+
+    response, body = stream(
+        get_tokens_for_user(super_user_fixt, "token_login")["access"]
+    )
+    assert response.status_code == 200
+    assert body == VOTE_FILE
+
+
+def test_iterate_in_thread_closes_the_iterator():
+    closed = []
+
+    def chunks():
+        try:
+            yield from [b"a", b"b", b"c"]
+        finally:
+            closed.append(True)
+
+    @async_to_sync
+    async def read_first_chunk():
+        iterator = iterate_in_thread(chunks())
+        chunk = await iterator.__anext__()
+        # Client gone
+        await iterator.aclose()
+        return chunk
+
+    assert read_first_chunk() == b"a"
+    assert closed == [True]
+
+
+def test_streaming_content_matches_the_handler():
+    iterator = iter([b"a"])
+
+    assert streaming_content(RequestFactory().get("/"), iterator) is iterator
+    assert hasattr(
+        streaming_content(AsyncRequestFactory().get("/"), iterator), "__aiter__"
+    )
+
+
+def test_request_injector_middleware_sync_and_async():
+    def get_response(request):
+        return HttpResponse("ok")
+
+    async def aget_response(request):
+        return HttpResponse("ok")
+
+    response = RequestInjectorMiddleware(get_response)(RequestFactory().get("/"))
+    assert response["trace-id"]
+
+    middleware = RequestInjectorMiddleware(aget_response)
+    assert asyncio.iscoroutinefunction(middleware)
+    response = async_to_sync(middleware)(AsyncRequestFactory().get("/"))
+    assert response.content == b"ok"
+    assert response["span-id"]
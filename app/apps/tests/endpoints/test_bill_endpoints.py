@@ -1,5 +1,9 @@
 import pytest
 from datetime import datetime
+from django.db import connection
+from apps.bills.models import BillStatus
+from tests.factories import BillFactory
+from utils.enum_utils import HouseChoices
 
 pytestmark = pytest.mark.django_db
 
@@ -68,3 +72,67 @@ def test_bill_delete(api_client_fixt, create_bill):
     )
 
     assert response.status_code == 204
+
+
+@pytest.fixture
+def finance_bill_fixt(representative_fixt):
+    return BillFactory.create(
+        title="Finance Bill 2024",
+        summary="An act to amend the law relating to taxation of kengen",
+        status=BillStatus.IN_PROGRESS,
+        sponsored_by=representative_fixt.id,
+        house=HouseChoices.NATIONAL,
+    )
+
+
+def test_bill_filter_counts_only_matching_bills(
+    api_client_fixt, superuser_token_api_client_fixt, finance_bill_fixt, bill_fixt
+):
+    response = api_client_fixt.get(
+        "/bills/portal/v1/filter?items_per_page=10&page=1&title=Finance",
+        headers={"Authorization": f"Bearer {superuser_token_api_client_fixt}"},
+    )
+
+    assert response.status_code == 200
+    assert [bill["id"] for bill in response.data.get("data")] == [
+        str(finance_bill_fixt.id)
+    ]
+    assert response.data.get("pagination").get("total_items") == 1
+    assert response.data.get("pagination").get("approximate") is False
+
+
+# search_vector is filled by the trigger of bills migration 0004
+requires_postgres = pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="Full text search needs postgres"
+)
+
+
+@requires_postgres
+def test_bill_search(api_client_fixt, finance_bill_fixt, bill_fixt):
+    response = api_client_fixt.get("/bills/portal/v1/search?q=finance")
+
+    assert response.status_code == 200
+    assert [bill["id"] for bill in response.data.get("data")] == [
+        str(finance_bill_fixt.id)
+    ]
+    assert "<mark>" in response.data.get("data")[0].get("highlight").get("title")
+
+
+@requires_postgres
+@pytest.mark.parametrize("q", ["finance &", "finance & !(", "'kengen", "tax:*"])
+def test_bill_search_tsquery_syntax_is_plain_text(
+    api_client_fixt, finance_bill_fixt, q
+):
+    # websearch_to_tsquery never raises on operators typed by users
+    response = api_client_fixt.get("/bills/portal/v1/search", {"q": q})
+
+    assert response.status_code == 200
+
+
+def test_bill_search_rejects_raw_tsquery(api_client_fixt):
+    response = api_client_fixt.get(
+        "/bills/portal/v1/search?q=finance%20%26&search_type=raw"
+    )
+
+    assert response.status_code == 417
+    assert "search_type" in response.data.get("error")
@@ -0,0 +1,91 @@
+import base64
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def bill_upload_client_fixt(
+    api_client_fixt, storage_backend_fixt, super_user_fixt, monkeypatch
+):
+    monkeypatch.setenv("BILLS_DATA_BUCKET_NAME", "test-bills")
+    api_client_fixt.force_authenticate(user=super_user_fixt)
+    return api_client_fixt
+
+
+def assert_bill_file_stored(backend, bill, file_name, data):
+    stored = backend.get_file("test-bills", f"bills/{bill.house}/bills/{file_name}")
+    assert stored["Body"].read() == data
+    assert stored["Metadata"]["body_encoding"] == "binary"
+    bill.refresh_from_db()
+    assert bill.file_url == f"s3://test-bills/bills/{bill.house}/bills/{file_name}"
+
+
+def test_bill_file_multipart_upload(
+    bill_upload_client_fixt, storage_backend_fixt, bill_fixt, settings
+):
+    # Spooled to a temp file by Django and streamed from it
+    settings.FILE_UPLOAD_MAX_MEMORY_SIZE = 1024
+    data = bytes(range(256)) * 400
+
+    response = bill_upload_client_fixt.post(
+        "/bills/portal/v1/upload/file",
+        {
+            "id": str(bill_fixt.id),
+            "file_type": "BILL",
+            "file": SimpleUploadedFile("finance.pdf", data, "application/pdf"),
+        },
+        format="multipart",
+    )
+
+    assert response.status_code == 200
+    assert_bill_file_stored(storage_backend_fixt, bill_fixt, "finance.pdf", data)
+    stored = storage_backend_fixt.head_file(
+        "test-bills", f"bills/{bill_fixt.house}/bills/finance.pdf"
+    )
+    assert stored["ContentType"] == "application/pdf"
+    assert stored["Metadata"]["content_type"] == ".pdf"
+
+
+def test_bill_file_raw_body_upload(
+    bill_upload_client_fixt, storage_backend_fixt, bill_fixt
+):
+    data = b"%PDF-1.7 " + bytes(range(256)) * 10
+
+    response = bill_upload_client_fixt.generic(
+        "POST",
+        f"/bills/portal/v1/upload/file?id={bill_fixt.id}&file_type=BILL",
+        data,
+        content_type="application/pdf",
+        headers={"Content-Disposition": 'attachment; filename="finance.pdf"'},
+    )
+
+    assert response.status_code == 200
+    assert_bill_file_stored(storage_backend_fixt, bill_fixt, "finance.pdf", data)
+
+
+def test_bill_file_json_upload(
+    bill_upload_client_fixt, storage_backend_fixt, bill_fixt
+):
+    data = b"%PDF-1.7 legacy upload"
+
+    response = bill_upload_client_fixt.post(
+        "/bills/portal/v1/upload/file",
+        {
+            "id": str(bill_fixt.id),
+            "file_type": "BILL",
+            "file_name": "finance.pdf",
+            "file_extension": ".pdf",
+            "string_encoding_fmt": "utf-8",
+            "base64_encoding": base64.b64encode(data).decode(),
+        },
+        format="json",
+    )
+
+    assert response.status_code == 200
+    assert_bill_file_stored(storage_backend_fixt, bill_fixt, "finance.pdf", data)
+    # Still read back as base64 over JSON
+    response = bill_upload_client_fixt.get(f"/bills/portal/v1/{bill_fixt.id}/file")
+    assert response.status_code == 200
+    assert response.data.get("data") == base64.b64encode(data)
@@ -0,0 +1,86 @@
+import pytest
+from django.db.models import F
+from apps.representatives.models import Representative
+from apps.votes.models import VoteTypeChoices
+from tests.factories import IndividualVoteFactory
+from utils.enum_utils import HouseChoices
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def detail_urls_fixt(bill_fixt, representative_fixt):
+    # Not individual_vote_fixt, its representative would clash with bill_fixt's
+    vote = IndividualVoteFactory.create(
+        bill_id=bill_fixt.id,
+        representative_id=representative_fixt.id,
+        vote_type=VoteTypeChoices.INDIVIDUAL,
+        house=HouseChoices.NATIONAL,
+        vote="NO",
+    )
+    return {
+        "bill": (bill_fixt, f"/bills/portal/v1/{bill_fixt.id}"),
+        "vote": (vote, f"/votes/portal/v1/{vote.id}"),
+        "representative": (
+            representative_fixt,
+            f"/representatives/portal/v1/{representative_fixt.id}",
+        ),
+    }
+
+
+@pytest.mark.parametrize("resource", ["bill", "vote", "representative"])
+def test_detail_not_modified(api_client_fixt, detail_urls_fixt, resource):
+    _, url = detail_urls_fixt[resource]
+    response = api_client_fixt.get(url)
+    assert response.status_code == 200
+    assert response["ETag"].startswith('W/"')
+
+    response = api_client_fixt.get(url, headers={"If-None-Match": response["ETag"]})
+    assert response.status_code == 304
+    assert not response.content
+
+    response = api_client_fixt.get(
+        url, headers={"If-Modified-Since": response["Last-Modified"]}
+    )
+    assert response.status_code == 304
+
+
+@pytest.mark.parametrize("resource", ["bill", "vote", "representative"])
+def test_detail_modified_after_save(
+    api_client_fixt, detail_urls_fixt, resource, django_capture_on_commit_callbacks
+):
+    instance, url = detail_urls_fixt[resource]
+    etag = api_client_fixt.get(url)["ETag"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        instance.save()
+
+    response = api_client_fixt.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+
+def test_representative_version_changes_etag(
+    api_client_fixt, representative_fixt, django_capture_on_commit_callbacks
+):
+    url = f"/representatives/portal/v1/{representative_fixt.id}"
+    etag = api_client_fixt.get(url)["ETag"]
+
+    # Queryset updates that leave updated_at as is
+    Representative.objects.filter(pk=representative_fixt.id).update(
+        version=F("version") + 1
+    )
+
+    response = api_client_fixt.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+
+
+def test_detail_etag_varies_with_the_user(api_client_fixt, bill_fixt, super_user_fixt):
+    url = f"/bills/portal/v1/{bill_fixt.id}"
+    public_etag = api_client_fixt.get(url)["ETag"]
+
+    api_client_fixt.force_authenticate(user=super_user_fixt)
+    response = api_client_fixt.get(url, headers={"If-None-Match": public_etag})
+
+    assert response.status_code == 200
+    assert response["ETag"] != public_etag
@@ -0,0 +1,213 @@
+import base64
+import io
+import json
+import zipfile
+import pytest
+from django.utils.encoding import iri_to_uri
+from utils.enum_utils import FileTypeEnum
+from utils.file_utils import generic_file_utils
+from utils.file_utils.object_cache import S3ObjectCache
+from utils.file_utils.storage import InMemoryStorageBackend, StorageBackend
+
+pytestmark = pytest.mark.django_db
+
+VOTE_FILE = json.dumps(
+    {"votes": [{"representative": i, "vote": "YES"} for i in range(500)]}
+).encode("utf-8")
+
+
+class PresigningStorageBackend(InMemoryStorageBackend):
+    supports_presigned_urls = True
+
+    def generate_presigned_url(
+        self, bucket_name, obj_name, expires_in, content_disposition=None
+    ):
+        return f"https://{bucket_name}.s3.test/{obj_name}?expires_in={expires_in}"
+
+
+def upload_vote_file(backend, bill, file_name, data, stored_as="binary"):
+    file_url = f"votes/{bill.house.lower()}/{bill.title}/{file_name}"
+    if stored_as == "base64":
+        # Legacy objects hold the base64 encoding of the file
+        backend.upload_file(base64.b64encode(data).decode(), "test-votes", file_url)
+    else:
+        backend.upload_file(data, "test-votes", file_url)
+    return file_url
+
+
+def streamed_body(response) -> bytes:
+    return b"".join(response.streaming_content)
+
+
+@pytest.mark.parametrize("stored_as", ["binary", "base64"])
+def test_vote_file_data(api_client_fixt, storage_backend_fixt, bill_fixt, stored_as):
+    upload_vote_file(
+        storage_backend_fixt, bill_fixt, "votes.json", VOTE_FILE, stored_as
+    )
+
+    response = api_client_fixt.get(
+        f"/votes/portal/v1/{bill_fixt.id}/file/data/votes.json"
+    )
+
+    assert response.status_code == 200
+    assert response.data.get("data") == json.loads(VOTE_FILE)
+
+
+@pytest.mark.parametrize("stored_as", ["binary", "base64"])
+def test_stream_vote_file_ranges(
+    api_client_fixt, storage_backend_fixt, bill_fixt, stored_as
+):
+    upload_vote_file(
+        storage_backend_fixt, bill_fixt, "votes.json", VOTE_FILE, stored_as
+    )
+    url = f"/votes/portal/v1/{bill_fixt.id}/file/stream/votes.json"
+
+    response = api_client_fixt.get(url)
+    assert response.status_code == 200
+    assert streamed_body(response) == VOTE_FILE
+
+    # Starts and stops off the 3 byte base64 groups
+    response = api_client_fixt.get(url, headers={"Range": "bytes=10-1000"})
+    assert response.status_code == 206
+    assert response["Content-Range"] == f"bytes 10-1000/{len(VOTE_FILE)}"
+    assert streamed_body(response) == VOTE_FILE[10:1001]
+
+    response = api_client_fixt.get(url, headers={"Range": "bytes=-7"})
+    assert response.status_code == 206
+    assert streamed_body(response) == VOTE_FILE[-7:]
+
+    for byte_range in ["bytes=-0", f"bytes={len(VOTE_FILE)}-"]:
+        response = api_client_fixt.get(url, headers={"Range": byte_range})
+        assert response.status_code == 416
+        assert response["Content-Range"] == f"bytes */{len(VOTE_FILE)}"
+
+
+def test_export_vote_files(api_client_fixt, storage_backend_fixt, bill_fixt):
+    upload_vote_file(storage_backend_fixt, bill_fixt, "votes.json", VOTE_FILE)
+    upload_vote_file(
+        storage_backend_fixt, bill_fixt, "division.json", b'{"YES": 1}', "base64"
+    )
+
+    response = api_client_fixt.get(f"/votes/portal/v1/{bill_fixt.id}/file/export")
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/zip"
+    with zipfile.ZipFile(io.BytesIO(streamed_body(response))) as archive:
+        assert archive.testzip() is None
+        assert sorted(archive.namelist()) == ["division.json", "votes.json"]
+        assert archive.read("votes.json") == VOTE_FILE
+        assert archive.read("division.json") == b'{"YES": 1}'
+
+
+def test_vote_file_etag(api_client_fixt, storage_backend_fixt, bill_fixt):
+    upload_vote_file(storage_backend_fixt, bill_fixt, "votes.json", VOTE_FILE)
+
+    for endpoint in ["data", "download", "stream"]:
+        url = f"/votes/portal/v1/{bill_fixt.id}/file/{endpoint}/votes.json"
+        etag = api_client_fixt.get(url)["ETag"]
+
+        response = api_client_fixt.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+
+    # Overwritten through the app, the cached ETag goes with it
+    generic_file_utils.file_upload_to_s3(
+        "test-votes",
+        FileTypeEnum.VOTE,
+        "votes.json",
+        base64.b64encode(b"{}").decode(),
+        folder=bill_fixt.title,
+        house=bill_fixt.house.lower(),
+    )
+    response = api_client_fixt.get(
+        f"/votes/portal/v1/{bill_fixt.id}/file/data/votes.json",
+        headers={"If-None-Match": etag},
+    )
+    assert response.status_code == 200
+    assert response.data.get("data") == {}
+
+
+def test_vote_file_etag_matches_body_after_upload_on_another_host(
+    api_client_fixt, storage_backend_fixt, bill_fixt, monkeypatch, tmp_path
+):
+    upload_vote_file(storage_backend_fixt, bill_fixt, "votes.json", VOTE_FILE)
+    url = f"/votes/portal/v1/{bill_fixt.id}/file/data/votes.json"
+    etag = api_client_fixt.get(url)["ETag"]
+    local_cache = generic_file_utils.s3_object_cache
+
+    # Another host only drops its own disk copy, this one is still within its TTL
+    with monkeypatch.context() as other_host:
+        other_host.setattr(
+            generic_file_utils,
+            "s3_object_cache",
+            S3ObjectCache(storage_backend_fixt, directory=str(tmp_path / "other")),
+        )
+        generic_file_utils.file_upload_to_s3(
+            "test-votes",
+            FileTypeEnum.VOTE,
+            "votes.json",
+            base64.b64encode(b"{}").decode(),
+            folder=bill_fixt.title,
+            house=bill_fixt.house.lower(),
+        )
+    assert generic_file_utils.s3_object_cache is local_cache
+
+    response = api_client_fixt.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+    assert response.data.get("data") == {}
+
+
+def test_vote_file_presigned_delivery(
+    api_client_fixt, storage_backend_fixt, monkeypatch, bill_fixt
+):
+    backend = PresigningStorageBackend()
+    monkeypatch.setattr(generic_file_utils, "representative_s3_processor", backend)
+    monkeypatch.setattr(generic_file_utils.s3_object_cache, "s3_processor", backend)
+    file_url = upload_vote_file(backend, bill_fixt, "votes.json", VOTE_FILE)
+    url = f"/votes/portal/v1/{bill_fixt.id}/file/data/votes.json"
+
+    response = api_client_fixt.get(f"{url}?delivery=url")
+    assert response.status_code == 200
+    presigned_url = response.data["data"]["url"]
+    assert presigned_url == f"https://test-votes.s3.test/{file_url}?expires_in=900"
+    assert 0 < response.data["data"]["expires_in"] <= 900
+    assert "private" in response["Cache-Control"]
+
+    response = api_client_fixt.get(f"{url}?delivery=redirect")
+    assert response.status_code == 302
+    assert response["Location"] == iri_to_uri(presigned_url)
+
+    response = api_client_fixt.get(f"{url}?delivery=inline")
+    assert response.status_code == 200
+    assert response.data.get("data") == json.loads(VOTE_FILE)
+
+
+def test_vote_file_url_delivery_without_presigned_urls(
+    api_client_fixt, storage_backend_fixt, bill_fixt
+):
+    # The in memory store has no urls, the file is served inline instead
+    upload_vote_file(storage_backend_fixt, bill_fixt, "votes.json", VOTE_FILE)
+
+    response = api_client_fixt.get(
+        f"/votes/portal/v1/{bill_fixt.id}/file/data/votes.json?delivery=url"
+    )
+
+    assert response.status_code == 200
+    assert response.data.get("data") == json.loads(VOTE_FILE)
+
+
+def test_incomplete_storage_backend_fails_on_creation():
+    class ReadOnlyStorageBackend(StorageBackend):
+        def get_file(self, bucket_name, obj_name, range=None, if_none_match=None):
+            return {}
+
+        def head_file(self, bucket_name, obj_name):
+            return {}
+
+    with pytest.raises(TypeError, match="upload_file"):
+        ReadOnlyStorageBackend()
+
+    # Presigning is optional, InMemoryStorageBackend doesn't implement it
+    with pytest.raises(NotImplementedError):
+        InMemoryStorageBackend().generate_presigned_url("bucket", "key", 60)
@@ -1,4 +1,12 @@
 import pytest
+from django.db import connection
+from apps.representatives.models import (
+    GenderChoices,
+    PositionChoices,
+    PositionClassChoices,
+)
+from tests.factories import RepresentativeFactory
+from utils.enum_utils import HouseChoices
 
 pytestmark = pytest.mark.django_db
 
@@ -73,3 +81,47 @@ def test_representative_delete(api_client_fixt, create_representative):
     )
 
     assert response.status_code == 204
+
+
+@pytest.fixture
+def named_representative_fixt():
+    return RepresentativeFactory.create(
+        full_name="Some random name",
+        area_represented="KENYA",
+        position=PositionChoices.MP,
+        position_class=PositionClassChoices.ELECTED,
+        house=HouseChoices.NATIONAL,
+        gender=GenderChoices.MALE,
+    )
+
+
+# pg_trgm is enabled by representatives migration 0005
+@pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="Trigram search needs postgres"
+)
+@pytest.mark.parametrize("prefix", ["portal", "api"])
+def test_representative_fuzzy_search(
+    api_client_fixt,
+    superuser_token_api_client_fixt,
+    named_representative_fixt,
+    representative_fixt,
+    prefix,
+):
+    headers = {"Authorization": f"Bearer {superuser_token_api_client_fixt}"}
+    # Misspelt name still matches
+    response = api_client_fixt.get(
+        f"/representatives/{prefix}/v1/search",
+        {"q": "Some randm nme"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.data["data"][0]["id"] == str(named_representative_fixt.id)
+    assert response.data["data"][0]["similarity"] > 0
+
+    response = api_client_fixt.get(
+        f"/representatives/{prefix}/v1/autocomplete",
+        {"q": "Som", "field": "full_name"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.data["data"][0]["full_name"] == "Some random name"
@@ -0,0 +1,80 @@
+import pytest
+from django.core.cache import cache
+from apps.bills.models import Bill
+from tests.factories import BillFactory
+from utils.cache_utils import bump_model_generation, get_model_generation
+from utils.serializer_cache import invalidate_serialized
+
+pytestmark = pytest.mark.django_db
+
+FILTER_URL = "/bills/portal/v1/filter?items_per_page=10&page=1"
+
+
+def bill_titles(response) -> list:
+    return sorted(bill["title"] for bill in response.data["data"])
+
+
+def test_cached_response_is_served_without_queries(
+    api_client_fixt, bill_fixt, django_assert_num_queries
+):
+    response = api_client_fixt.get(FILTER_URL)
+    assert response.status_code == 200
+
+    with django_assert_num_queries(0):
+        cached = api_client_fixt.get(FILTER_URL)
+    assert cached.status_code == 200
+    assert cached.data == response.data
+
+    # Same params in another order share the entry
+    with django_assert_num_queries(0):
+        api_client_fixt.get("/bills/portal/v1/filter?page=1&items_per_page=10")
+
+
+def test_cached_response_misses_after_a_write(
+    api_client_fixt, bill_fixt, django_capture_on_commit_callbacks
+):
+    assert bill_titles(api_client_fixt.get(FILTER_URL)) == [bill_fixt.title]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        bill_fixt.title = "Finance Bill 2025"
+        bill_fixt.save()
+    assert bill_titles(api_client_fixt.get(FILTER_URL)) == ["Finance Bill 2025"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        new_bill = BillFactory.create(title="Appropriations Bill", house="NATIONAL")
+    assert bill_titles(api_client_fixt.get(FILTER_URL)) == [
+        "Appropriations Bill",
+        "Finance Bill 2025",
+    ]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        new_bill.delete()
+    assert bill_titles(api_client_fixt.get(FILTER_URL)) == ["Finance Bill 2025"]
+
+
+def test_queryset_updates_need_a_generation_bump(
+    api_client_fixt, bill_fixt, django_capture_on_commit_callbacks
+):
+    api_client_fixt.get(FILTER_URL)
+    Bill.objects.filter(pk=bill_fixt.pk).update(title="Updated in bulk")
+
+    # Signals are skipped, the stale entry is served until the generation is bumped
+    assert bill_titles(api_client_fixt.get(FILTER_URL)) == [bill_fixt.title]
+    with django_capture_on_commit_callbacks(execute=True):
+        bump_model_generation(Bill)
+        invalidate_serialized(Bill, [bill_fixt.pk])
+    assert bill_titles(api_client_fixt.get(FILTER_URL)) == ["Updated in bulk"]
+
+
+def test_generations_live_in_the_response_cache():
+    generation = get_model_generation(Bill)
+    bump_model_generation(Bill)
+    assert cache.get("generation:bills.bill") == generation + 1
+
+    # An evicted counter never comes back at a value old entries are keyed on
+    cache.delete("generation:bills.bill")
+    assert get_model_generation(Bill) > generation + 1
+
+    cache.delete("generation:bills.bill")
+    bump_model_generation(Bill)
+    assert get_model_generation(Bill) > generation + 1
@@ -1,4 +1,6 @@
 import pytest
+from tests.factories import GroupFactory
+from utils.permission_utils import get_user_permission_codenames
 
 pytestmark = pytest.mark.django_db
 
@@ -131,3 +133,17 @@ def test_role_delete(create_role_fixt, api_client_fixt):
     )
 
     assert response.status_code == 204
+
+
+def test_cached_permissions_follow_role_changes(regular_user_fixt, client_app_perm_fix):
+    group = GroupFactory.create(name="cached_role")
+    regular_user_fixt.groups.add(group)
+    assert get_user_permission_codenames(regular_user_fixt.id) == frozenset()
+
+    group.permissions.add(client_app_perm_fix)
+    assert get_user_permission_codenames(regular_user_fixt.id) == frozenset(
+        ["view_representatives"]
+    )
+
+    regular_user_fixt.groups.remove(group)
+    assert get_user_permission_codenames(regular_user_fixt.id) == frozenset()
@@ -1,5 +1,6 @@
 import pytest
 from rest_framework import status
+from utils.auth import TokenUser, get_tokens_for_user, verify_user_token
 
 pytestmark = pytest.mark.django_db
 
@@ -124,3 +125,19 @@ def test_user_delete(
         },
     )
     assert response.status_code == 204
+
+
+def test_stateless_token_user_is_built_from_claims(
+    regular_user_fixt, django_assert_num_queries
+):
+    token = get_tokens_for_user(regular_user_fixt, "token_login")["access"]
+    with django_assert_num_queries(0):
+        verified = verify_user_token(token, None, stateless=True)
+        token_user = verified["user"]
+        assert isinstance(token_user, TokenUser)
+        assert token_user.username == regular_user_fixt.username
+        assert token_user.is_superuser is False
+
+    # Attributes outside of the claims load the row lazily
+    with django_assert_num_queries(1):
+        assert token_user.email == regular_user_fixt.email
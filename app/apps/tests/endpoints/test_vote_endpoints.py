@@ -1,4 +1,10 @@
+import uuid
 import pytest
+from apps.bills.models import VoteIngestionStatus
+from apps.votes.models import Vote
+from apps.votes.tasks import _save_ingestion_state
+from tests.factories import IndividualVoteFactory, RepresentativeFactory
+from utils.enum_utils import HouseChoices, VoteTypeChoices
 
 pytestmark = pytest.mark.django_db
 
@@ -89,3 +95,127 @@ def test_vote_delete(api_client_fixt, create_consensus_vote):
     )
 
     assert response.status_code == 204
+
+
+@pytest.fixture
+def individual_votes_fixt(bill_fixt, representative_fixt):
+    # Not individual_vote_fixt, its representative would clash with bill_fixt's
+    # on the unique (blank) full_name
+    return [
+        IndividualVoteFactory.create(
+            bill_id=bill_fixt.id,
+            representative_id=representative_fixt.id,
+            vote_type=VoteTypeChoices.INDIVIDUAL,
+            house=HouseChoices.NATIONAL,
+            vote="YES",
+        )
+        for _ in range(3)
+    ]
+
+
+def test_vote_filter_cursor_pagination(
+    api_client_fixt, individual_votes_fixt, superuser_token_api_client_fixt
+):
+    headers = {"Authorization": f"Bearer {superuser_token_api_client_fixt}"}
+    response = api_client_fixt.get(
+        "/votes/portal/v1/filter?items_per_page=2&pagination=cursor", headers=headers
+    )
+
+    assert response.status_code == 200
+    first_page = response.data.get("pagination")
+    assert first_page.get("pagination") == "cursor"
+    assert first_page.get("prev_cursor") is None
+    first_ids = [vote["id"] for vote in response.data.get("data")]
+    assert len(first_ids) == 2
+
+    response = api_client_fixt.get(
+        "/votes/portal/v1/filter?items_per_page=2",
+        {"cursor": first_page.get("next_cursor")},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    second_page = response.data.get("pagination")
+    assert second_page.get("next_cursor") is None
+    second_ids = [vote["id"] for vote in response.data.get("data")]
+    # Newest first, every vote exactly once
+    assert first_ids + second_ids == [
+        str(vote.id) for vote in reversed(individual_votes_fixt)
+    ]
+
+    response = api_client_fixt.get(
+        "/votes/portal/v1/filter?items_per_page=2",
+        {"cursor": second_page.get("prev_cursor")},
+        headers=headers,
+    )
+    assert [vote["id"] for vote in response.data.get("data")] == first_ids
+
+
+def test_create_division(
+    api_client_fixt, representative_fixt, bill_fixt, super_user_fixt
+):
+    # Portal requests carry no user of their own (MainSiteAuthentication)
+    api_client_fixt.force_authenticate(user=super_user_fixt)
+    division = {
+        "bill_id": str(bill_fixt.id),
+        "house": "NATIONAL",
+        "votes": [
+            {"representative_id": str(representative_fixt.id), "vote": "YES"},
+            {"representative_id": str(uuid.uuid4()), "vote": "NO"},
+        ],
+    }
+
+    # Nothing is written when any row is invalid
+    response = api_client_fixt.post(
+        "/votes/portal/v1/division", data=division, format="json"
+    )
+    assert response.status_code == 417
+    assert list(response.data["error"]["votes"].keys()) == [1]
+    assert not Vote.objects.filter(bill_id=bill_fixt.id).exists()
+
+    other_representative = RepresentativeFactory.create(
+        full_name="Other representative", house=HouseChoices.NATIONAL
+    )
+    division["votes"][1]["representative_id"] = str(other_representative.id)
+    response = api_client_fixt.post(
+        "/votes/portal/v1/division", data=division, format="json"
+    )
+    assert response.status_code == 201
+    assert response.data["data"]["created"] == 2
+    assert response.data["data"]["votes"] == {"YES": 1, "NO": 1}
+
+    votes = Vote.objects.filter(bill_id=bill_fixt.id)
+    assert sorted(votes.values_list("representative_id", "vote")) == sorted(
+        [(str(representative_fixt.id), "YES"), (str(other_representative.id), "NO")]
+    )
+    assert set(votes.values_list("vote_type", "house")) == {
+        (VoteTypeChoices.INDIVIDUAL, HouseChoices.NATIONAL)
+    }
+
+    response = api_client_fixt.get(
+        "/votes/portal/v1/summary/aggregate",
+        {"id_type": "bill", "id": str(bill_fixt.id)},
+    )
+    assert response.status_code == 200
+    assert sorted((row["vote"], row["bill_votes"]) for row in response.data) == [
+        ("NO", 1),
+        ("YES", 1),
+    ]
+
+
+def test_ingestion_state_changes_bill_etag(
+    api_client_fixt, bill_fixt, django_capture_on_commit_callbacks
+):
+    response = api_client_fixt.get(f"/bills/portal/v1/{bill_fixt.id}")
+    etag = response["ETag"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        _save_ingestion_state(
+            bill_fixt, VoteIngestionStatus.COMPLETED, {"created": 1, "updated": 0}
+        )
+
+    response = api_client_fixt.get(
+        f"/bills/portal/v1/{bill_fixt.id}", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+    assert response.data["data"]["votes_ingestion_status"] == "COMPLETED"
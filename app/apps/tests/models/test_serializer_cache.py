@@ -0,0 +1,150 @@
+import pytest
+from apps.bills.models import Bill
+from apps.bills.serializers import FullFetchBillSerilizer
+from apps.users.models import User
+from apps.users.serializers import FullUserFetchSerializer
+from utils.serializer_cache import (
+    invalidate_serialized,
+    serialize_cached,
+    serialize_object_cached,
+)
+from tests.factories import BillFactory, GroupFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_user_groups_add_drops_cached_rows(
+    super_user_fixt, django_capture_on_commit_callbacks
+):
+    group = GroupFactory.create(name="serializer_cache_group")
+    assert (
+        serialize_object_cached(FullUserFetchSerializer, super_user_fixt.pk)["groups"]
+        == []
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        super_user_fixt.groups.add(group)
+
+    assert serialize_object_cached(FullUserFetchSerializer, super_user_fixt.pk)[
+        "groups"
+    ] == [group.pk]
+    assert serialize_cached(FullUserFetchSerializer, User.objects.all())[0][
+        "groups"
+    ] == [group.pk]
+
+
+def test_group_user_set_changes_drop_cached_rows(
+    super_user_fixt, client_app_perm_fix, django_capture_on_commit_callbacks
+):
+    group = GroupFactory.create(name="serializer_cache_group")
+    serialize_cached(FullUserFetchSerializer, User.objects.all())
+
+    with django_capture_on_commit_callbacks(execute=True):
+        group.user_set.add(super_user_fixt)
+        super_user_fixt.user_permissions.add(client_app_perm_fix)
+
+    row = serialize_object_cached(FullUserFetchSerializer, super_user_fixt.pk)
+    assert row["groups"] == [group.pk]
+    assert row["user_permissions"] == [client_app_perm_fix.pk]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        group.user_set.clear()
+
+    assert (
+        serialize_object_cached(FullUserFetchSerializer, super_user_fixt.pk)["groups"]
+        == []
+    )
+
+
+@pytest.fixture
+def second_bill_fixt(bill_fixt):
+    return BillFactory.create(
+        title="A second bill",
+        status=bill_fixt.status,
+        sponsored_by=bill_fixt.sponsored_by,
+        house=bill_fixt.house,
+    )
+
+
+def test_save_writes_cached_row_through(
+    bill_fixt, django_capture_on_commit_callbacks, django_assert_num_queries
+):
+    serialize_object_cached(FullFetchBillSerilizer, bill_fixt.pk)
+
+    bill_fixt.title = "Renamed bill"
+    with django_capture_on_commit_callbacks(execute=True):
+        bill_fixt.save()
+
+    # Refreshed on commit, not just dropped
+    with django_assert_num_queries(0):
+        row = serialize_object_cached(FullFetchBillSerilizer, str(bill_fixt.pk))
+    assert row["title"] == "Renamed bill"
+
+
+def test_queryset_update_needs_invalidate_serialized(
+    bill_fixt, django_capture_on_commit_callbacks
+):
+    serialize_object_cached(FullFetchBillSerilizer, bill_fixt.pk)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Bill.objects.filter(pk=bill_fixt.pk).update(title="Updated bill")
+    # .update() skips post_save
+    assert (
+        serialize_object_cached(FullFetchBillSerilizer, bill_fixt.pk)["title"]
+        == bill_fixt.title
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        invalidate_serialized(Bill, [bill_fixt.pk])
+    assert (
+        serialize_object_cached(FullFetchBillSerilizer, bill_fixt.pk)["title"]
+        == "Updated bill"
+    )
+
+
+def test_delete_drops_cached_row(bill_fixt, django_capture_on_commit_callbacks):
+    pk = bill_fixt.pk
+    serialize_object_cached(FullFetchBillSerilizer, pk)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        bill_fixt.delete()
+
+    with pytest.raises(Bill.DoesNotExist):
+        serialize_object_cached(FullFetchBillSerilizer, pk)
+    assert serialize_cached(FullFetchBillSerilizer, Bill.objects.all()) == []
+
+
+def test_serialize_cached_keeps_queryset_order(
+    bill_fixt, second_bill_fixt, django_assert_num_queries
+):
+    # One of the two rows cached, the other fetched
+    serialize_object_cached(FullFetchBillSerilizer, second_bill_fixt.pk)
+    queryset = Bill.objects.filter(pk__in=[bill_fixt.pk, second_bill_fixt.pk]).order_by(
+        "-title"
+    )
+    expected = FullFetchBillSerilizer(queryset, many=True).data
+
+    # Primary keys, then the one missing row
+    with django_assert_num_queries(2):
+        rows = serialize_cached(FullFetchBillSerilizer, queryset)
+    assert rows == expected
+
+    with django_assert_num_queries(1):
+        assert serialize_cached(FullFetchBillSerilizer, queryset.reverse()) == list(
+            reversed(expected)
+        )
+
+
+def test_serialize_cached_serializes_missing_instances_as_is(
+    bill_fixt, second_bill_fixt, django_assert_num_queries
+):
+    serialize_object_cached(FullFetchBillSerilizer, bill_fixt.pk)
+
+    # The second bill is missing from the cache and serialized from the instance given
+    with django_assert_num_queries(0):
+        rows = serialize_cached(FullFetchBillSerilizer, [second_bill_fixt, bill_fixt])
+    assert [row["id"] for row in rows] == [
+        str(second_bill_fixt.pk),
+        str(bill_fixt.pk),
+    ]
+    assert serialize_cached(FullFetchBillSerilizer, []) == []
@@ -0,0 +1,92 @@
+import pytest
+from django.contrib.auth.models import Permission
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from apps.helpers.benchmarked_serializers import BENCHMARKED_SERIALIZERS
+from apps.helpers.values_serializer import get_values_serializer
+from apps.votes.models import VoteTypeChoices
+from tests.factories import (
+    ConfigFactory,
+    ConsensusVoteFactory,
+    FAQFactory,
+    GroupFactory,
+)
+from utils.enum_utils import HouseChoices
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def serialized_rows_fixt(
+    bill_fixt, representative_fixt, super_user_fixt, client_app_perm_fix
+):
+    # Not consensus_vote_fixt, its representative would clash with bill_fixt's
+    # on the unique (blank) full_name
+    ConsensusVoteFactory.create(
+        bill_id=bill_fixt.id,
+        representative_id=representative_fixt.id,
+        vote_type=VoteTypeChoices.CONCENSUS,
+        vote_summary={"YES": 100, "NO": 20, "ABSENT": 30},
+        house=HouseChoices.SENATE,
+    )
+    super_user_fixt.groups.add(GroupFactory.create(name="values_serializer_group"))
+    super_user_fixt.user_permissions.add(client_app_perm_fix)
+    ConfigFactory.create(
+        name="email_client",
+        value="sendgrid_api",
+        created_by="test",
+        last_updated_by="test",
+    )
+    FAQFactory.create(
+        faq="Is it free?", answer="Yes", created_by="test", last_updated_by="test"
+    )
+
+
+@pytest.mark.parametrize(
+    "serializer_class", BENCHMARKED_SERIALIZERS, ids=lambda s: s.__name__
+)
+def test_values_serializer_renders_like_model_serializer(
+    serialized_rows_fixt, serializer_class
+):
+    queryset = serializer_class.Meta.model.objects.all()
+    values_serializer = get_values_serializer(serializer_class)
+
+    assert values_serializer is not None
+    assert JSONRenderer().render(
+        values_serializer.serialize(queryset)
+    ) == JSONRenderer().render(serializer_class(queryset, many=True).data)
+
+
+class PermissionFetchSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Permission
+        fields = ["id", "name", "codename", "content_type"]
+
+
+class PermissionSlugSerializer(serializers.ModelSerializer):
+    content_type = serializers.SlugRelatedField(slug_field="model", read_only=True)
+
+    class Meta:
+        model = Permission
+        fields = ["id", "content_type"]
+
+
+def test_values_serializer_reads_foreign_key_columns(client_app_perm_fix):
+    queryset = Permission.objects.filter(pk=client_app_perm_fix.pk)
+    values_serializer = get_values_serializer(PermissionFetchSerializer)
+
+    assert values_serializer.serialize(queryset) == [
+        {
+            "id": client_app_perm_fix.pk,
+            "name": "view_representatives",
+            "codename": "view_representatives",
+            "content_type": client_app_perm_fix.content_type_id,
+        }
+    ]
+    assert values_serializer.serialize(queryset) == (
+        PermissionFetchSerializer(queryset, many=True).data
+    )
+
+
+def test_values_serializer_skips_other_related_fields():
+    assert get_values_serializer(PermissionSlugSerializer) is None
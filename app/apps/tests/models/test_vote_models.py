@@ -1,5 +1,11 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from apps.votes.models import Vote, VoteTally
+from apps.votes.tasks import ingest_vote_records
 from tests.factories import ConsensusVoteFactory, IndividualVoteFactory
+from utils.enum_utils import VoteTallyTypeChoices
+from utils.file_utils.generic_file_utils import iter_json_items
 
 pytestmark = pytest.mark.django_db
 
@@ -20,3 +26,59 @@ def test_consensus_vote(consensus_vote_fixt):
     assert consensus_vote_fixt.vote_summary["YES"] == 100
     assert consensus_vote_fixt.vote_summary["NO"] == 20
     assert consensus_vote_fixt.vote_summary["ABSENT"] == 30
+
+
+def test_vote_tallies_follow_votes(individual_vote_fixt):
+    bill_tally = VoteTally.objects.filter(
+        tally_type=VoteTallyTypeChoices.BILL, tally_id=individual_vote_fixt.bill_id
+    )
+    assert bill_tally.get(vote="NO").count == 1
+
+    individual_vote_fixt.vote = "YES"
+    individual_vote_fixt.save()
+    assert bill_tally.get(vote="NO").count == 0
+    assert bill_tally.get(vote="YES").count == 1
+
+    individual_vote_fixt.delete()
+    assert bill_tally.get(vote="YES").count == 0
+
+    # Rebuilding drops the emptied tallies
+    assert VoteTally.rebuild() == 0
+
+
+@pytest.mark.skipif(
+    not connection.features.has_select_for_update,
+    reason="Row locks need a database that supports SELECT ... FOR UPDATE",
+)
+def test_vote_save_locks_previous_row(individual_vote_fixt):
+    individual_vote_fixt.vote = "YES"
+    with CaptureQueriesContext(connection) as queries:
+        individual_vote_fixt.save()
+
+    # The read of the previous values, after the atomic block's savepoint
+    previous_read = next(
+        query["sql"]
+        for query in queries.captured_queries
+        if query["sql"].startswith("SELECT")
+    )
+    assert "FOR UPDATE" in previous_read
+
+
+def test_vote_file_ingestion_upserts_votes(bill_fixt, representative_fixt):
+    summary = {"rows": 0, "created": 0, "updated": 0, "failed": 0, "errors": []}
+    file_bytes = (
+        f'{{"{representative_fixt.full_name}": "YES", "Unknown rep": "NO"}}'.encode()
+    )
+
+    # Uneven chunks as they'd come off S3
+    chunks = [file_bytes[i : i + 5] for i in range(0, len(file_bytes), 5)]
+    ingest_vote_records(bill_fixt, iter_json_items(chunks), summary)
+    assert summary["created"] == 1
+    assert summary["failed"] == 1
+
+    # Re-ingesting updates instead of duplicating
+    ingest_vote_records(
+        bill_fixt, [(representative_fixt.full_name, "NO")], {**summary, "errors": []}
+    )
+    vote = Vote.objects.get(bill_id=bill_fixt.id)
+    assert vote.vote == "NO"
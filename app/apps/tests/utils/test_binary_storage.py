@@ -0,0 +1,86 @@
+import base64
+import pytest
+from django.core.management import call_command
+from apps.props.management.commands import convert_s3_objects_to_binary
+from utils.enum_utils import FileTypeEnum
+from utils.file_utils import generic_file_utils
+from utils.file_utils.s3_utils import BINARY_BODY_ENCODING, get_body_encoding
+
+pytestmark = pytest.mark.django_db
+
+
+def test_base64_uploads_are_stored_as_bytes(storage_backend_fixt):
+    response = generic_file_utils.file_upload_to_s3(
+        "bucket",
+        FileTypeEnum.BILL,
+        "bill.pdf",
+        base64.b64encode(b"%PDF-1.7 bill").decode(),
+        folder="finance bill",
+        house="national",
+        metadata={"uploaded_by": "test"},
+    )
+
+    stored = storage_backend_fixt.get_file("bucket", response["file_url"])
+    assert response["file_url"] == "bills/national/finance bill/bill.pdf"
+    assert stored["Body"].read() == b"%PDF-1.7 bill"
+    assert stored["Metadata"] == {
+        "uploaded_by": "test",
+        "body_encoding": BINARY_BODY_ENCODING,
+    }
+
+
+@pytest.mark.parametrize("size", range(7))
+def test_files_read_the_same_however_stored(storage_backend_fixt, size):
+    # Every base64 padding length
+    data = bytes(range(size))
+    storage_backend_fixt.upload_file(data, "bucket", "binary")
+    storage_backend_fixt.upload_file(
+        base64.b64encode(data).decode(), "bucket", "legacy"
+    )
+
+    for file_name in ["binary", "legacy"]:
+        assert generic_file_utils.get_s3_file_bytes("bucket", file_name) == data
+        assert generic_file_utils.get_s3_file_data(
+            "bucket", file_name
+        ) == base64.b64encode(data)
+        if size:
+            assert generic_file_utils.get_s3_file_info("bucket", file_name)[0] == size
+
+
+def test_convert_s3_objects_to_binary(storage_backend_fixt, monkeypatch):
+    monkeypatch.setattr(
+        convert_s3_objects_to_binary,
+        "representative_s3_processor",
+        storage_backend_fixt,
+    )
+    storage_backend_fixt.upload_file(
+        base64.b64encode(b"legacy").decode(),
+        "bucket",
+        "votes/legacy.json",
+        metadata={"uploaded_by": "test"},
+    )
+    storage_backend_fixt.upload_file(b"binary", "bucket", "votes/binary.json")
+    storage_backend_fixt.upload_file("not base64!", "bucket", "votes/other.json")
+    # Read once so the conversion has to drop the cached copy
+    legacy = generic_file_utils.get_s3_file_bytes("bucket", "votes/legacy.json")
+    assert legacy == b"legacy"
+
+    call_command("convert_s3_objects_to_binary", "--bucket", "bucket", "--dry-run")
+    head = storage_backend_fixt.head_file("bucket", "votes/legacy.json")
+    assert get_body_encoding(head) != BINARY_BODY_ENCODING
+
+    call_command("convert_s3_objects_to_binary", "--bucket", "bucket")
+    converted = storage_backend_fixt.get_file("bucket", "votes/legacy.json")
+    assert converted["Body"].read() == b"legacy"
+    assert converted["Metadata"] == {
+        "uploaded_by": "test",
+        "body_encoding": BINARY_BODY_ENCODING,
+    }
+    legacy = generic_file_utils.get_s3_file_bytes("bucket", "votes/legacy.json")
+    assert legacy == b"legacy"
+    # Not base64, left as is
+    other = storage_backend_fixt.get_file("bucket", "votes/other.json")
+    assert other["Body"].read() == b"not base64!"
+    assert not generic_file_utils.convert_s3_object_to_binary(
+        "bucket", "votes/legacy.json"
+    )
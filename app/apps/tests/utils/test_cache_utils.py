@@ -0,0 +1,78 @@
+import threading
+import time
+import pytest
+from django.core.cache import cache
+from utils import cache_utils
+from utils.cache_backends import FailSafeRedisCache
+from utils.cache_utils import get_or_compute
+
+pytestmark = pytest.mark.django_db
+
+
+def test_get_or_compute_single_flight():
+    calls = []
+    results = []
+    start = threading.Barrier(8)
+
+    def compute():
+        calls.append(1)
+        # Long enough for every other thread to find the lock taken
+        time.sleep(0.3)
+        return {"count": 42}
+
+    def worker():
+        start.wait()
+        results.append(get_or_compute("single_flight", compute, 60))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"count": 42}] * 8
+    assert cache.get("lock:single_flight") is None
+
+
+def test_get_or_compute_does_not_cache_none():
+    calls = []
+
+    def compute():
+        calls.append(1)
+
+    assert get_or_compute("nothing", compute, 60) is None
+    assert get_or_compute("nothing", compute, 60) is None
+    assert len(calls) == 2
+
+
+def test_get_or_compute_stops_waiting_on_a_stuck_lock(monkeypatch):
+    monkeypatch.setattr(cache_utils, "CACHE_LOCK_WAIT", 0.1)
+    # Held by a worker that died mid recompute
+    cache.add("lock:stuck", 1, 60)
+
+    assert get_or_compute("stuck", lambda: "computed", 60) == "computed"
+
+
+@pytest.fixture
+def unreachable_redis_cache_fixt(monkeypatch):
+    unreachable = FailSafeRedisCache(
+        "redis://127.0.0.1:1/0",
+        {"OPTIONS": {"socket_connect_timeout": 0.1, "socket_timeout": 0.1}},
+    )
+    monkeypatch.setattr(cache_utils, "cache", unreachable)
+    return unreachable
+
+
+def test_fail_safe_redis_cache_degrades_to_misses(unreachable_redis_cache_fixt):
+    assert unreachable_redis_cache_fixt.get("key", "default") == "default"
+    assert unreachable_redis_cache_fixt.get_many(["a", "b"]) == {}
+    unreachable_redis_cache_fixt.set("key", "value")
+    assert unreachable_redis_cache_fixt.set_many({"a": 1}) == ["a"]
+    # Reported as taken so lock holders compute right away
+    assert unreachable_redis_cache_fixt.add("lock:key", 1) is True
+    assert unreachable_redis_cache_fixt.delete("key") is False
+
+
+def test_get_or_compute_without_redis(unreachable_redis_cache_fixt):
+    assert get_or_compute("key", lambda: "computed", 60) == "computed"
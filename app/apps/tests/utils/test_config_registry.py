@@ -0,0 +1,133 @@
+import pytest
+from apps.props.models import Config
+from apps.props.serializers import ConfigUpdateSerializer
+from tests.factories import ConfigFactory
+from utils import config_utils
+from utils.config_utils import EMAIL_CLIENT, ConfigRegistry
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def email_client_config_fixt():
+    return ConfigFactory.create(
+        name=EMAIL_CLIENT,
+        value="sendgrid_api",
+        created_by="test",
+        last_updated_by="test",
+    )
+
+
+@pytest.fixture
+def registry_fixt(monkeypatch):
+    # Check the generation on every lookup
+    monkeypatch.setattr(config_utils, "CONFIG_REFRESH_INTERVAL", 0)
+    return ConfigRegistry()
+
+
+@pytest.fixture
+def redis_available_fixt(monkeypatch):
+    # Generations live in the locmem cache here, stand in for a shared one
+    monkeypatch.setattr(config_utils, "is_cache_shared", lambda: True)
+
+
+def test_registry_reads_loaded_rows_without_queries(
+    email_client_config_fixt, django_assert_num_queries
+):
+    registry = ConfigRegistry()
+    assert registry.get(EMAIL_CLIENT) == "sendgrid_api"
+
+    with django_assert_num_queries(0):
+        assert registry.get(EMAIL_CLIENT) == "sendgrid_api"
+        assert registry.get("missing", "fallback") == "fallback"
+
+
+def test_registry_reloads_after_config_update(
+    email_client_config_fixt,
+    registry_fixt,
+    redis_available_fixt,
+    super_user_fixt,
+    django_capture_on_commit_callbacks,
+    django_assert_num_queries,
+):
+    assert registry_fixt.get(EMAIL_CLIENT) == "sendgrid_api"
+
+    # Unchanged generation, the rows are not read again
+    Config.objects.filter(pk=email_client_config_fixt.pk).update(value="mailgun")
+    with django_assert_num_queries(0):
+        assert registry_fixt.get(EMAIL_CLIENT) == "sendgrid_api"
+
+    serializer = ConfigUpdateSerializer(
+        data={"value": "smtp", "last_updated_by": str(super_user_fixt.id)}
+    )
+    assert serializer.is_valid(), serializer.errors
+    with django_capture_on_commit_callbacks(execute=True):
+        serializer.update(email_client_config_fixt, serializer.validated_data)
+
+    assert registry_fixt.get(EMAIL_CLIENT) == "smtp"
+
+
+def test_registry_reloads_after_config_patch(
+    email_client_config_fixt,
+    registry_fixt,
+    redis_available_fixt,
+    super_user_fixt,
+    api_client_fixt,
+    django_capture_on_commit_callbacks,
+):
+    assert registry_fixt.get(EMAIL_CLIENT) == "sendgrid_api"
+
+    api_client_fixt.force_authenticate(user=super_user_fixt)
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client_fixt.patch(
+            f"/props/portal/configs/v1/{email_client_config_fixt.id}",
+            {"value": "smtp", "last_updated_by": str(super_user_fixt.id)},
+            format="json",
+        )
+
+    assert response.status_code == 200
+    assert registry_fixt.get(EMAIL_CLIENT) == "smtp"
+
+
+def test_registry_reloads_on_created_and_deleted_configs(
+    email_client_config_fixt,
+    registry_fixt,
+    redis_available_fixt,
+    django_capture_on_commit_callbacks,
+):
+    assert registry_fixt.all() == {EMAIL_CLIENT: "sendgrid_api"}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        ConfigFactory.create(
+            name="maintenance", value="on", created_by="test", last_updated_by="test"
+        )
+    assert registry_fixt.get_bool("maintenance") is True
+
+    with django_capture_on_commit_callbacks(execute=True):
+        email_client_config_fixt.delete()
+    assert registry_fixt.get(EMAIL_CLIENT) is None
+
+
+def test_registry_without_redis_reloads_every_interval(
+    email_client_config_fixt, registry_fixt
+):
+    assert registry_fixt.get(EMAIL_CLIENT) == "sendgrid_api"
+
+    # Nothing bumped, another worker's write is only seen by rereading the rows
+    Config.objects.filter(pk=email_client_config_fixt.pk).update(value="mailgun")
+    assert registry_fixt.get(EMAIL_CLIENT) == "mailgun"
+
+
+@pytest.mark.parametrize(
+    "value, as_bool, as_int",
+    [("on", True, 0), ("TRUE ", True, 0), ("0", False, 0), ("12", False, 12)],
+)
+def test_registry_typed_lookups(registry_fixt, value, as_bool, as_int):
+    ConfigFactory.create(
+        name="switch", value=value, created_by="test", last_updated_by="test"
+    )
+
+    assert registry_fixt.get_bool("switch") is as_bool
+    assert registry_fixt.get_int("switch") == as_int
+    assert registry_fixt.get_bool("missing", default=True) is True
+    assert registry_fixt.get_int("missing", default=3) == 3
@@ -0,0 +1,107 @@
+import base64
+import json
+import pytest
+from utils.file_utils.generic_file_utils import (
+    iter_base64_decode,
+    iter_json_items,
+    parse_range_header,
+    stream_s3_file_bytes,
+)
+
+pytestmark = pytest.mark.django_db
+
+FILE_DATA = bytes(range(256)) * 3 + b"tail"
+
+
+def chunked(data, size: int) -> list:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize(
+    "range_header, expected",
+    [
+        ("bytes=0-99", (0, 99)),
+        ("bytes=100-", (100, 999)),
+        ("bytes=-100", (900, 999)),
+        ("bytes=-5000", (0, 999)),
+        ("bytes=990-5000", (990, 999)),
+        ("bytes=999-999", (999, 999)),
+        # Ignored i.e the full file is served
+        ("bytes=0-1,5-6", None),
+        ("items=0-1", None),
+        ("bytes=a-b", None),
+    ],
+)
+def test_parse_range_header(range_header, expected):
+    assert parse_range_header(range_header, 1000) == expected
+
+
+@pytest.mark.parametrize("range_header", ["bytes=-0", "bytes=1000-", "bytes=50-10"])
+def test_parse_range_header_unsatisfiable(range_header):
+    with pytest.raises(ValueError):
+        parse_range_header(range_header, 1000)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 4, 5, 7, 64, 4096])
+def test_iter_base64_decode_chunk_boundaries(chunk_size):
+    encoded = base64.encodebytes(FILE_DATA)  # Line breaks every 76 characters
+
+    assert b"".join(iter_base64_decode(chunked(encoded, chunk_size))) == FILE_DATA
+    assert (
+        b"".join(iter_base64_decode(chunked(encoded.decode("ascii"), chunk_size)))
+        == FILE_DATA
+    )
+
+
+def test_iter_base64_decode_truncated():
+    with pytest.raises(ValueError):
+        list(iter_base64_decode([base64.b64encode(FILE_DATA)[:-1]]))
+
+
+@pytest.mark.parametrize("stored_as", ["binary", "base64"])
+def test_stream_s3_file_bytes_ranges(storage_backend_fixt, stored_as):
+    data = FILE_DATA[:40]
+    if stored_as == "base64":
+        storage_backend_fixt.upload_file(
+            base64.b64encode(data).decode(), "bucket", "votes/file"
+        )
+    else:
+        storage_backend_fixt.upload_file(data, "bucket", "votes/file")
+
+    assert b"".join(stream_s3_file_bytes("bucket", "votes/file", chunk_size=5)) == data
+    # Every range, in particular those starting/stopping inside a base64 group
+    for start in range(len(data)):
+        for stop in range(start, len(data)):
+            streamed = b"".join(
+                stream_s3_file_bytes("bucket", "votes/file", start, stop, chunk_size=5)
+            )
+            assert streamed == data[start : stop + 1], (start, stop)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 10, 4096])
+def test_iter_json_items_chunk_boundaries(chunk_size):
+    document = {
+        "count": 12345,
+        "name": "Fuatilia ✓",
+        "votes": [1, 2.5, None],
+        "ok": True,
+    }
+    items = [{"id": 10, "vote": "YES"}, 123456, "two", [3], False]
+
+    encoded = json.dumps(document, ensure_ascii=False).encode("utf-8")
+    assert list(iter_json_items(chunked(encoded, chunk_size))) == list(document.items())
+
+    encoded = json.dumps(items, indent=2).encode("utf-8")
+    assert list(iter_json_items(chunked(encoded, chunk_size))) == list(enumerate(items))
+
+    encoded = "\n".join(json.dumps(item) for item in items).encode("utf-8")
+    assert list(iter_json_items(chunked(encoded, chunk_size), ndjson=True)) == list(
+        enumerate(items)
+    )
+
+
+def test_iter_json_items_invalid():
+    with pytest.raises(ValueError):
+        list(iter_json_items([b'{"a": 1, "b": ']))
+    with pytest.raises(ValueError):
+        list(iter_json_items([b"12"]))
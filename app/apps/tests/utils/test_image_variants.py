@@ -0,0 +1,151 @@
+import io
+import pytest
+from PIL import Image, UnidentifiedImageError
+from apps.representatives import tasks
+from utils.file_utils.image_utils import best_fit_size, generate_image_variants
+from utils.file_utils.storage import InMemoryStorageBackend
+
+pytestmark = pytest.mark.django_db
+
+
+def image_bytes(width: int, height: int, image_format: str = "PNG") -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 30, 30)).save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+def test_generate_image_variants():
+    variants = list(generate_image_variants(image_bytes(300, 200), (64, 128, 256)))
+
+    # No upscaling past the shorter edge
+    assert [(size, extension) for size, extension, _ in variants] == [
+        (64, "webp"),
+        (64, "jpeg"),
+        (128, "webp"),
+        (128, "jpeg"),
+    ]
+    for size, extension, data in variants:
+        with Image.open(io.BytesIO(data)) as variant:
+            assert variant.size == (size, size)
+            assert variant.format == extension.upper()
+
+
+def test_generate_image_variants_smallest_size_always_generated():
+    variants = list(generate_image_variants(image_bytes(40, 40), (64, 128)))
+
+    assert [size for size, _, _ in variants] == [64, 64]
+
+
+@pytest.mark.parametrize(
+    "requested, expected", [(1, 64), (64, 64), (65, 128), (200, 256), (1024, 256)]
+)
+def test_best_fit_size(requested, expected):
+    assert best_fit_size(requested, [256, 64, 128]) == expected
+
+
+def test_representative_image_variants(
+    api_client_fixt, storage_backend_fixt, representative_fixt, monkeypatch
+):
+    monkeypatch.setattr(tasks, "representative_s3_processor", storage_backend_fixt)
+    monkeypatch.setenv("REPS_DATA_BUCKET_NAME", "test-reps")
+    file_url = f"representatives/{representative_fixt.id}/images/original.jpg"
+    storage_backend_fixt.upload_file(
+        image_bytes(600, 400, "JPEG"), "test-reps", file_url
+    )
+
+    image_variants = tasks.generate_representative_image_variants(
+        str(representative_fixt.id), file_url
+    )
+
+    representative_fixt.refresh_from_db()
+    assert representative_fixt.image_variants == image_variants
+    assert image_variants["sizes"] == [64, 128, 256]
+
+    url = (
+        f"/representatives/portal/v1/display-image/{representative_fixt.id}/"
+        f"{image_variants['version']}/100"
+    )
+    response = api_client_fixt.get(url, headers={"Accept": "image/webp,*/*"})
+    assert response.status_code == 200
+    assert response["Content-Type"] == "image/webp"
+    assert "immutable" in response["Cache-Control"]
+    with Image.open(io.BytesIO(response.content)) as variant:
+        assert variant.size == (128, 128)
+
+    response = api_client_fixt.get(url, headers={"Accept": "image/jpeg"})
+    assert response["Content-Type"] == "image/jpeg"
+
+    response = api_client_fixt.get(
+        url, headers={"Accept": "image/jpeg", "If-None-Match": response["ETag"]}
+    )
+    assert response.status_code == 304
+
+    response = api_client_fixt.get(
+        f"/representatives/portal/v1/display-image/{representative_fixt.id}/stale/100"
+    )
+    assert response.status_code == 404
+
+
+class FlakyUploadBackend(InMemoryStorageBackend):
+    """
+    Fails the first <failures> uploads the way S3Processor reports errors
+    """
+
+    def __init__(self, failures: int):
+        super().__init__()
+        self.failures = failures
+
+    def upload_file(self, *args, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            return {"error": "SlowDown: Please reduce your request rate"}
+        return super().upload_file(*args, **kwargs)
+
+
+@pytest.fixture
+def representative_image_fixt(storage_backend_fixt, representative_fixt, monkeypatch):
+    monkeypatch.setenv("REPS_DATA_BUCKET_NAME", "test-reps")
+    file_url = f"representatives/{representative_fixt.id}/images/original.jpg"
+    storage_backend_fixt.upload_file(
+        image_bytes(300, 300, "JPEG"), "test-reps", file_url
+    )
+    return representative_fixt, file_url
+
+
+def test_image_variants_retried_on_upload_errors(
+    representative_image_fixt, monkeypatch
+):
+    representative, file_url = representative_image_fixt
+    backend = FlakyUploadBackend(failures=2)
+    monkeypatch.setattr(tasks, "representative_s3_processor", backend)
+
+    # Eager, the retries run in place
+    result = tasks.generate_representative_image_variants.apply(
+        args=[str(representative.id), file_url]
+    )
+
+    assert result.successful()
+    assert backend.failures == 0
+    representative.refresh_from_db()
+    assert representative.image_variants["sizes"] == [64, 128, 256]
+
+
+def test_image_variants_not_retried_for_unreadable_images(
+    storage_backend_fixt, representative_image_fixt, monkeypatch
+):
+    representative, _ = representative_image_fixt
+    file_url = f"representatives/{representative.id}/images/notes.jpg"
+    storage_backend_fixt.upload_file(b"not an image", "test-reps", file_url)
+    retries = []
+    monkeypatch.setattr(
+        tasks.generate_representative_image_variants,
+        "retry",
+        lambda *args, **kwargs: retries.append(kwargs),
+    )
+
+    result = tasks.generate_representative_image_variants.apply(
+        args=[str(representative.id), file_url]
+    )
+
+    assert isinstance(result.result, UnidentifiedImageError)
+    assert retries == []
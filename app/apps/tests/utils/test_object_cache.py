@@ -0,0 +1,116 @@
+import os
+import time
+import pytest
+from utils.file_utils.object_cache import S3ObjectCache
+from utils.file_utils.storage import InMemoryStorageBackend
+
+pytestmark = pytest.mark.django_db
+
+
+class CountingStorageBackend(InMemoryStorageBackend):
+    def __init__(self):
+        super().__init__()
+        self.reads = []
+
+    def get_file(self, bucket_name, obj_name, range=None, if_none_match=None):
+        self.reads.append((obj_name, if_none_match))
+        return super().get_file(bucket_name, obj_name, range, if_none_match)
+
+
+@pytest.fixture
+def backend_fixt():
+    backend = CountingStorageBackend()
+    backend.upload_file(b"a" * 100, "bucket", "a", metadata={"source": "test"})
+    backend.upload_file(b"b" * 100, "bucket", "b")
+    backend.upload_file(b"c" * 100, "bucket", "c")
+    return backend
+
+
+def test_object_cache_hit(backend_fixt, tmp_path):
+    object_cache = S3ObjectCache(backend_fixt, directory=str(tmp_path))
+
+    missed = object_cache.get("bucket", "a")
+    hit = object_cache.get("bucket", "a")
+
+    assert hit == missed
+    assert hit.body == b"a" * 100
+    assert hit.metadata == {"source": "test", "body_encoding": "binary"}
+    assert backend_fixt.reads == [("a", None)]
+    assert object_cache.stats()["hit"] == 1
+    assert object_cache.stats()["hit_ratio"] == 0.5
+
+
+def test_object_cache_revalidates_expired_entries(backend_fixt, tmp_path):
+    object_cache = S3ObjectCache(backend_fixt, directory=str(tmp_path), ttl=0)
+    etag = object_cache.get("bucket", "a").etag
+
+    # Unchanged, S3 answers 304 and the copy on disk is served
+    assert object_cache.get("bucket", "a").body == b"a" * 100
+    assert backend_fixt.reads == [("a", None), ("a", etag)]
+    assert object_cache.stats()["revalidated"] == 1
+
+    backend_fixt.upload_file(b"new", "bucket", "a")
+    assert object_cache.get("bucket", "a").body == b"new"
+    assert object_cache.stats()["miss"] == 2
+
+
+def test_object_cache_revalidates_entries_with_another_etag(backend_fixt, tmp_path):
+    object_cache = S3ObjectCache(backend_fixt, directory=str(tmp_path))
+    etag = object_cache.get("bucket", "a").etag
+    assert object_cache.get("bucket", "a", etag=etag).body == b"a" * 100
+
+    # Overwritten elsewhere, the known ETag no longer matches the fresh entry
+    backend_fixt.upload_file(b"new", "bucket", "a")
+    new_etag = backend_fixt.head_file("bucket", "a")["ETag"]
+    obj = object_cache.get("bucket", "a", etag=new_etag)
+
+    assert (obj.body, obj.etag) == (b"new", new_etag)
+    assert backend_fixt.reads == [("a", None), ("a", etag)]
+    assert object_cache.get("bucket", "a", etag=new_etag).body == b"new"
+    assert object_cache.stats()["hit"] == 2
+
+
+def test_object_cache_evicts_least_recently_used(backend_fixt, tmp_path):
+    object_cache = S3ObjectCache(backend_fixt, directory=str(tmp_path), max_size=250)
+    object_cache.get("bucket", "a")
+    object_cache.get("bucket", "b")
+    body_a = object_cache._paths("bucket", "a")[0]
+    body_b = object_cache._paths("bucket", "b")[0]
+    os.utime(body_a, (time.time() - 120,) * 2)
+    os.utime(body_b, (time.time() - 60,) * 2)
+    # a is read again, making b the least recently used
+    object_cache.get("bucket", "a")
+
+    object_cache.get("bucket", "c")
+
+    assert os.path.exists(body_a)
+    assert not os.path.exists(body_b)
+    assert os.path.exists(object_cache._paths("bucket", "c")[0])
+    backend_fixt.reads.clear()
+    object_cache.get("bucket", "b")
+    assert backend_fixt.reads == [("b", None)]
+
+
+def test_object_cache_bypass(backend_fixt, tmp_path):
+    # Objects above max_object_size are never written to disk
+    object_cache = S3ObjectCache(
+        backend_fixt, directory=str(tmp_path), max_object_size=50
+    )
+    assert object_cache.get("bucket", "a").body == b"a" * 100
+    assert object_cache.get("bucket", "a").body == b"a" * 100
+    assert len(backend_fixt.reads) == 2
+    assert os.listdir(tmp_path) == []
+
+    disabled_cache = S3ObjectCache(backend_fixt, directory=str(tmp_path), max_size=0)
+    assert disabled_cache.get("bucket", "b").body == b"b" * 100
+    assert disabled_cache.stats()["bypass"] == 1
+
+
+def test_object_cache_invalidate(backend_fixt, tmp_path):
+    object_cache = S3ObjectCache(backend_fixt, directory=str(tmp_path))
+    object_cache.get("bucket", "a")
+    backend_fixt.upload_file(b"new", "bucket", "a")
+
+    object_cache.invalidate("bucket", "a")
+
+    assert object_cache.get("bucket", "a").body == b"new"
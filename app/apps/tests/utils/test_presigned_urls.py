@@ -0,0 +1,157 @@
+import base64
+import time
+import pytest
+from utils.enum_utils import FileTypeEnum
+from utils.file_utils import generic_file_utils
+from utils.file_utils.storage import InMemoryStorageBackend
+
+pytestmark = pytest.mark.django_db
+
+
+class RecordingPresigningBackend(InMemoryStorageBackend):
+    supports_presigned_urls = True
+
+    def __init__(self):
+        super().__init__()
+        self.presigned = []
+
+    def generate_presigned_url(
+        self, bucket_name, obj_name, expires_in, content_disposition=None
+    ):
+        self.presigned.append((obj_name, expires_in, content_disposition))
+        return (
+            f"https://{bucket_name}.s3.test/{obj_name}?signature={len(self.presigned)}"
+        )
+
+
+@pytest.fixture
+def presigning_backend_fixt(storage_backend_fixt, monkeypatch):
+    backend = RecordingPresigningBackend()
+    monkeypatch.setattr(generic_file_utils, "representative_s3_processor", backend)
+    return backend
+
+
+def test_presigned_urls_are_cached_per_disposition(presigning_backend_fixt):
+    url, expires_at = generic_file_utils.get_s3_file_url(
+        "bucket", "representatives/1/images/a.webp", FileTypeEnum.IMAGE
+    )
+
+    assert abs(expires_at - (time.time() + 43200)) < 5
+    assert generic_file_utils.get_s3_file_url(
+        "bucket", "representatives/1/images/a.webp", FileTypeEnum.IMAGE
+    ) == (url, expires_at)
+    assert presigning_backend_fixt.presigned == [
+        ("representatives/1/images/a.webp", 43200, None)
+    ]
+
+    download_url, _ = generic_file_utils.get_s3_file_url(
+        "bucket",
+        "representatives/1/images/a.webp",
+        FileTypeEnum.IMAGE,
+        content_disposition='attachment; filename="a.webp"',
+    )
+    assert download_url != url
+    assert len(presigning_backend_fixt.presigned) == 2
+
+
+def test_download_presigns_with_attachment_disposition(
+    api_client_fixt, presigning_backend_fixt, bill_fixt
+):
+    response = api_client_fixt.get(
+        f"/votes/portal/v1/{bill_fixt.id}/file/download/votes.json?delivery=url"
+    )
+
+    assert response.status_code == 200
+    assert presigning_backend_fixt.presigned == [
+        (
+            f"votes/national/{bill_fixt.title}/votes.json",
+            900,
+            f'attachment; filename="{bill_fixt.title} - votes.json"',
+        )
+    ]
+
+
+def test_unknown_delivery_mode(api_client_fixt, presigning_backend_fixt, bill_fixt):
+    response = api_client_fixt.get(
+        f"/votes/portal/v1/{bill_fixt.id}/file/data/votes.json?delivery=ftp"
+    )
+
+    assert response.status_code == 400
+    assert presigning_backend_fixt.presigned == []
+
+
+IMAGE_BYTES = b"\xff\xd8\xff\xe0" + bytes(range(256)) * 4
+
+
+@pytest.fixture
+def representative_image_fixt(storage_backend_fixt, representative_fixt, monkeypatch):
+    monkeypatch.setenv("REPS_DATA_BUCKET_NAME", "test-reps")
+    storage_backend_fixt.upload_file(
+        IMAGE_BYTES,
+        "test-reps",
+        f"representatives/{representative_fixt.id}/images/portrait.jpg",
+    )
+    return representative_fixt
+
+
+def test_representative_file_inline_delivery(
+    api_client_fixt, superuser_token_api_client_fixt, representative_image_fixt
+):
+    portal_response = api_client_fixt.get(
+        f"/representatives/portal/v1/file/{representative_image_fixt.id}/image/portrait.jpg"
+    )
+    api_response = api_client_fixt.get(
+        f"/representatives/api/v1/file/{representative_image_fixt.id}/image/portrait.jpg",
+        headers={"Authorization": f"Bearer {superuser_token_api_client_fixt}"},
+    )
+
+    for response in (portal_response, api_response):
+        assert response.status_code == 200
+        assert response.data.get("data") == base64.b64encode(IMAGE_BYTES)
+        assert response["ETag"]
+
+
+@pytest.mark.parametrize("prefix", ["portal", "api"])
+def test_representative_file_unknown_file_type(
+    api_client_fixt,
+    superuser_token_api_client_fixt,
+    representative_image_fixt,
+    prefix,
+):
+    response = api_client_fixt.get(
+        f"/representatives/{prefix}/v1/file/{representative_image_fixt.id}/video/portrait.jpg",
+        headers={"Authorization": f"Bearer {superuser_token_api_client_fixt}"},
+    )
+
+    assert response.status_code == 400
+    assert "video" in response.data.get("error")
+
+
+def test_representative_display_image_follows_uploads(
+    api_client_fixt, storage_backend_fixt, representative_image_fixt
+):
+    file_url = (
+        f"representatives/{representative_image_fixt.id}/images/"
+        f"{representative_image_fixt.full_name}.jpg"
+    )
+    url = f"/representatives/portal/v1/display-image/{representative_image_fixt.id}"
+    storage_backend_fixt.upload_file(IMAGE_BYTES, "test-reps", file_url)
+    generic_file_utils.invalidate_s3_caches("test-reps", file_url)
+
+    first = api_client_fixt.get(url)
+    cached = api_client_fixt.get(url)
+    assert first.data == cached.data
+    assert first["ETag"] and cached["ETag"] == first["ETag"]
+    assert (
+        api_client_fixt.get(url, headers={"If-None-Match": first["ETag"]}).status_code
+        == 304
+    )
+
+    new_image = IMAGE_BYTES[::-1]
+    storage_backend_fixt.upload_file(new_image, "test-reps", file_url)
+    generic_file_utils.invalidate_s3_caches("test-reps", file_url)
+
+    response = api_client_fixt.get(url, headers={"If-None-Match": first["ETag"]})
+    assert response.status_code == 200
+    assert response.data.get("data") == base64.b64encode(new_image)
+    assert response["ETag"] != first["ETag"]
@@ -0,0 +1,121 @@
+import pytest
+from botocore.stub import Stubber
+from utils.enum_utils import FileTypeEnum
+from utils.file_utils import generic_file_utils
+from utils.file_utils.s3_utils import S3Processor
+from utils.file_utils.storage import InMemoryStorageBackend
+
+pytestmark = pytest.mark.django_db
+
+
+class CountingStorageBackend(InMemoryStorageBackend):
+    def __init__(self):
+        super().__init__()
+        self.listings = []
+
+    def iter_bucket_objects(self, bucket_name, directory=None, delimiter=None):
+        self.listings.append((directory, delimiter))
+        return super().iter_bucket_objects(bucket_name, directory, delimiter)
+
+
+@pytest.fixture
+def listing_backend_fixt(storage_backend_fixt, monkeypatch):
+    backend = CountingStorageBackend()
+    monkeypatch.setattr(generic_file_utils, "representative_s3_processor", backend)
+    for file_name in ["a.jpg", "b.jpg", "variants/v1/64.webp"]:
+        backend.upload_file(b"image", "bucket", f"representatives/1/images/{file_name}")
+    backend.upload_file(b"image", "bucket", "representatives/2/images/c.jpg")
+    return backend
+
+
+def test_listings_are_cached_until_written_under(listing_backend_fixt):
+    def list_images(representative_id):
+        return generic_file_utils.get_s3_folder_objects(
+            "bucket",
+            f"representatives/{representative_id}/images/",
+            name_only=True,
+            delimiter="/",
+        )
+
+    assert list_images(1) == ["a.jpg", "b.jpg"]
+    assert list_images(1) == ["a.jpg", "b.jpg"]
+    assert len(listing_backend_fixt.listings) == 1
+
+    # Another representative's upload leaves the listing cached
+    generic_file_utils.file_upload_to_s3(
+        "bucket",
+        FileTypeEnum.IMAGE,
+        "d.jpg",
+        "aW1hZ2U=",
+        id="2",
+        folder="representatives",
+    )
+    assert list_images(1) == ["a.jpg", "b.jpg"]
+    assert len(listing_backend_fixt.listings) == 1
+
+    generic_file_utils.file_upload_to_s3(
+        "bucket",
+        FileTypeEnum.IMAGE,
+        "c.jpg",
+        "aW1hZ2U=",
+        id="1",
+        folder="representatives",
+    )
+    assert list_images(1) == ["a.jpg", "b.jpg", "c.jpg"]
+    assert len(listing_backend_fixt.listings) == 2
+
+
+def test_representative_file_list_pages(
+    api_client_fixt, listing_backend_fixt, representative_fixt, monkeypatch
+):
+    monkeypatch.setenv("REPS_DATA_BUCKET_NAME", "bucket")
+    for index in range(5):
+        listing_backend_fixt.upload_file(
+            b"image",
+            "bucket",
+            f"representatives/{representative_fixt.id}/images/{index}.jpg",
+        )
+
+    response = api_client_fixt.get(
+        f"/representatives/portal/v1/{representative_fixt.id}/file/image"
+        "?page=2&items_per_page=2"
+    )
+
+    assert response.status_code == 200
+    assert response.data["data"] == ["2.jpg", "3.jpg"]
+    assert response.data["pagination"]["total_items"] == 5
+    assert response.data["pagination"]["total_pages"] == 3
+
+
+def test_s3_listing_follows_continuation_tokens(monkeypatch):
+    monkeypatch.setenv("S3_BUCKET_REGION", "us-east-1")
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test")
+    processor = S3Processor()
+
+    with Stubber(processor.s3_client) as stubber:
+        stubber.add_response(
+            "list_objects_v2",
+            {
+                "Contents": [{"Key": "votes/a.json"}],
+                "IsTruncated": True,
+                "NextContinuationToken": "page-2",
+            },
+            {"Bucket": "bucket", "Prefix": "votes/", "Delimiter": "/"},
+        )
+        stubber.add_response(
+            "list_objects_v2",
+            {"Contents": [{"Key": "votes/b.json"}], "IsTruncated": False},
+            {
+                "Bucket": "bucket",
+                "Prefix": "votes/",
+                "Delimiter": "/",
+                "ContinuationToken": "page-2",
+            },
+        )
+
+        assert processor.get_bucket_file_list("bucket", "votes/", "/") == [
+            "a.json",
+            "b.json",
+        ]
+        stubber.assert_no_pending_responses()
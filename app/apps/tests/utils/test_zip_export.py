@@ -0,0 +1,86 @@
+import base64
+import io
+import zipfile
+import pytest
+from utils.file_utils.zip_utils import stream_s3_zip
+
+pytestmark = pytest.mark.django_db
+
+
+def read_zip(chunks) -> zipfile.ZipFile:
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+    assert archive.testzip() is None
+    return archive
+
+
+def test_stream_s3_zip(storage_backend_fixt):
+    files = {
+        f"{index}.json": f'{{"index": {index}}}'.encode() * 50 for index in range(12)
+    }
+    for file_name, data in files.items():
+        storage_backend_fixt.upload_file(data, "bucket", f"export/{file_name}")
+    storage_backend_fixt.upload_file(
+        base64.b64encode(b"jpeg").decode(), "bucket", "export/images/photo.jpg"
+    )
+    storage_backend_fixt.upload_file(
+        b"skipped", "bucket", "export/images/variants/1.webp"
+    )
+    storage_backend_fixt.upload_file(b"other", "bucket", "elsewhere/file.json")
+
+    # More objects than can be fetched at once
+    with read_zip(
+        stream_s3_zip(
+            "bucket",
+            "export/",
+            exclude_prefixes=("export/images/variants/",),
+            concurrency=2,
+        )
+    ) as archive:
+        assert sorted(archive.namelist()) == sorted([*files, "images/photo.jpg"])
+        for file_name, data in files.items():
+            assert archive.read(file_name) == data
+            assert archive.getinfo(file_name).compress_type == zipfile.ZIP_DEFLATED
+        assert archive.read("images/photo.jpg") == b"jpeg"
+        # Already compressed
+        assert archive.getinfo("images/photo.jpg").compress_type == zipfile.ZIP_STORED
+
+
+def test_stream_s3_zip_skips_deleted_objects(storage_backend_fixt, monkeypatch):
+    storage_backend_fixt.upload_file(b"kept", "bucket", "export/kept.json")
+    listed = list(storage_backend_fixt.iter_bucket_objects("bucket", "export/"))
+    monkeypatch.setattr(
+        storage_backend_fixt,
+        "iter_bucket_objects",
+        lambda *args: iter([*listed, {"Key": "export/deleted.json"}]),
+    )
+
+    with read_zip(stream_s3_zip("bucket", "export/")) as archive:
+        assert archive.namelist() == ["kept.json"]
+
+
+def test_stream_s3_zip_empty_directory(storage_backend_fixt):
+    with read_zip(stream_s3_zip("bucket", "export/")) as archive:
+        assert archive.namelist() == []
+
+
+def test_export_representative_files(
+    api_client_fixt, storage_backend_fixt, representative_fixt, monkeypatch
+):
+    monkeypatch.setenv("REPS_DATA_BUCKET_NAME", "test-reps")
+    directory = f"representatives/{representative_fixt.id}"
+    storage_backend_fixt.upload_file(b"photo", "test-reps", f"{directory}/images/a.jpg")
+    storage_backend_fixt.upload_file(
+        b"thumbnail", "test-reps", f"{directory}/images/variants/v1/64.webp"
+    )
+    storage_backend_fixt.upload_file(b"case", "test-reps", f"{directory}/cases/b.pdf")
+
+    response = api_client_fixt.get(
+        f"/representatives/portal/v1/{representative_fixt.id}/export"
+    )
+
+    assert response.status_code == 200
+    assert response["Content-Disposition"] == (
+        f'attachment; filename="{representative_fixt.full_name}.zip"'
+    )
+    with read_zip(response.streaming_content) as archive:
+        assert sorted(archive.namelist()) == ["cases/b.pdf", "images/a.jpg"]
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.users"
+
+    def ready(self):
+        from apps.users.models import User
+        from apps.users.serializers import FullUserFetchSerializer, UserFetchSerializer
+        from utils.serializer_cache import register_serialized_cache
+
+        # Cached per user representations, refreshed on writes
+        register_serialized_cache(User, FullUserFetchSerializer, UserFetchSerializer)
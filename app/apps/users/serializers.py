@@ -2,6 +2,7 @@ import datetime
 from apps.helpers.general import GenericFilterSerializer
 from apps.users.models import User, UserType
 from rest_framework import serializers
+from utils.serializer_cache import invalidate_serialized
 
 
 class FullUserFetchSerializer(serializers.ModelSerializer):
@@ -58,6 +59,8 @@ class UserUpdateSerializer(serializers.Serializer):
         User.objects.filter(pk=user.id).update(
             **{**validated_data, "updated_at": datetime.datetime.now()}
         )
+        # Queryset updates skip post_save
+        invalidate_serialized(User, [user.id])
         user.refresh_from_db()
 
 
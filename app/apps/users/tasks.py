@@ -2,8 +2,8 @@ import os
 import logging
 from celery import shared_task
 from utils.generics import add_string_data_to_span
-from apps.props.models import Config
 from utils.auth import get_tokens_for_user
+from utils.config_utils import EMAIL_CLIENT, config_registry
 from apps.users.models import User
 from utils.notifications.email_utils import EmailGenerator, GCPEmailer, SendgridEmailer
 from opentelemetry import trace
@@ -27,7 +27,7 @@ def send_user_registration_verification_email(self, username, user_role):
         user.first_name, link, user_role=user_role
     )
 
-    email_client = Config.objects.filter(name="email_client").first()
+    email_client = config_registry.get(EMAIL_CLIENT)
     email = user.email
     subject = "Fuatilia User Signup"
     logger.info(
@@ -49,7 +49,7 @@ def send_app_registration_verification_email(self, username):
     link = f"{os.environ.get('BASE_URL')}/api/users/v1/verify/{user.username}/{token}"
     email_body = EmailGenerator().generate_app_verification_email(user.username, link)
 
-    email_client = Config.objects.filter(name="email_client").first()
+    email_client = config_registry.get(EMAIL_CLIENT)
     email = user.email
     subject = "Fuatilia App Signup"
     logger.info(
@@ -73,7 +73,7 @@ def send_user_credential_reset_email(self, username):
         user.username, link
     )
 
-    email_client = Config.objects.filter(name="email_client").first()
+    email_client = config_registry.get(EMAIL_CLIENT)
     email = user.email
     subject = "Fuatilia Credential Reset"
     logger.info(
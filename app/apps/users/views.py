@@ -10,6 +10,8 @@ from utils.error_handler import process_error_response
 from utils.generics import add_request_data_to_span
 from apps.users import serializers
 from apps.users.models import User, UserType
+from apps.helpers.pagination import paginate_queryset
+from utils.serializer_cache import serialize_cached, serialize_object_cached
 from apps.users.signals import role_assignment_signal
 from rest_framework.generics import CreateAPIView, GenericAPIView
 from rest_framework.response import Response
@@ -205,16 +207,16 @@ class FilterUsers(GenericAPIView):
 
         serializer = self.get_serializer()
 
-        page = int(self.request.GET.get("page", "1"))
-        items_per_page = int(self.request.GET.get("items_per_page", "10"))
-        offset = (page - 1) * items_per_page
-
-        queryset = User.objects.filter(**filter_params)[
-            offset : (offset + items_per_page)
-        ]
+        queryset, pagination_info = paginate_queryset(
+            self.request, User.objects.filter(**filter_params)
+        )
 
         return Response(
-            {"data": serializer(queryset, many=True).data}, status=status.HTTP_200_OK
+            {
+                "data": serialize_cached(serializer, queryset),
+                "pagination": pagination_info,
+            },
+            status=status.HTTP_200_OK,
         )
 
 
@@ -232,9 +234,13 @@ class GUDUser(GenericAPIView):
             add_request_data_to_span(span, self.request)
 
             logger.info(f'Getting user with ID {kwargs.get("id")}')
-            user_data = User.objects.get(pk=kwargs.get("id"))
-            response = self.serializer_class(user_data).data
-            response["role"] = list(user_data.groups.values_list("name", flat=True))
+            response = serialize_object_cached(self.serializer_class, kwargs.get("id"))
+            # Roles change without a User write, not part of the cached representation
+            response["role"] = list(
+                Group.objects.filter(user__id=kwargs.get("id")).values_list(
+                    "name", flat=True
+                )
+            )
 
             return Response(
                 {"data": response},
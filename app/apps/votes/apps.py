@@ -4,3 +4,20 @@ from django.apps import AppConfig
 class VotesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.votes"
+
+    def ready(self):
+        # Registers the vote tally receivers
+        from apps.votes import signals  # noqa: F401
+        from apps.votes.models import Vote
+        from apps.votes.serializers import (
+            FullFetchVoteSerializer,
+            UserFetchVoteSerializer,
+        )
+        from utils.cache_utils import register_generation_signals
+        from utils.serializer_cache import register_serialized_cache
+
+        # Drops cached counts/responses on writes
+        register_generation_signals(Vote)
+        register_serialized_cache(
+            Vote, FullFetchVoteSerializer, UserFetchVoteSerializer
+        )
@@ -0,0 +1,14 @@
+import logging
+from django.core.management.base import BaseCommand
+from apps.votes.models import VoteTally
+
+logger = logging.getLogger("app_logger")
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the vote tallies behind the vote summaries from the votes table"
+
+    def handle(self, *args, **options):
+        logger.info("Rebuilding vote tallies")
+        tally_count = VoteTally.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {tally_count} vote tallies"))
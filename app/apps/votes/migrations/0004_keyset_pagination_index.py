@@ -0,0 +1,18 @@
+# Generated by Django 5.2.2 on 2026-10-18 12:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("votes", "0003_alter_vote_bill_id_alter_vote_representative_id"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="vote",
+            index=models.Index(
+                fields=["created_at", "id"], name="votes_vote_created_ab3cc8_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.2.2 on 2026-10-18 12:14
+
+from django.db import migrations, models
+
+# Tallies for the votes already in the table
+BACKFILL_SQL = """
+INSERT INTO votes_votetally (tally_type, tally_id, house, vote, count)
+SELECT 'BILL', bill_id, house, vote, COUNT(id) FROM votes_vote
+GROUP BY bill_id, house, vote;
+
+INSERT INTO votes_votetally (tally_type, tally_id, house, vote, count)
+SELECT 'REPRESENTATIVE', representative_id, house, vote, COUNT(id) FROM votes_vote
+GROUP BY representative_id, house, vote;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("votes", "0004_keyset_pagination_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VoteTally",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "tally_type",
+                    models.CharField(
+                        choices=[
+                            ("BILL", "Bill"),
+                            ("REPRESENTATIVE", "Representative"),
+                        ],
+                        max_length=15,
+                    ),
+                ),
+                ("tally_id", models.CharField(max_length=50)),
+                (
+                    "house",
+                    models.CharField(
+                        choices=[
+                            ("NATIONAL", "National"),
+                            ("SENATE", "Senate"),
+                            ("ALL", "All"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("vote", models.CharField(max_length=10)),
+                ("count", models.IntegerField(default=0)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["tally_type", "house"],
+                        name="votes_votet_tally_t_e70909_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("tally_type", "tally_id", "house", "vote"),
+                        name="unique_vote_tally",
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(BACKFILL_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
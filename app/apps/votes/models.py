@@ -1,6 +1,7 @@
 import uuid
-from django.db import models
-from utils.enum_utils import VoteTypeChoices, HouseChoices
+from collections import Counter
+from django.db import connection, models, transaction
+from utils.enum_utils import VoteTallyTypeChoices, VoteTypeChoices, HouseChoices
 
 
 # Create your models here.
@@ -30,7 +31,153 @@ class Vote(models.Model):
     def __repr__(self):
         return f"{self.vote_type} {self.house}  {self.vote} {self.vote_summary}"
 
+    def save(self, *args, **kwargs):
+        # Tallies move with the vote in the same transaction.
+        # Deletes are handled by the post_delete receiver in apps.votes.signals
+        with transaction.atomic():
+            previous = None
+            if not self._state.adding:
+                # Locked so concurrent saves of this vote don't both subtract
+                # the same previous values from the tallies
+                previous = (
+                    Vote.objects.select_for_update()
+                    .filter(pk=self.pk)
+                    .values(*VoteTally.VOTE_FIELDS)
+                    .first()
+                )
+            super().save(*args, **kwargs)
+            VoteTally.apply_votes(added=[self], removed=[previous] if previous else [])
+
     class Meta:
         indexes = [
             models.Index(fields=["bill_id", "representative_id", "vote_type", "house"]),
+            # Keyset (cursor) pagination
+            models.Index(fields=["created_at", "id"]),
+        ]
+
+
+class VoteTally(models.Model):
+    """
+    Running count of votes per (bill, house, vote) and (representative, house, vote)
+
+    Kept up to date on every Vote write so vote summaries are index lookups
+    instead of a GROUP BY over all votes.
+    Rebuild from scratch with `manage.py rebuild_vote_tallies`
+    """
+
+    VOTE_FIELDS = ("bill_id", "representative_id", "house", "vote")
+
+    tally_type = models.CharField(max_length=15, choices=VoteTallyTypeChoices.choices)
+    # bill_id or representative_id depending on the tally_type
+    tally_id = models.CharField(max_length=50)
+    house = models.CharField(max_length=10, choices=HouseChoices.choices)
+    vote = models.CharField(max_length=10)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tally_type", "tally_id", "house", "vote"],
+                name="unique_vote_tally",
+            )
+        ]
+        indexes = [
+            # House wide summaries
+            models.Index(fields=["tally_type", "house"]),
         ]
+
+    @classmethod
+    def _tally_keys(cls, vote) -> list[tuple]:
+        # Votes can be model instances or dicts from .values()
+        if not isinstance(vote, dict):
+            vote = {field: getattr(vote, field) for field in cls.VOTE_FIELDS}
+        return [
+            (
+                VoteTallyTypeChoices.BILL.value,
+                str(vote["bill_id"]),
+                vote["house"],
+                vote["vote"],
+            ),
+            (
+                VoteTallyTypeChoices.REPRESENTATIVE.value,
+                str(vote["representative_id"]),
+                vote["house"],
+                vote["vote"],
+            ),
+        ]
+
+    @classmethod
+    def apply_votes(cls, added=(), removed=()):
+        """
+        Adds/subtracts votes from the tallies
+
+        Call after any write that skips Vote.save/delete e.g bulk_create or queryset .update()
+
+        Parameters
+        ----------
+        added: iterable of Vote | dict
+            Votes (or their VOTE_FIELDS values) that now exist
+        removed: iterable of Vote | dict
+            Votes (or their previous VOTE_FIELDS values) that no longer count
+        """
+        deltas = Counter()
+        for vote in added:
+            deltas.update(cls._tally_keys(vote))
+        for vote in removed:
+            deltas.subtract(cls._tally_keys(vote))
+
+        rows = [(*key, delta) for key, delta in deltas.items() if delta]
+        if not rows:
+            return
+
+        table = cls._meta.db_table
+        with connection.cursor() as cursor:
+            # Single statement per row so concurrent writers don't lose increments
+            cursor.executemany(
+                f"""
+                INSERT INTO {table} (tally_type, tally_id, house, vote, count)
+                VALUES (%s, %s, %s, %s, %s)
+                ON CONFLICT (tally_type, tally_id, house, vote)
+                DO UPDATE SET count = {table}.count + EXCLUDED.count
+                """,
+                rows,
+            )
+
+    @classmethod
+    def rebuild(cls) -> int:
+        """
+        Recomputes all tallies from the votes table
+
+        Returns
+        -------
+        Number of tally rows written
+        """
+        with transaction.atomic():
+            if connection.vendor == "postgresql":
+                # Blocks vote writes (not reads) until the rebuild commits
+                with connection.cursor() as cursor:
+                    cursor.execute(f"LOCK TABLE {Vote._meta.db_table} IN SHARE MODE")
+
+            cls.objects.all().delete()
+
+            tallies = []
+            for tally_type, id_field in (
+                (VoteTallyTypeChoices.BILL, "bill_id"),
+                (VoteTallyTypeChoices.REPRESENTATIVE, "representative_id"),
+            ):
+                grouped_votes = Vote.objects.values(id_field, "house", "vote").annotate(
+                    vote_count=models.Count("id")
+                )
+                tallies.extend(
+                    cls(
+                        tally_type=tally_type,
+                        tally_id=row[id_field],
+                        house=row["house"],
+                        vote=row["vote"],
+                        count=row["vote_count"],
+                    )
+                    for row in grouped_votes.iterator()
+                )
+
+            cls.objects.bulk_create(tallies, batch_size=1000)
+        return len(tallies)
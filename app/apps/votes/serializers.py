@@ -1,6 +1,16 @@
+import uuid
+from django.db import transaction
 from rest_framework import serializers
-from apps.votes.models import Vote, VoteTypeChoices
+from apps.bills.models import Bill
+from apps.representatives.models import Representative
+from apps.votes.models import Vote, VoteTally, VoteTypeChoices
+from apps.helpers.general import GenericFilterSerializer
+from utils.cache_utils import bump_model_generation_on_commit
 from utils.enum_utils import HouseChoices
+from utils.file_utils.models import (
+    GenericFileUploadSerilizer,
+    GenericMultipartFileUploadSerializer,
+)
 
 
 class FullFetchVoteSerializer(serializers.ModelSerializer):
@@ -31,7 +41,7 @@ class VoteCreationSerializer(serializers.Serializer):
     house = serializers.ChoiceField(
         choices=HouseChoices.choices, default=HouseChoices.NATIONAL
     )
-    vote = serializers.CharField(required=False)
+    vote = serializers.CharField(required=False, max_length=10)
 
     def create(self, validated_data):
         representative = Vote.objects.create(**validated_data)
@@ -60,6 +70,99 @@ class VoteCreationSerializer(serializers.Serializer):
         return data
 
 
+class DivisionVoteSerializer(serializers.Serializer):
+    # Checked in DivisionCreationSerializer.validate so every row error is reported at once
+    representative_id = serializers.CharField(max_length=50)
+    vote = serializers.CharField(max_length=10)
+
+
+class DivisionCreationSerializer(serializers.Serializer):
+    """
+    A whole division i.e every individual vote cast on a bill in one sitting
+    """
+
+    bill_id = serializers.UUIDField()
+    house = serializers.ChoiceField(
+        choices=HouseChoices.choices, default=HouseChoices.NATIONAL
+    )
+    votes = serializers.ListField(
+        child=DivisionVoteSerializer(), allow_empty=False, max_length=5000
+    )
+
+    def validate(self, data):
+        bill_id = str(data["bill_id"])
+        house = data["house"]
+        if not Bill.objects.filter(pk=bill_id).exists():
+            raise serializers.ValidationError({"bill_id": f"Bill {bill_id} not found"})
+
+        representative_ids = []
+        for row in data["votes"]:
+            try:
+                representative_ids.append(str(uuid.UUID(row["representative_id"])))
+            except ValueError:
+                representative_ids.append(None)
+        valid_ids = [rep_id for rep_id in representative_ids if rep_id]
+
+        # One query each for the representatives and any votes already recorded
+        representative_houses = {
+            str(rep_id): rep_house
+            for rep_id, rep_house in Representative.objects.filter(
+                pk__in=valid_ids
+            ).values_list("id", "house")
+        }
+        already_voted = set(
+            Vote.objects.filter(
+                bill_id=bill_id, house=house, representative_id__in=valid_ids
+            ).values_list("representative_id", flat=True)
+        )
+
+        row_errors = {}
+        seen = set()
+        for index, representative_id in enumerate(representative_ids):
+            if representative_id is None:
+                error = "Must be a valid UUID"
+            elif representative_id not in representative_houses:
+                error = f"Representative {representative_id} not found"
+            elif house != HouseChoices.ALL and (
+                representative_houses[representative_id] != house
+            ):
+                error = f"Representative {representative_id} does not sit in {house}"
+            elif representative_id in seen:
+                error = f"Duplicate vote for representative {representative_id}"
+            elif representative_id in already_voted:
+                error = f"Representative {representative_id} already voted on this bill"
+            else:
+                error = None
+            seen.add(representative_id)
+
+            if error:
+                row_errors[index] = {"representative_id": [error]}
+
+        if row_errors:
+            raise serializers.ValidationError({"votes": row_errors})
+
+        data["bill_id"] = bill_id
+        return data
+
+    def create(self, validated_data):
+        votes = [
+            Vote(
+                bill_id=validated_data["bill_id"],
+                representative_id=str(uuid.UUID(row["representative_id"])),
+                vote_type=VoteTypeChoices.INDIVIDUAL,
+                house=validated_data["house"],
+                vote=row["vote"],
+            )
+            for row in validated_data["votes"]
+        ]
+        # All or nothing, bulk_create skips Vote.save so the tallies are applied here
+        with transaction.atomic():
+            Vote.objects.bulk_create(votes, batch_size=1000)
+            VoteTally.apply_votes(added=votes)
+        bump_model_generation_on_commit(Vote)
+        return votes
+
+
 class VoteUpdateSerializer(serializers.Serializer):
     bill_id = serializers.CharField(default="NATIONAL")
     representative_id = serializers.CharField(
@@ -77,8 +180,29 @@ class VoteUpdateSerializer(serializers.Serializer):
     house = serializers.CharField(required=False, default="NATIONAL")
     vote = serializers.CharField(required=False, default="YES")
 
+    def update(self, instance, validated_data):
+        for field, value in validated_data.items():
+            setattr(instance, field, value)
+        # Vote.save keeps the vote tallies in step
+        instance.save()
+        return instance
+
+
+class VoteFileUploadSerializer(GenericFileUploadSerilizer):
+    ingest = serializers.BooleanField(
+        default=False,
+        help_text="Parse a VOTE file into votes for the bill in the background",
+    )
+
+
+class VoteMultipartFileUploadSerializer(GenericMultipartFileUploadSerializer):
+    ingest = serializers.BooleanField(
+        default=False,
+        help_text="Parse a VOTE file into votes for the bill in the background",
+    )
+
 
-class VotesFilterSerializer(serializers.Serializer):
+class VotesFilterSerializer(GenericFilterSerializer):
     bill_id = serializers.CharField(required=False)
     representative_id = serializers.CharField(required=False)
     vote_type = serializers.ChoiceField(required=False, choices=VoteTypeChoices.choices)
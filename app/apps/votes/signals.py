@@ -0,0 +1,9 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from apps.votes.models import Vote, VoteTally
+
+
+@receiver(post_delete, sender=Vote)
+def remove_vote_from_tallies(sender, instance, **kwargs):
+    # Runs inside the delete's transaction, queryset deletes included
+    VoteTally.apply_votes(removed=[instance])
@@ -0,0 +1,250 @@
+import logging
+import os
+import uuid
+from typing import Iterable
+from celery import shared_task
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from apps.bills.models import Bill, VoteIngestionStatus
+from apps.representatives.models import Representative
+from apps.votes.models import Vote, VoteTally
+from apps.votes.serializers import VoteCreationSerializer
+from utils.cache_utils import bump_model_generation_on_commit
+from utils.enum_utils import VoteTypeChoices
+from utils.file_utils.generic_file_utils import iter_json_items, stream_s3_file_bytes
+from utils.generics import add_string_data_to_span
+from utils.serializer_cache import invalidate_serialized
+from opentelemetry import trace
+
+logger = logging.getLogger("app_logger")
+tracer = trace.get_tracer(__name__)
+
+VOTE_INGESTION_BATCH_SIZE = int(os.environ.get("VOTE_INGESTION_BATCH_SIZE", "1000"))
+# Only the first few row errors are kept on the bill
+MAX_RECORDED_INGESTION_ERRORS = 50
+
+# Fields an ingested row can change on an existing vote, with the model defaults
+UPSERT_FIELDS = {
+    "vote_type": VoteTypeChoices.INDIVIDUAL,
+    "vote_summary": None,
+    "vote": "",
+}
+
+
+def _to_vote_record(key, value) -> dict:
+    # Object files map representative -> vote e.g {"<name/id>": "YES"}
+    # Array/NDJSON files hold vote objects e.g {"representative_id": "<id>", "vote": "YES"}
+    if isinstance(key, str):
+        record = dict(value) if isinstance(value, dict) else {"vote": value}
+        record.setdefault("representative", key)
+        return record
+    if not isinstance(value, dict):
+        raise ValueError(f"Expected a vote object, found {value}")
+    return dict(value)
+
+
+def _resolve_representatives(identifiers: Iterable[str]) -> dict[str, str]:
+    """
+    Maps representative ids/full names to ids in a single query
+    """
+    ids, names = [], []
+    for identifier in identifiers:
+        try:
+            ids.append(str(uuid.UUID(identifier)))
+        except ValueError:
+            names.append(identifier)
+
+    resolved = {"ALL": "ALL"}  # consensus/confidential votes
+    for rep_id, full_name in Representative.objects.filter(
+        Q(id__in=ids) | Q(full_name__in=names)
+    ).values_list("id", "full_name"):
+        resolved[str(rep_id)] = str(rep_id)
+        resolved[full_name] = str(rep_id)
+    return resolved
+
+
+def upsert_vote_batch(bill_id: str, rows: list[dict]) -> tuple[int, int]:
+    """
+    Creates or updates the votes of a bill keyed on (representative_id, house)
+
+    Returns
+    -------
+    (created, updated)
+    """
+    # Last row wins when a file repeats a representative
+    rows_by_key = {(row["representative_id"], row["house"]): row for row in rows}
+
+    with transaction.atomic():
+        existing_votes = {
+            (vote.representative_id, vote.house): vote
+            for vote in Vote.objects.select_for_update().filter(
+                bill_id=bill_id,
+                representative_id__in={key[0] for key in rows_by_key},
+            )
+        }
+
+        created, updated, previous = [], [], []
+        now = timezone.now()
+        for key, row in rows_by_key.items():
+            vote = existing_votes.get(key)
+            if vote is None:
+                created.append(Vote(**row))
+                continue
+
+            changes = {
+                field: row.get(field, default)
+                for field, default in UPSERT_FIELDS.items()
+            }
+            if all(getattr(vote, field) == value for field, value in changes.items()):
+                continue
+            previous.append(
+                {field: getattr(vote, field) for field in VoteTally.VOTE_FIELDS}
+            )
+            for field, value in changes.items():
+                setattr(vote, field, value)
+            vote.updated_at = now
+            updated.append(vote)
+
+        Vote.objects.bulk_create(created)
+        Vote.objects.bulk_update(updated, [*UPSERT_FIELDS, "updated_at"])
+        # Bulk writes skip Vote.save
+        VoteTally.apply_votes(added=created + updated, removed=previous)
+        bump_model_generation_on_commit(Vote)
+        invalidate_serialized(Vote, [vote.pk for vote in updated])
+
+    return len(created), len(updated)
+
+
+def _save_ingestion_state(bill: Bill, status: str, summary: dict):
+    bill.votes_ingestion_status = status
+    bill.votes_ingestion_summary = summary
+    # updated_at moves the ETag/Last-Modified of the bill detail endpoint
+    bill.save(
+        update_fields=[
+            "votes_ingestion_status",
+            "votes_ingestion_summary",
+            "updated_at",
+        ]
+    )
+
+
+def ingest_vote_records(bill: Bill, items: Iterable[tuple], summary: dict) -> dict:
+    """
+    Validates and upserts parsed vote file items in batches of VOTE_INGESTION_BATCH_SIZE
+
+    Parameters
+    ----------
+    bill: Bill
+        Bill the votes are for
+    items: Iterable[tuple]
+        (key, value) pairs from iter_json_items
+    summary: dict
+        Running counts, updated in place and saved on the bill after every batch
+
+    Returns
+    -------
+    The summary
+    """
+
+    def record_error(row, error):
+        summary["failed"] += 1
+        if len(summary["errors"]) < MAX_RECORDED_INGESTION_ERRORS:
+            summary["errors"].append({"row": row, "error": error})
+
+    def flush(batch):
+        resolved = _resolve_representatives(
+            str(record.get("representative_id") or record.get("representative"))
+            for _, record in batch
+        )
+        rows = []
+        for row_number, record in batch:
+            identifier = str(
+                record.pop("representative_id", None)
+                or record.pop("representative", None)
+            )
+            if identifier not in resolved:
+                record_error(row_number, f"Representative {identifier} not found")
+                continue
+
+            serializer = VoteCreationSerializer(
+                data={
+                    "house": bill.house,
+                    **record,
+                    "bill_id": str(bill.id),
+                    "representative_id": resolved[identifier],
+                }
+            )
+            if not serializer.is_valid():
+                record_error(row_number, serializer.errors)
+                continue
+            rows.append(serializer.validated_data)
+
+        created, updated = upsert_vote_batch(str(bill.id), rows)
+        summary["created"] += created
+        summary["updated"] += updated
+        _save_ingestion_state(bill, VoteIngestionStatus.PROCESSING, summary)
+
+    batch = []
+    for key, value in items:
+        summary["rows"] += 1
+        try:
+            batch.append((summary["rows"], _to_vote_record(key, value)))
+        except ValueError as e:
+            record_error(summary["rows"], str(e))
+
+        if len(batch) >= VOTE_INGESTION_BATCH_SIZE:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+
+    return summary
+
+
+@shared_task(bind=True, max_retries=3)
+def ingest_vote_file(self, bill_id, file_name):
+    """
+    Parses an uploaded vote file into Vote rows for the bill
+
+    The file is streamed from S3 and parsed incrementally so large
+    division files are never fully held in memory. Re-running is safe, rows are upserted
+    """
+    span = trace.get_current_span()
+    add_string_data_to_span(
+        span,
+        f"Initiating vote file ingestion of {file_name} for {bill_id}",
+        "celery.task",
+    )
+
+    bill = Bill.objects.get(pk=bill_id)
+    file_url = f"votes/{bill.house.lower()}/{bill.title}/{file_name}"
+    summary = {
+        "file_name": file_name,
+        "started_at": timezone.now().isoformat(),
+        "rows": 0,
+        "created": 0,
+        "updated": 0,
+        "failed": 0,
+        "errors": [],
+    }
+    logger.info(f"Ingesting vote file {file_url} for bill {bill_id}")
+    _save_ingestion_state(bill, VoteIngestionStatus.PROCESSING, summary)
+
+    try:
+        items = iter_json_items(
+            stream_s3_file_bytes(os.environ.get("VOTES_DATA_BUCKET_NAME"), file_url),
+            ndjson=file_name.lower().endswith((".ndjson", ".jsonl")),
+        )
+        ingest_vote_records(bill, items, summary)
+    except Exception as e:
+        logger.exception(e)
+        summary["error"] = e.__repr__()
+        summary["finished_at"] = timezone.now().isoformat()
+        _save_ingestion_state(bill, VoteIngestionStatus.FAILED, summary)
+        raise
+
+    summary["finished_at"] = timezone.now().isoformat()
+    _save_ingestion_state(bill, VoteIngestionStatus.COMPLETED, summary)
+    logger.info(f"Vote file ingestion for {bill_id} done :: {summary}")
+    return summary
@@ -3,6 +3,7 @@ from apps.votes import views
 
 urlpatterns = [
     path("portal/v1/create", views.CreateVote().as_view()),
+    path("portal/v1/division", views.CreateDivision().as_view()),
     path("portal/v1/filter", views.FilterVotes().as_view()),
     path("portal/v1/<str:id>", views.GUDVote().as_view()),
     path("portal/v1/<str:bill_id>/file", views.UploadVoteFile().as_view()),
@@ -18,6 +19,10 @@ urlpatterns = [
         "portal/v1/<str:bill_id>/file/stream/<str:file_name>",
         views.StreamVoteFile().as_view(),
     ),
+    path(
+        "portal/v1/<str:bill_id>/file/export",
+        views.ExportVoteFiles().as_view(),
+    ),
     path("portal/v1/summary/aggregate", views.VoteSummaries().as_view()),
     # API Clients
     path("api/v1/filter", views.ApiFilterVotes().as_view()),
@@ -33,4 +38,8 @@ urlpatterns = [
         "api/v1/<str:bill_id>/file/stream/<str:file_name>",
         views.ApiStreamVoteFile().as_view(),
     ),
+    path(
+        "api/v1/<str:bill_id>/file/export",
+        views.ApiExportVoteFiles().as_view(),
+    ),
 ]
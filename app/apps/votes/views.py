@@ -1,32 +1,51 @@
-import base64
 import io
 import json
 import logging
 import os
-from django.http import FileResponse, StreamingHttpResponse
+from collections import Counter
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
 from rest_framework.generics import CreateAPIView, GenericAPIView
 from rest_framework import status
+from asgiref.sync import sync_to_async
+from utils.async_views import AsyncGenericAPIView
 from utils.error_handler import process_error_response
 from utils.auth import CustomTokenAuthentication, has_expected_permissions
+from utils.cache_utils import cache_response
+from utils.serializer_cache import serialize_cached, serialize_object_cached
 from utils.enum_utils import FileTypeEnum
-from apps.bills.models import Bill
-from utils.file_utils.models import GenericFileUploadSerilizer
+from apps.bills.models import Bill, VoteIngestionStatus
+from utils.file_utils.models import FileDeliverySerializer
 from utils.file_utils.generic_file_utils import (
+    UPLOAD_PARSER_CLASSES,
     file_upload_to_s3,
-    get_s3_file_data,
-    stream_s3_file_data,
+    get_s3_file_bytes,
+    get_s3_file_etag,
+    get_s3_file_info,
+    get_upload_request_data,
+    parse_range_header,
+    presigned_file_response,
+    stream_s3_file_bytes,
+    streaming_content,
 )
+from utils.file_utils.zip_utils import stream_s3_zip
 from utils.generics import add_request_data_to_span
-from apps.votes.models import Vote
+from apps.votes.models import Vote, VoteTally
+from apps.helpers.conditional import (
+    etag_headers,
+    model_condition,
+    not_modified_response,
+)
+from apps.helpers.pagination import paginate_queryset
 from apps.votes import serializers
+from apps.votes.tasks import ingest_vote_file
+from rest_framework.fields import BooleanField
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema
 from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
-from django.views.decorators.vary import vary_on_cookie
 from opentelemetry import trace
 
-from django.db.models import Count
+from django.db.models import F
+from utils.enum_utils import VoteTallyTypeChoices
 
 
 tracer = trace.get_tracer(__name__)
@@ -64,6 +83,56 @@ class CreateVote(CreateAPIView):
             return process_error_response(e)
 
 
+class CreateDivision(GenericAPIView):
+    def get_serializer(self, *args, **kwargs):
+        return
+
+    @extend_schema(
+        tags=["Votes"],
+        request={"application/json": serializers.DivisionCreationSerializer},
+    )
+    @has_expected_permissions(["add_vote"])
+    def post(self, request):
+        """
+        Records every individual vote of a division in one request
+
+        The division is validated as a whole and written in a single transaction,
+        nothing is saved if any row is invalid. Errors are keyed by the row index
+        """
+        try:
+            span = trace.get_current_span()
+            add_request_data_to_span(span, request)
+
+            division_serializer = serializers.DivisionCreationSerializer(
+                data=request.data
+            )
+            if not division_serializer.is_valid():
+                return Response(
+                    {"error": division_serializer.errors},
+                    status=status.HTTP_417_EXPECTATION_FAILED,
+                )
+
+            votes = division_serializer.save()
+            logger.info(
+                f"Created {len(votes)} votes for bill {votes[0].bill_id} in {votes[0].house}"
+            )
+
+            return Response(
+                {
+                    "data": {
+                        "bill_id": votes[0].bill_id,
+                        "house": votes[0].house,
+                        "created": len(votes),
+                        "votes": dict(Counter(vote.vote for vote in votes)),
+                    }
+                },
+                status=status.HTTP_201_CREATED,
+            )
+
+        except Exception as e:
+            return process_error_response(e)
+
+
 class FilterVotes(GenericAPIView):
     def get_serializer_class(self):
         if not self.request.user:
@@ -72,8 +141,7 @@ class FilterVotes(GenericAPIView):
             return serializers.FullFetchVoteSerializer
 
     @extend_schema(tags=["Votes"], parameters=[serializers.VotesFilterSerializer])
-    @method_decorator(cache_page(60 * 60 * 2))
-    @method_decorator(vary_on_cookie)
+    @cache_response(Vote)
     def get(self, request):
         return self.get_queryset()
 
@@ -113,19 +181,16 @@ class FilterVotes(GenericAPIView):
                     "updated_at_end"
                 )
 
-            page = int(self.request.GET.get("page", "1"))
-            items_per_page = int(self.request.GET.get("items_per_page", "10"))
-            offset = (page - 1) * items_per_page
-
-            queryset = Vote.objects.filter(**filter_params)[
-                offset : (offset + items_per_page)
-            ]
+            queryset, pagination_info = paginate_queryset(
+                self.request, Vote.objects.filter(**filter_params)
+            )
 
             serializer_class = self.get_serializer_class()
 
             return Response(
                 {
-                    "data": serializer_class(queryset, many=True).data,
+                    "data": serialize_cached(serializer_class, queryset),
+                    "pagination": pagination_info,
                 },
                 status=status.HTTP_200_OK,
             )
@@ -162,17 +227,16 @@ class GUDVote(GenericAPIView):
         tags=["Votes"],
         responses={201: serializers.FullFetchVoteSerializer},
     )
-    @method_decorator(cache_page(60 * 60 * 2))
-    @method_decorator(vary_on_cookie)
+    @method_decorator(model_condition(Vote))
+    @cache_response(Vote)
     def get(self, request, **kwargs):
         try:
             span = trace.get_current_span()
             add_request_data_to_span(span, self.request)
 
             logger.info(f"Getting vote with ID {kwargs.get('id')}")
-            response_data = Vote.objects.get(pk=kwargs.get("id"))
             serializer_class = self.get_serializer_class()
-            response = serializer_class(response_data).data
+            response = serialize_object_cached(serializer_class, kwargs.get("id"))
 
             return Response(
                 {"data": response},
@@ -220,7 +284,9 @@ class GUDVote(GenericAPIView):
                 data=request.data, partial=True
             )
             if update_serializer.is_valid():
-                update_serializer.update(vote_to_update, request.data)
+                update_serializer.update(
+                    vote_to_update, update_serializer.validated_data
+                )
                 serializer_class = self.get_serializer_class()
                 return Response(
                     {
@@ -241,11 +307,17 @@ class GUDVote(GenericAPIView):
 
 
 class UploadVoteFile(GenericAPIView):
+    parser_classes = UPLOAD_PARSER_CLASSES
+
     def get_serializer(self, *args, **kwargs):
         return
 
     @extend_schema(
-        tags=["Votes"], request={"application/json": GenericFileUploadSerilizer}
+        tags=["Votes"],
+        request={
+            "application/json": serializers.VoteFileUploadSerializer,
+            "multipart/form-data": serializers.VoteMultipartFileUploadSerializer,
+        },
     )
     @has_expected_permissions(["add_votes_file"])
     def post(self, request, **kwargs):
@@ -253,25 +325,32 @@ class UploadVoteFile(GenericAPIView):
         Uploads votes files in json formart
 
         file_type : should be set to VOTE to upload vote JSON
+        ingest : parses a VOTE file into votes for the bill in the background.
+            The file can be an object of {"<representative name/id>": "<vote>"},
+            an array of vote objects or NDJSON (.ndjson/.jsonl)
+
+        Large files should be sent as multipart/form-data (`file` part) or as the raw
+        body, they are streamed to S3 instead of being decoded in memory
         """
         try:
             bill = Bill.objects.get(pk=kwargs.get("bill_id"))
+            fields, file_data = get_upload_request_data(request)
 
             metadata = {
-                "source": request.data.get("file_source") or "",
-                "extension": request.data["file_extension"],
-                "string_encoding_fmt": request.data["string_encoding_fmt"],
+                "source": fields.get("file_source") or "",
+                "extension": fields["file_extension"],
+                "string_encoding_fmt": fields["string_encoding_fmt"],
             }
 
             logger.info(
-                f"Initiating vote file upload --- > to S3 for {bill.title} --> {request.data['file_name']}"
+                f"Initiating vote file upload --- > to S3 for {bill.title} --> {fields['file_name']}"
             )
 
             response = file_upload_to_s3(
                 os.environ.get("VOTES_DATA_BUCKET_NAME"),
-                FileTypeEnum[request.data.get("file_type")],
-                request.data["file_name"],
-                request.data["base64_encoding"],
+                FileTypeEnum[fields.get("file_type")],
+                fields["file_name"],
+                file_data,
                 metadata=metadata,
                 house=bill.house.lower(),
                 folder=bill.title,
@@ -283,6 +362,17 @@ class UploadVoteFile(GenericAPIView):
                     status=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 )
 
+            if (
+                fields.get("ingest") in BooleanField.TRUE_VALUES
+                and FileTypeEnum[fields.get("file_type")] == FileTypeEnum.VOTE
+            ):
+                bill.votes_ingestion_status = VoteIngestionStatus.PENDING
+                bill.save(update_fields=["votes_ingestion_status", "updated_at"])
+                # Don't do celery stuff in pytest mode -Git actions
+                if os.environ.get("ENVIRONMENT", "") != "test":
+                    ingest_vote_file.delay(str(bill.id), fields["file_name"])
+                response = {**response, "ingestion": VoteIngestionStatus.PENDING}
+
             return Response(response, status=status.HTTP_200_OK)
 
         except Exception as e:
@@ -293,7 +383,11 @@ class GetVoteFileData(GenericAPIView):
     def get_serializer(self, *args, **kwargs):
         return
 
-    @extend_schema(tags=["Votes"], responses={200: "Vote file found"})
+    @extend_schema(
+        tags=["Votes"],
+        parameters=[FileDeliverySerializer],
+        responses={200: "Vote file found"},
+    )
     def get(self, request, **kwargs):
         """
         Gets vote file tied to a bill.
@@ -302,12 +396,30 @@ class GetVoteFileData(GenericAPIView):
         try:
             bill_data = Bill.objects.get(pk=kwargs.get("bill_id"))
             file_url = f"votes/{bill_data.house.lower()}/{bill_data.title}/{kwargs.get('file_name')}"
-            file_data = get_s3_file_data(
-                os.environ.get("VOTES_DATA_BUCKET_NAME"), file_url
+
+            presigned_response = presigned_file_response(
+                request,
+                os.environ.get("VOTES_DATA_BUCKET_NAME"),
+                file_url,
+                FileTypeEnum.VOTE,
             )
-            file_data = base64.b64decode(file_data).decode("utf-8")
+            if presigned_response:
+                return presigned_response
+
+            etag = get_s3_file_etag(os.environ.get("VOTES_DATA_BUCKET_NAME"), file_url)
+            not_modified = not_modified_response(request, etag)
+            if not_modified:
+                return not_modified
 
-            return Response({"data": json.loads(file_data)}, status=status.HTTP_200_OK)
+            file_data = get_s3_file_bytes(
+                os.environ.get("VOTES_DATA_BUCKET_NAME"), file_url, etag=etag
+            )
+
+            return Response(
+                {"data": json.loads(file_data)},
+                status=status.HTTP_200_OK,
+                headers=etag_headers(etag),
+            )
         except Exception as e:
             return process_error_response(e)
 
@@ -318,7 +430,11 @@ class ApiGetVoteFileData(GetVoteFileData):
     def get_serializer(self, *args, **kwargs):
         return
 
-    @extend_schema(tags=["Votes"], responses={200: "Vote file found"})
+    @extend_schema(
+        tags=["Votes"],
+        parameters=[FileDeliverySerializer],
+        responses={200: "Vote file found"},
+    )
     @has_expected_permissions(["view_votes_file"])
     def get(self, request, **kwargs):
         try:
@@ -331,7 +447,7 @@ class DownloadVoteFile(GenericAPIView):
     def get_serializer(self, *args, **kwargs):
         return
 
-    @extend_schema(tags=["Votes"])
+    @extend_schema(tags=["Votes"], parameters=[FileDeliverySerializer])
     def get(self, request, **kwargs):
         """
         Allows browsers to download
@@ -341,10 +457,25 @@ class DownloadVoteFile(GenericAPIView):
         try:
             bill_data = Bill.objects.get(pk=kwargs.get("bill_id"))
             file_url = f"votes/{bill_data.house.lower()}/{bill_data.title}/{kwargs.get('file_name')}"
-            file_data = get_s3_file_data(
-                os.environ.get("VOTES_DATA_BUCKET_NAME"), file_url
+
+            presigned_response = presigned_file_response(
+                request,
+                os.environ.get("VOTES_DATA_BUCKET_NAME"),
+                file_url,
+                FileTypeEnum.VOTE,
+                content_disposition=f'attachment; filename="{bill_data.title} - {kwargs.get("file_name")}"',
+            )
+            if presigned_response:
+                return presigned_response
+
+            etag = get_s3_file_etag(os.environ.get("VOTES_DATA_BUCKET_NAME"), file_url)
+            not_modified = not_modified_response(request, etag)
+            if not_modified:
+                return not_modified
+
+            file_data = get_s3_file_bytes(
+                os.environ.get("VOTES_DATA_BUCKET_NAME"), file_url, etag=etag
             )
-            file_data = base64.b64decode(file_data.decode("utf-8"))
 
             filename = f"{bill_data.title} - {kwargs.get('file_name')}"
 
@@ -352,6 +483,7 @@ class DownloadVoteFile(GenericAPIView):
                 io.BytesIO(file_data),
                 content_type="application/json",
                 status=status.HTTP_200_OK,
+                headers=etag_headers(etag),
             )
             response["Content-Disposition"] = f'attachment; filename="{filename}"'
 
@@ -366,7 +498,7 @@ class ApiDownloadVoteFile(DownloadVoteFile):
     def get_serializer(self, *args, **kwargs):
         return
 
-    @extend_schema(tags=["Votes"])
+    @extend_schema(tags=["Votes"], parameters=[FileDeliverySerializer])
     @has_expected_permissions(["view_votes_file"])
     def get(self, request, **kwargs):
         try:
@@ -375,7 +507,7 @@ class ApiDownloadVoteFile(DownloadVoteFile):
             return process_error_response(e)
 
 
-class StreamVoteFile(GenericAPIView):
+class StreamVoteFile(AsyncGenericAPIView):
     def get_serializer(self, *args, **kwargs):
         return
 
@@ -384,23 +516,71 @@ class StreamVoteFile(GenericAPIView):
         """
         Similar to download Votes file but allows for stream response
         Ideal for larger files
+
+        The file is decoded chunk by chunk as it is sent.
+        Supports a single HTTP Range (bytes=<start>-<stop>) over the decoded file.
+        Async, under ASGI a worker holds many slow downloads without blocking other requests
         """
         try:
-            bill_data = Bill.objects.get(pk=kwargs.get("bill_id"))
+            bill_data = await Bill.objects.aget(pk=kwargs.get("bill_id"))
             file_url = f"votes/{bill_data.house.lower()}/{bill_data.title}/{kwargs.get('file_name')}"
-            file_data = await stream_s3_file_data(
-                os.environ.get("VOTES_DATA_BUCKET_NAME"), file_url
-            )
-            file_data = base64.b64decode(file_data.read().decode("utf-8"))
+            bucket_name = os.environ.get("VOTES_DATA_BUCKET_NAME")
 
             filename = f"{bill_data.title} - {kwargs.get('file_name')}"
+            content_type = "application/x-ndjson,text/event-stream"
 
-            response = StreamingHttpResponse(
-                io.BytesIO(file_data),
-                content_type="application/x-ndjson,text/event-stream",
-                status=status.HTTP_200_OK,
+            etag = await sync_to_async(get_s3_file_etag, thread_sensitive=False)(
+                bucket_name, file_url
             )
+            not_modified = not_modified_response(request, etag)
+            if not_modified:
+                return not_modified
+
+            byte_range = None
+            if request.headers.get("Range"):
+                file_size, body_encoding = await sync_to_async(
+                    get_s3_file_info, thread_sensitive=False
+                )(bucket_name, file_url)
+                try:
+                    byte_range = parse_range_header(request.headers["Range"], file_size)
+                except ValueError as e:
+                    logger.info(e)
+                    response = HttpResponse(
+                        status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+                    )
+                    response["Content-Range"] = f"bytes */{file_size}"
+                    return response
+
+            if byte_range:
+                start, stop = byte_range
+                response = StreamingHttpResponse(
+                    streaming_content(
+                        request,
+                        stream_s3_file_bytes(
+                            bucket_name,
+                            file_url,
+                            start,
+                            stop,
+                            body_encoding=body_encoding,
+                        ),
+                    ),
+                    content_type=content_type,
+                    status=status.HTTP_206_PARTIAL_CONTENT,
+                )
+                response["Content-Range"] = f"bytes {start}-{stop}/{file_size}"
+                response["Content-Length"] = stop - start + 1
+            else:
+                response = StreamingHttpResponse(
+                    streaming_content(
+                        request, stream_s3_file_bytes(bucket_name, file_url)
+                    ),
+                    content_type=content_type,
+                    status=status.HTTP_200_OK,
+                )
+            response["Accept-Ranges"] = "bytes"
             response["Content-Disposition"] = f'inline; filename="{filename}"'
+            if etag:
+                response["ETag"] = etag
 
             return response
         except Exception as e:
@@ -415,9 +595,54 @@ class ApiStreamVoteFile(StreamVoteFile):
 
     @extend_schema(tags=["Votes"])
     @has_expected_permissions(["view_votes_file"])
-    def get(self, request):
+    async def get(self, request, **kwargs):
+        try:
+            return await super().get(request, **kwargs)
+        except Exception as e:
+            return process_error_response(e)
+
+
+class ExportVoteFiles(AsyncGenericAPIView):
+    def get_serializer(self, *args, **kwargs):
+        return
+
+    @extend_schema(tags=["Votes"], responses={200: "ZIP of the bill's vote files"})
+    async def get(self, request, **kwargs):
+        """
+        Downloads all vote files of a bill as a ZIP, streamed as the files are fetched
+        """
         try:
-            return super().get(request)
+            bill_data = await Bill.objects.aget(pk=kwargs.get("bill_id"))
+
+            response = StreamingHttpResponse(
+                streaming_content(
+                    request,
+                    stream_s3_zip(
+                        os.environ.get("VOTES_DATA_BUCKET_NAME"),
+                        f"votes/{bill_data.house.lower()}/{bill_data.title}/",
+                    ),
+                ),
+                content_type="application/zip",
+            )
+            response["Content-Disposition"] = (
+                f'attachment; filename="{bill_data.title} - votes.zip"'
+            )
+            return response
+        except Exception as e:
+            return process_error_response(e)
+
+
+class ApiExportVoteFiles(ExportVoteFiles):
+    authentication_classes = [CustomTokenAuthentication]
+
+    def get_serializer(self, *args, **kwargs):
+        return
+
+    @extend_schema(tags=["Votes"], responses={200: "ZIP of the bill's vote files"})
+    @has_expected_permissions(["view_votes_file"])
+    async def get(self, request, **kwargs):
+        try:
+            return await super().get(request, **kwargs)
         except Exception as e:
             return process_error_response(e)
 
@@ -427,22 +652,34 @@ class VoteSummaries(GenericAPIView):
 
     @extend_schema(tags=["Votes"], parameters=[serializers.VotesFilterSerializer])
     def get(self, *args, **kwargs):
-        id_type = self.request.GET.get("id_type")
-        id = self.request.GET.get("id")
-
-        if id_type == "bill":
-            # Aggregates all votes of a bill per house
-            queryset = Vote.objects.filter(bill_id=id)
-            q = queryset.values("house", "vote").annotate(bill_votes=Count("vote"))
-        elif id_type == "rep":
-            # Aggregates all votes a rep has done into a count of the vote values (yes/no/missing etc.)
-            queryset = Vote.objects.filter(representative_id=id)
-            q = queryset.values("house", "vote").annotate(bill_votes=Count("vote"))
-        else:
-            # Aggregates all votes of a house grouping them by bill id and vote value
-            queryset = Vote.objects.filter(house=id)
-            q = queryset.values("house", "bill_id", "vote").annotate(
-                bill_votes=Count("vote")
-            )
+        """
+        Vote counts read off the maintained vote tallies (see VoteTally)
+        """
+        try:
+            id_type = self.request.GET.get("id_type")
+            id = self.request.GET.get("id")
+
+            # Empty tallies are left behind when votes are deleted/changed
+            tallies = VoteTally.objects.filter(count__gt=0)
+            if id_type == "bill":
+                # All votes of a bill per house
+                tallies = tallies.filter(
+                    tally_type=VoteTallyTypeChoices.BILL, tally_id=id
+                )
+                q = tallies.values("house", "vote", bill_votes=F("count"))
+            elif id_type == "rep":
+                # All votes a rep has done as a count of the vote values (yes/no/missing etc.)
+                tallies = tallies.filter(
+                    tally_type=VoteTallyTypeChoices.REPRESENTATIVE, tally_id=id
+                )
+                q = tallies.values("house", "vote", bill_votes=F("count"))
+            else:
+                # All votes of a house per bill id and vote value
+                tallies = tallies.filter(tally_type=VoteTallyTypeChoices.BILL, house=id)
+                q = tallies.values(
+                    "house", "vote", bill_id=F("tally_id"), bill_votes=F("count")
+                )
 
-        return Response(data=q)
+            return Response(data=q)
+        except Exception as e:
+            return process_error_response(e)
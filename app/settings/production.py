@@ -43,6 +43,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # Custom
     "rest_framework",
     "django_prometheus",
@@ -149,6 +150,48 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+# Where uploaded files are kept
+# s3 ---> S3 (default), local ---> FILE_STORAGE_ROOT on this host,
+# memory ---> this process only (tests/benchmarks) or a dotted path to a StorageBackend
+FILE_STORAGE_BACKEND = os.environ.get("FILE_STORAGE_BACKEND", "s3")
+FILE_STORAGE_ROOT = os.environ.get("FILE_STORAGE_ROOT", str(BASE_DIR / "file_storage"))
+
+# Cache
+# Shared by every worker through redis, falls back to per process memory without one (local dev).
+# Keys are <prefix>:<version>:<key>, bump CACHE_VERSION to drop every entry on a deploy
+# that changes what is cached. Point CACHE_REDIS_URL at its own db/instance
+# (with an eviction policy) rather than sharing the celery broker's in production
+CACHE_REDIS_URL = (
+    os.environ.get("CACHE_REDIS_URL")
+    or os.environ.get("REDIS_URL")
+    or os.environ.get("CELERY_BROKER_URL")
+)
+CACHE_SETTINGS = {
+    "KEY_PREFIX": os.environ.get("REDIS_KEY_PREFIX", "fuatilia"),
+    "VERSION": int(os.environ.get("CACHE_VERSION", "1")),
+    "TIMEOUT": int(os.environ.get("CACHE_DEFAULT_TIMEOUT", "300")),
+}
+if CACHE_REDIS_URL and CACHE_REDIS_URL.startswith(("redis://", "rediss://")):
+    CACHES = {
+        "default": {
+            "BACKEND": "utils.cache_backends.FailSafeRedisCache",
+            "LOCATION": CACHE_REDIS_URL,
+            "OPTIONS": {
+                "password": os.environ.get("REDIS_PASSWORD") or None,
+                "socket_timeout": 0.5,
+                "socket_connect_timeout": 0.5,
+            },
+            **CACHE_SETTINGS,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            **CACHE_SETTINGS,
+        }
+    }
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
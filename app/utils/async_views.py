@@ -0,0 +1,47 @@
+import logging
+from asgiref.sync import sync_to_async
+from rest_framework.generics import GenericAPIView
+
+logger = logging.getLogger("app_logger")
+
+
+class AsyncGenericAPIView(GenericAPIView):
+    """
+    GenericAPIView with `async def` handlers, for endpoints that mostly wait on I/O
+    e.g file streaming. Under ASGI they run on the event loop instead of taking up
+    one of the threads sync views are run in.
+
+    Authentication, permissions and throttling are the usual DRF ones, run in a
+    thread as they may hit the database. Handlers must not make blocking calls,
+    use the async ORM (aget, afirst ...) and sync_to_async for the rest
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            else:
+                handler = self.http_method_not_allowed
+
+            # http_method_not_allowed raises before there is anything to await
+            response = await handler(request, *args, **kwargs)
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def options(self, request, *args, **kwargs):
+        # Django requires the handlers of a view to be all sync or all async
+        return super().options(request, *args, **kwargs)
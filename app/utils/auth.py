@@ -6,7 +6,9 @@ import random
 import string
 import logging
 import datetime
+from asgiref.sync import iscoroutinefunction, sync_to_async
 from apps.users.models import User
+from utils.permission_utils import get_user_permission_codenames
 from rest_framework import authentication
 from rest_framework import exceptions
 from django.contrib.auth.hashers import Argon2PasswordHasher
@@ -18,6 +20,8 @@ logger = logging.getLogger("app_logger")
 HASH_SECRET_STR = os.environ.get("HASH_SECRET_STR")
 JWT_ALGORITHM = os.environ.get("JWT_ALGORITHM")
 TOKEN_DELTA = int(os.environ.get("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
+# Trust the signed token claims instead of fetching the user row on every request
+STATELESS_TOKEN_AUTH = os.environ.get("STATELESS_TOKEN_AUTH", "False").lower() == "true"
 
 
 def get_tokens_for_user(user: User, scope: str = ""):
@@ -31,6 +35,7 @@ def get_tokens_for_user(user: User, scope: str = ""):
         "role": list(user.groups.values_list("name", flat=True)),
         "user_type": user.user_type,
         "organisation": user.parent_organization,
+        "superuser": user.is_superuser,
         "exp": exp_epoch,
         "iat": int(iat.timestamp()),
     }
@@ -39,7 +44,51 @@ def get_tokens_for_user(user: User, scope: str = ""):
     return {"access": str(token), "exp": exp_epoch}
 
 
-def verify_user_token(token: str, user: User | None):
+class TokenUser:
+    """
+    Lightweight principal built from the claims of a verified token_login token.
+    The full User row is only fetched if a view touches an attribute that is not in the claims
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+    is_active = True
+
+    def __init__(self, claims: dict):
+        self.id = claims["id"]
+        self.pk = claims["id"]
+        self.username = claims.get("username")
+        self.roles = claims.get("role", [])
+        self.user_type = claims.get("user_type")
+        self.parent_organization = claims.get("organisation")
+        self._is_superuser = claims.get("superuser")
+        self._user = None
+
+    @property
+    def user(self) -> User:
+        if self._user is None:
+            logger.info(f"Loading full user row for token user {self.id}")
+            self._user = User.objects.get(id=self.id)
+        return self._user
+
+    @property
+    def is_superuser(self) -> bool:
+        if self._is_superuser is None:
+            # Tokens issued before the superuser claim was added
+            return self.user.is_superuser
+        return self._is_superuser
+
+    def __getattr__(self, name):
+        # Only called for attributes outside of the claims
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.user, name)
+
+    def __str__(self):
+        return self.username
+
+
+def verify_user_token(token: str, user: User | None, stateless: bool = False):
     try:
         decoded_data = jwt.decode(token, HASH_SECRET_STR, algorithms=[JWT_ALGORITHM])
     except Exception as e:
@@ -50,7 +99,10 @@ def verify_user_token(token: str, user: User | None):
     logger.info(f"Verifying user token for {decoded_data['id']}")
 
     if "token_login" in decoded_data.get("scope"):
-        user = User.objects.get(id=decoded_data["id"])
+        if stateless:
+            user = TokenUser(decoded_data)
+        else:
+            user = User.objects.get(id=decoded_data["id"])
         # Allow verification of credential reset tokens
         logger.info(f"Verified user token for {decoded_data['id']}")
         return {"verified": True, "scope": "user_credential_reset", "user": user}
@@ -99,48 +151,50 @@ def create_client_id_and_secret(username: str):
 
 
 def has_expected_permissions(permission_list: List[str]):
-    def decorator_expected_permissions(func):
-        @functools.wraps(func)
-        def wrapper_expected_permissions(*args, **kwargs):
-            user: User = args[1].user
-            if not user:
-                # Handles portal endpoints that require auth
-                # i.e in the event no token is passed in the headers
-                # prevents 500 type errors
+    # Guards against a single permission being passed as a plain string
+    if isinstance(permission_list, str):
+        required_permissions = (permission_list,)
+    else:
+        required_permissions = tuple(permission_list)
+
+    def check_expected_permissions(user: User):
+        if not user:
+            # Handles portal endpoints that require auth
+            # i.e in the event no token is passed in the headers
+            # prevents 500 type errors
+            raise exceptions.AuthenticationFailed(
+                "Unable to authenticate user. Invalid credentials"
+            )
+        if not user.is_superuser:
+            if not user.is_authenticated:
+                # In the event of something like AnonymousUser
+                logger.error(f"Unable to authenticate user << {user} >>")
                 raise exceptions.AuthenticationFailed(
-                    "Unable to authenticate user. Invalid credentials"
+                    "Unable to authenticate user. Token is invalid or missing"
                 )
-            if not user.is_superuser:
-                # Whatever is going on after this if-check does not look like I should have done it
-                # Need to find a way to make it quicker
-                try:
-                    user = User.objects.get(username=user.username)
-                except Exception as user_fetch_exp:
-                    # In the event of something like AnonymousUser
-                    logger.error(
-                        f"Unable to authenticate user << {user} >> error {user_fetch_exp}"
-                    )
+
+            # Cached per user and invalidated on any role/permission change
+            user_permissions = get_user_permission_codenames(user.id)
+
+            for permission in required_permissions:
+                if permission not in user_permissions:
                     raise exceptions.AuthenticationFailed(
-                        "Unable to authenticate user. Token is invalid or missing"
+                        f"User does not have permission --> {permission}"
                     )
-                user_groups = list(user.groups.all())
-
-                # Current assumption is that a user will belong to one role
-                if len(user_groups) < 1:
-                    user_permissions_list = []
-                else:
-                    user_permissions = user_groups[0].permissions.all()
-                    user_permissions_list = [
-                        permission.codename for permission in user_permissions
-                    ]
-
-                for permission in permission_list:
-                    # If permissions are assigned individualy
-                    if permission not in user_permissions_list:
-                        raise exceptions.AuthenticationFailed(
-                            f"User does not have permission --> {permission}"
-                        )
 
+    def decorator_expected_permissions(func):
+        if iscoroutinefunction(func):
+            # Async views, the lookups run off the event loop
+            @functools.wraps(func)
+            async def async_wrapper_expected_permissions(*args, **kwargs):
+                await sync_to_async(check_expected_permissions)(args[1].user)
+                return await func(*args, **kwargs)
+
+            return async_wrapper_expected_permissions
+
+        @functools.wraps(func)
+        def wrapper_expected_permissions(*args, **kwargs):
+            check_expected_permissions(args[1].user)
             return func(*args, **kwargs)
 
         return wrapper_expected_permissions
@@ -158,7 +212,7 @@ class CustomTokenAuthentication(authentication.BaseAuthentication):
                 )
 
             token = token.split(" ")[1]
-            verified = verify_user_token(token, None)
+            verified = verify_user_token(token, None, stateless=STATELESS_TOKEN_AUTH)
             if verified["verified"]:
                 return (verified["user"], None)
             else:
@@ -0,0 +1,58 @@
+import logging
+import redis
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.redis import RedisCache
+
+logger = logging.getLogger("app_logger")
+
+
+class FailSafeRedisCache(RedisCache):
+    """
+    Django's RedisCache that degrades to cache misses when redis is unreachable,
+    as the in-process state in utils.redis_utils does, instead of failing requests.
+
+    Reads return the default, writes are dropped. add() reports the key as stored
+    so callers using it as a lock (cache_utils.get_or_compute) compute right away
+    instead of waiting on a lock nobody can take
+    """
+
+    def get(self, key, default=None, version=None):
+        try:
+            return super().get(key, default, version)
+        except redis.RedisError as e:
+            logger.error(f"Unable to read cache key {key} :: {e}")
+            return default
+
+    def get_many(self, keys, version=None):
+        try:
+            return super().get_many(keys, version)
+        except redis.RedisError as e:
+            logger.error(f"Unable to read {len(keys)} cache keys :: {e}")
+            return {}
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        try:
+            super().set(key, value, timeout, version)
+        except redis.RedisError as e:
+            logger.error(f"Unable to write cache key {key} :: {e}")
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        try:
+            return super().set_many(data, timeout, version)
+        except redis.RedisError as e:
+            logger.error(f"Unable to write {len(data)} cache keys :: {e}")
+            return list(data)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        try:
+            return super().add(key, value, timeout, version)
+        except redis.RedisError as e:
+            logger.error(f"Unable to add cache key {key} :: {e}")
+            return True
+
+    def delete(self, key, version=None):
+        try:
+            return super().delete(key, version)
+        except redis.RedisError as e:
+            logger.error(f"Unable to delete cache key {key} :: {e}")
+            return False
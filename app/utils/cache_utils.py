@@ -0,0 +1,209 @@
+import functools
+import hashlib
+import json
+import logging
+import os
+import time
+import redis
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from rest_framework import status
+from rest_framework.response import Response
+
+logger = logging.getLogger("app_logger")
+
+# Cached responses go stale through their models generation, not their age,
+# the TTL only bounds how long unused entries take up the cache
+RESPONSE_CACHE_TTL = int(os.environ.get("RESPONSE_CACHE_TTL", str(60 * 60 * 24)))
+# Longest a worker holds the lock to recompute a missing entry (seconds),
+# and how long the others wait on it before computing the entry themselves
+CACHE_LOCK_TIMEOUT = int(os.environ.get("CACHE_LOCK_TIMEOUT", "30"))
+CACHE_LOCK_WAIT = float(os.environ.get("CACHE_LOCK_WAIT", "5"))
+
+# Per model generation counters.
+# Anything cached off a model (counts, responses ...) has the model's generation in its key,
+# bumping the generation on writes makes every worker miss on the old entries at once.
+# Kept in the cache backend itself so generations are exactly as shared as the entries keyed on them
+GENERATION_KEY_PREFIX = "generation"
+
+
+def _model_label(model) -> str:
+    return model if isinstance(model, str) else model._meta.label_lower
+
+
+def _seed_generation(key: str):
+    # Counters start from the clock so one that was evicted (or cleared) never comes
+    # back at a value that entries cached before it went missing are keyed on
+    cache.add(key, time.time_ns(), timeout=None)
+
+
+def is_cache_shared() -> bool:
+    """
+    Whether the cache (and so the generations) is visible to every worker,
+    the locmem fallback is per process
+    """
+    return not isinstance(caches["default"], LocMemCache)
+
+
+def get_model_generation(model) -> int:
+    key = f"{GENERATION_KEY_PREFIX}:{_model_label(model)}"
+    generation = cache.get(key)
+    if generation is None:
+        _seed_generation(key)
+        generation = cache.get(key, 0)
+    return generation
+
+
+def bump_model_generation(model):
+    key = f"{GENERATION_KEY_PREFIX}:{_model_label(model)}"
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Not read yet or evicted
+        _seed_generation(key)
+    except redis.RedisError as e:
+        logger.error(f"Unable to bump cache generation for {key} :: {e}")
+
+
+def bump_model_generation_on_commit(model):
+    """
+    Bumps the generation once the current transaction commits (right away outside of one).
+    Bumping before the commit lets readers cache the old rows under the new generation
+    """
+    transaction.on_commit(lambda: bump_model_generation(model))
+
+
+def params_signature(params: dict) -> str:
+    """
+    Stable hash of (filter) params so that the same filters in any order share a key
+    """
+    normalized = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.md5(normalized.encode("utf-8")).hexdigest()
+
+
+def _bump_on_write(sender, **kwargs):
+    bump_model_generation_on_commit(sender)
+
+
+def register_generation_signals(*models):
+    """
+    Bumps the models generation on every save/delete.
+    Queryset .update()/.bulk_create() skip signals, call bump_model_generation after those
+    """
+    for model in models:
+        post_save.connect(
+            _bump_on_write, sender=model, dispatch_uid=f"generation_save_{model}"
+        )
+        post_delete.connect(
+            _bump_on_write, sender=model, dispatch_uid=f"generation_delete_{model}"
+        )
+
+
+def get_or_compute(key: str, compute, timeout: int):
+    """
+    cache.get of <key>, computing and caching it on a miss with single-flight:
+    one worker takes a lock (cache.add) and recomputes while the others poll for
+    its result, so an expired or invalidated popular entry sends one query to the
+    database instead of one per worker.
+
+    Parameters
+    ----------
+    compute: callable
+        Returns the value to cache, None is returned as is and not cached
+    timeout: int
+        TTL of the cached value (seconds)
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    lock_key = f"lock:{key}"
+    deadline = time.monotonic() + CACHE_LOCK_WAIT
+    delay = 0.02
+    while not cache.add(lock_key, 1, CACHE_LOCK_TIMEOUT):
+        if time.monotonic() >= deadline:
+            logger.warning(f"Timed out waiting on the recompute of {key}")
+            return compute()
+        time.sleep(delay)
+        delay = min(delay * 2, 0.5)
+        value = cache.get(key)
+        if value is not None:
+            return value
+
+    try:
+        value = compute()
+        if value is not None:
+            cache.set(key, value, timeout)
+        return value
+    finally:
+        cache.delete(lock_key)
+
+
+def _serializer_variant(view) -> str:
+    try:
+        return view.get_serializer_class().__name__
+    except AssertionError:
+        # No serializer class i.e the same payload for everyone
+        return ""
+
+
+def cache_response(*models, timeout: int = RESPONSE_CACHE_TTL):
+    """
+    Caches the data of 200 responses of a DRF view method (GET)
+
+    Entries are keyed on the generations of <models>, the serializer variant the
+    view picks for the request, the URL kwargs and the query params (in any order).
+    Any write to one of the models bumps its generation and every worker misses on
+    the old entries at once, so <timeout> can be long without serving stale data.
+
+    Writes that skip signals (queryset .update(), bulk_create ...) must bump the
+    generation themselves (bump_model_generation_on_commit in transactions).
+    Put below permission decorators, a hit returns without calling the view
+
+    Parameters
+    ----------
+    models: django models (or generation labels) the response is built from
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(view, request, *args, **kwargs):
+            response_key = ":".join(
+                [
+                    "response",
+                    # Portal and Api* views of the same method share entries
+                    func.__qualname__,
+                    ".".join(str(get_model_generation(model)) for model in models),
+                    _serializer_variant(view),
+                    params_signature(
+                        {
+                            "kwargs": kwargs,
+                            "query": {
+                                key: request.GET.getlist(key) for key in request.GET
+                            },
+                        }
+                    ),
+                ]
+            )
+            computed = {}
+
+            def compute():
+                response = func(view, request, *args, **kwargs)
+                computed["response"] = response
+                if (
+                    isinstance(response, Response)
+                    and response.status_code == status.HTTP_200_OK
+                ):
+                    return response.data
+                return None
+
+            data = get_or_compute(response_key, compute, timeout)
+            if "response" in computed:
+                return computed["response"]
+            return Response(data, status=status.HTTP_200_OK)
+
+        return wrapper
+
+    return decorator
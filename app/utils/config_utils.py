@@ -0,0 +1,84 @@
+import logging
+import os
+import threading
+import time
+from apps.props.models import Config
+from utils.cache_utils import get_model_generation, is_cache_shared
+
+logger = logging.getLogger("app_logger")
+
+# How often (seconds) a process checks whether the Config rows changed.
+# A change is seen by every worker within this long of its commit
+CONFIG_REFRESH_INTERVAL = float(os.environ.get("CONFIG_REFRESH_INTERVAL", "1"))
+
+# Known switches
+EMAIL_CLIENT = "email_client"
+REPRESENTATIVE_UPDATE_MODE = "representative_update_mode"
+
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+
+
+class ConfigRegistry:
+    """
+    Process wide view of the Config rows (name ---> value)
+
+    All rows are loaded with one query and lookups are dictionary reads after that.
+    At most once every CONFIG_REFRESH_INTERVAL the Config generation is read from
+    the cache (bumped on every Config write, see cache_utils) and the rows reloaded if it
+    moved. With the per process cache other workers' bumps are not visible, so the rows
+    are reloaded on every interval instead
+    """
+
+    def __init__(self):
+        self._values: dict[str, str] | None = None
+        self._generation: int | None = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _current_values(self) -> dict[str, str]:
+        now = time.monotonic()
+        values = self._values
+        if values is not None and now - self._checked_at < CONFIG_REFRESH_INTERVAL:
+            return values
+
+        with self._lock:
+            if (
+                self._values is not None
+                and now - self._checked_at < CONFIG_REFRESH_INTERVAL
+            ):
+                return self._values
+
+            generation = get_model_generation(Config)
+            if (
+                self._values is None
+                or generation != self._generation
+                or not is_cache_shared()
+            ):
+                self._values = dict(Config.objects.values_list("name", "value"))
+                self._generation = generation
+                logger.info(f"Loaded {len(self._values)} configs")
+            self._checked_at = now
+            return self._values
+
+    def get(self, name: str, default: str | None = None) -> str | None:
+        return self._current_values().get(name, default)
+
+    def get_bool(self, name: str, default: bool = False) -> bool:
+        value = self.get(name)
+        if value is None:
+            return default
+        return value.strip().lower() in _TRUE_VALUES
+
+    def get_int(self, name: str, default: int = 0) -> int:
+        value = self.get(name)
+        try:
+            return int(value) if value is not None else default
+        except ValueError:
+            logger.error(f"Config {name} is not an integer :: {value}")
+            return default
+
+    def all(self) -> dict[str, str]:
+        return dict(self._current_values())
+
+
+config_registry = ConfigRegistry()
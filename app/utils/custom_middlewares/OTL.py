@@ -1,7 +1,9 @@
 # OpenTelemetry Middlewares
 import logging
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.http import (
     HttpResponseNotFound,
+    HttpResponseNotModified,
     StreamingHttpResponse,
     HttpResponse,
     FileResponse,
@@ -14,16 +16,34 @@ logger = logging.getLogger("app_logger")
 
 
 class RequestInjectorMiddleware:
+    # Sync and async so async views under ASGI aren't pushed back into a thread
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        span = self.process_request(request)
+        return self.process_response(span, self.get_response(request))
+
+    async def __acall__(self, request):
+        span = self.process_request(request)
+        return self.process_response(span, await self.get_response(request))
+
+    def process_request(self, request):
         span = trace.get_current_span()
 
         logger.info(request.headers)
         span.set_attribute("request.headers", f"{request.headers}")
+        return span
 
-        response = self.get_response(request)
+    def process_response(self, span, response):
         logger.info(response)
 
         try:
@@ -35,6 +55,7 @@ class RequestInjectorMiddleware:
                 response.__class__ == HttpResponse
                 or response.__class__ == HttpResponseRedirect
                 or response.__class__ == HttpResponseNotFound
+                or response.__class__ == HttpResponseNotModified
             ):
                 # Prometheus and Django URLs using HttpResponses
                 span.set_attribute("response.class", "HttpResponse")
@@ -34,6 +34,11 @@ class VoteTypeChoices(models.TextChoices):
     INDIVIDUAL = "INDIVIDUAL"
 
 
+class VoteTallyTypeChoices(models.TextChoices):
+    BILL = "BILL"
+    REPRESENTATIVE = "REPRESENTATIVE"
+
+
 class PositionClassChoices(models.TextChoices):
     ELECTED = "ELECTED"
     NOMINATED = "NOMINATED"
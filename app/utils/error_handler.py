@@ -1,6 +1,6 @@
 import logging
 from django.db.utils import IntegrityError
-from rest_framework import status
+from rest_framework import exceptions, status
 from rest_framework.response import Response
 from django.core.exceptions import ObjectDoesNotExist
 
@@ -20,6 +20,11 @@ def process_error_response(
         response_status = (status.HTTP_404_NOT_FOUND,)
         error_str = e.__str__()
 
+    elif isinstance(e, exceptions.APIException):
+        # e.g invalid cursors/params raised as ValidationError
+        response_status = e.status_code
+        error_str = e.__str__()
+
     else:
         if "nosuchkey" in e.__str__().lower():
             response_status = status.HTTP_404_NOT_FOUND
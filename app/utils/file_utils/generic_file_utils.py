@@ -1,15 +1,118 @@
+import base64
+import codecs
+import hashlib
+import itertools
+import json
+import os
+import time
+from typing import AsyncIterator, Iterable, Iterator
+from asgiref.sync import sync_to_async
+from botocore.exceptions import ClientError
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponseRedirect
+from django.utils.cache import patch_cache_control
+from rest_framework import exceptions, status
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.parsers import (
+    FileUploadParser,
+    FormParser,
+    JSONParser,
+    MultiPartParser,
+)
+from rest_framework.response import Response
+from utils.cache_utils import (
+    bump_model_generation,
+    get_model_generation,
+    get_or_compute,
+)
 from utils.enum_utils import FileTypeEnum
-from utils.file_utils.s3_utils import S3Processor
+from utils.file_utils.object_cache import S3ObjectCache
+from utils.file_utils.s3_utils import BINARY_BODY_ENCODING, get_body_encoding
+from utils.file_utils.storage import get_storage_backend
 import logging
 
 logger = logging.getLogger("app_logger")
 
-# Initiate S3 processor
-representative_s3_processor = S3Processor()
+S3_STREAM_CHUNK_SIZE = int(os.environ.get("S3_STREAM_CHUNK_SIZE", str(64 * 1024)))
+# Directory listings are cached until something is written under them,
+# the TTL only matters for objects written by something other than the app
+S3_LISTING_CACHE_TTL = int(os.environ.get("S3_LISTING_CACHE_TTL", "3600"))
+# Largest single JSON item the incremental parser will buffer
+MAX_JSON_ITEM_SIZE = 1024 * 1024
+
+# How file endpoints hand out files
+# inline ---> file data through the app (default), url ---> presigned url in JSON,
+# redirect ---> 302 to the presigned url
+FILE_DELIVERY_MODES = ("inline", "url", "redirect")
+FILE_DELIVERY_MODE = os.environ.get("FILE_DELIVERY_MODE", "inline")
+# Presigned url lifetime per file type, override with PRESIGNED_URL_TTL_<FILE TYPE>
+PRESIGNED_URL_TTLS = {
+    file_type: int(
+        os.environ.get(
+            f"PRESIGNED_URL_TTL_{file_type.name}",
+            "43200" if file_type == FileTypeEnum.IMAGE else "900",
+        )
+    )
+    for file_type in FileTypeEnum
+}
+# Cached urls are dropped this many seconds before they expire
+PRESIGNED_URL_EXPIRY_MARGIN = 60
+
+# Upload endpoints take the file as
+# application/json ---> base64_encoding field, the whole file is held in memory (legacy)
+# multipart/form-data ---> `file` part, other fields as form fields
+# any other content type ---> the raw body is the file, fields as query params and the
+#                             name from Content-Disposition: attachment; filename=<name>
+# Django's upload handlers spool multipart/raw files above FILE_UPLOAD_MAX_MEMORY_SIZE
+# to a temp file which is then streamed to S3 with a managed multipart upload
+UPLOAD_PARSER_CLASSES = [JSONParser, FormParser, MultiPartParser, FileUploadParser]
+
+
+class BinaryContentNegotiation(DefaultContentNegotiation):
+    """
+    Binary endpoints are requested with Accept headers e.g image/webp no renderer
+    matches, fall back to the default renderer (for errors) instead of a 406
+    """
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        try:
+            return super().select_renderer(request, renderers, format_suffix)
+        except exceptions.NotAcceptable:
+            return renderers[0], renderers[0].media_type
+
+
+# Initiate the storage backend (S3 unless FILE_STORAGE_BACKEND says otherwise)
+representative_s3_processor = get_storage_backend()
+# Whole file reads (images, bill PDFs ...) go through the local disk cache
+s3_object_cache = S3ObjectCache(representative_s3_processor)
+
+
+def get_upload_request_data(request) -> tuple[dict, object]:
+    """
+    Fields and file of an upload request in any of the UPLOAD_PARSER_CLASSES modes
+
+    Returns
+    -------
+    (fields, file) where file is an UploadedFile or the base64 string of a JSON upload.
+    For streamed files file_name/file_extension default to the uploaded file's
+    """
+    uploaded_file = request.FILES.get("file")
+    if uploaded_file is None:
+        return request.data, request.data.get("base64_encoding")
+
+    fields = {
+        **request.query_params.dict(),
+        **{key: value for key, value in request.data.items() if key != "file"},
+    }
+    fields.setdefault("file_name", uploaded_file.name)
+    fields.setdefault("file_extension", os.path.splitext(fields["file_name"])[1])
+    fields.setdefault("string_encoding_fmt", BINARY_BODY_ENCODING)
+    return fields, uploaded_file
 
 
 def file_upload_to_s3(
-    bucket_name: str, file_type: FileTypeEnum, file_name, base64encoding, **kwargs
+    bucket_name: str, file_type: FileTypeEnum, file_name, file_data, **kwargs
 ):
     """
     id :  Id of the representative
@@ -18,6 +121,7 @@ def file_upload_to_s3(
     file_name : If specified , the specific file in the specified directory is what will be looked for
             - Pass file name as blank to get all file in the directory
             - Otherwise it will suffix the file name to the directory
+    file_data : base64 string of the file or an (uploaded) file object to stream
     """
 
     id = kwargs.get("id")
@@ -30,9 +134,25 @@ def file_upload_to_s3(
     )
 
     try:
-        response = representative_s3_processor.upload_file(
-            base64encoding, bucket_name, file_name=dir, metadata=metadata
-        )
+        if isinstance(file_data, str):
+            # Files come in base64 encoded over JSON but are stored as raw bytes
+            response = representative_s3_processor.upload_file(
+                base64.b64decode(file_data),
+                bucket_name,
+                file_name=dir,
+                metadata=metadata,
+            )
+        else:
+            response = representative_s3_processor.upload_fileobj(
+                file_data,
+                bucket_name,
+                dir,
+                metadata=metadata,
+                size=getattr(file_data, "size", None),
+                content_type=getattr(file_data, "content_type", None),
+            )
+        if not response.get("error"):
+            invalidate_s3_caches(bucket_name, dir)
 
         # Use dir instead of full s3 url to allow for fetching
         # As at the time of writing there's no GetObject using s3 url , just bucket and key
@@ -43,54 +163,547 @@ def file_upload_to_s3(
         return {"error": e.__repr__()}
 
 
-def get_s3_folder_objects(bucket_name, dir, name_only=False):
-    logger.info(f"Fetching files bucket {bucket_name} in dir {dir}")
-    response = representative_s3_processor.get_bucket_file_list(bucket_name, dir)
-    logger.info(response)
+def _listing_generation_label(bucket_name, directory: str) -> str:
+    return f"s3_listing:{bucket_name}/{directory}"
+
+
+def invalidate_s3_caches(bucket_name, file_name):
+    """
+    Drops what is cached about an object after it is written.
+
+    Listings are cached against the generation of the directory their prefix is in
+    (e.g representatives/<id>/ for representatives/<id>/image), so every directory
+    above the key is bumped
+    """
+    # Other workers pick up the new object when their copy is revalidated
+    s3_object_cache.invalidate(bucket_name, file_name)
+
+    directories = [""] + [
+        file_name[: index + 1] for index, char in enumerate(file_name) if char == "/"
+    ]
+    for directory in directories:
+        bump_model_generation(_listing_generation_label(bucket_name, directory))
+
+
+def get_s3_folder_objects(
+    bucket_name, dir, name_only=False, delimiter: str | None = None
+):
+    """
+    Keys (without their top level folder) under <dir>, listed from S3 once and then
+    served from the cache until file_upload_to_s3 writes under <dir>
+
+    name_only : only the file names
+    delimiter : e.g "/" to leave out files in sub directories of <dir>
+    """
+    directory = dir[: dir.rfind("/") + 1]
+    cache_key = ":".join(
+        [
+            "s3_listing",
+            str(
+                get_model_generation(_listing_generation_label(bucket_name, directory))
+            ),
+            hashlib.md5(f"{bucket_name}/{dir}/{delimiter}".encode("utf-8")).hexdigest(),
+        ]
+    )
+
+    def list_folder():
+        logger.info(f"Fetching files bucket {bucket_name} in dir {dir}")
+        return representative_s3_processor.get_bucket_file_list(
+            bucket_name, dir, delimiter
+        )
+
+    response = get_or_compute(cache_key, list_folder, S3_LISTING_CACHE_TTL)
+
     # This will remove the file dir from S3 "Key" and return the name only
     if name_only:
         response = [x.split("/")[-1] for x in response]
     return response
 
 
-def get_s3_file_data(bucket_name, file_name):
-    logger.info(f"Fetching file : {file_name}")
-    response = representative_s3_processor.get_file(bucket_name, file_name)
-    logger.info(
-        f"get_s3_file_data S3 response --- >  {response}",
+def get_s3_file_etag(bucket_name, file_name) -> str | None:
+    """
+    S3 ETag of an object for conditional GETs, None if it doesn't exist.
+
+    Cached like listings i.e until file_upload_to_s3 writes under the object's directory,
+    so clients revalidating an unchanged file are answered without touching S3
+    """
+    directory = file_name[: file_name.rfind("/") + 1]
+    cache_key = ":".join(
+        [
+            "s3_etag",
+            str(
+                get_model_generation(_listing_generation_label(bucket_name, directory))
+            ),
+            hashlib.md5(f"{bucket_name}/{file_name}".encode("utf-8")).hexdigest(),
+        ]
     )
-    return response["Body"].read()
 
+    def head_etag():
+        try:
+            return representative_s3_processor.head_file(bucket_name, file_name)["ETag"]
+        except ClientError as e:
+            if e.response.get("ResponseMetadata", {}).get("HTTPStatusCode") == 404:
+                # Left to the file read to 404
+                return None
+            raise
 
-async def stream_s3_file_data(
-    bucket_name, file_name, start_KB: int | None = None, stop_KB: int | None = None
-):
+    return get_or_compute(cache_key, head_etag, S3_LISTING_CACHE_TTL)
+
+
+def get_s3_file_data(bucket_name, file_name, etag: str | None = None):
     """
-    Get a stream response of the requested file
+    Base64 encoding of the file (as returned in JSON responses) however it is stored.
+    Pass the <etag> sent with it so a stale copy in the local cache isn't paired with it
+    """
+    logger.info(f"Fetching file : {file_name}")
+    cached = s3_object_cache.get(bucket_name, file_name, etag=etag)
+    if get_body_encoding({"Metadata": cached.metadata}) == BINARY_BODY_ENCODING:
+        return base64.b64encode(cached.body)
+    return cached.body
+
+
+def get_s3_file_bytes(bucket_name, file_name, etag: str | None = None) -> bytes:
+    """
+    Raw bytes of the file however it is stored, <etag> as for get_s3_file_data
+    """
+    logger.info(f"Fetching file bytes : {file_name}")
+    cached = s3_object_cache.get(bucket_name, file_name, etag=etag)
+    if get_body_encoding({"Metadata": cached.metadata}) == BINARY_BODY_ENCODING:
+        return cached.body
+    return base64.b64decode(cached.body)
+
+
+def stream_s3_file_data(
+    bucket_name,
+    file_name,
+    start: int | None = None,
+    stop: int | None = None,
+    chunk_size: int = S3_STREAM_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """
+    Reads an S3 object (or a byte range of it) chunk by chunk
+    without holding all of it in memory
 
     Parameters
     ----------
     file_name: str
         Full file path of the file to read
-    start_KB: int
-        Kilobyte(s) from where to start, To start at the begining , pass 0.
-        Will be converted to bytes
-    stop_KB: int
-        Kilobyte(s) from where to stop. Will be converted to bytes
-
+    start: int
+        Byte from where to start, defaults to the beginning of the file
+    stop: int
+        Byte where to stop (inclusive), defaults to the end of the file
+    chunk_size: int
+        Size of the chunks read off the S3 body
 
     Returns
     -------
-    S3 stream object
-
+    Iterator of byte chunks
     """
-
-    if start_KB is None and stop_KB is None:
+    logger.info(
+        f"Streaming file : {file_name} [{start}-{stop}] in {chunk_size}B chunks"
+    )
+    if start is None and stop is None:
         response = representative_s3_processor.get_file(bucket_name, file_name)
     else:
         response = representative_s3_processor.get_file(
             bucket_name,
             file_name,
-            range="bytes={}-{}".format(start_KB * 1000, stop_KB * 1000),
+            range=f"bytes={start or 0}-{'' if stop is None else stop}",
         )
-    return response["Body"]
+    yield from response["Body"].iter_chunks(chunk_size)
+
+
+def get_s3_file_info(bucket_name, file_name) -> tuple[int, str]:
+    """
+    File size and body encoding of an S3 object, reads only its last 4 bytes
+
+    Returns
+    -------
+    (size, body_encoding) size being that of the raw file for base64 encoded objects
+    """
+    response = representative_s3_processor.get_file(
+        bucket_name, file_name, range="bytes=-4"
+    )
+    # ContentRange ---> bytes <start>-<end>/<total size>
+    object_size = int(response["ContentRange"].split("/")[-1])
+    body_encoding = get_body_encoding(response)
+    if body_encoding == BINARY_BODY_ENCODING:
+        return object_size, body_encoding
+
+    padding = response["Body"].read().count(b"=")
+    return object_size // 4 * 3 - padding, body_encoding
+
+
+def stream_s3_file_bytes(
+    bucket_name,
+    file_name,
+    start: int | None = None,
+    stop: int | None = None,
+    body_encoding: str | None = None,
+    chunk_size: int = S3_STREAM_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """
+    Raw bytes [start, stop] of an S3 object however it is stored
+
+    Base64 encoded (legacy) objects are decoded chunk by chunk and for ranges only
+    the base64 groups covering the range are fetched, memory use is bounded by the chunk size
+
+    Parameters
+    ----------
+    body_encoding [Optional]: str
+        From get_s3_file_info, saves a request for ranges if already known
+    """
+    if start is None and stop is None:
+        response = representative_s3_processor.get_file(bucket_name, file_name)
+        chunks = response["Body"].iter_chunks(chunk_size)
+        if get_body_encoding(response) == BINARY_BODY_ENCODING:
+            yield from chunks
+        else:
+            yield from iter_base64_decode(chunks)
+        return
+
+    if body_encoding is None:
+        _, body_encoding = get_s3_file_info(bucket_name, file_name)
+    if body_encoding == BINARY_BODY_ENCODING:
+        yield from stream_s3_file_data(
+            bucket_name, file_name, start, stop, chunk_size=chunk_size
+        )
+        return
+
+    start = start or 0
+    # Every 3 decoded bytes are 4 encoded bytes
+    encoded_start = start // 3 * 4
+    encoded_stop = None if stop is None else (stop // 3 + 1) * 4 - 1
+    skip = start % 3
+    remaining = None if stop is None else stop - start + 1
+
+    encoded_chunks = stream_s3_file_data(
+        bucket_name, file_name, encoded_start, encoded_stop, chunk_size=chunk_size
+    )
+    for chunk in iter_base64_decode(encoded_chunks):
+        if skip:
+            chunk, skip = chunk[skip:], max(skip - len(chunk), 0)
+        if remaining is not None:
+            chunk = chunk[:remaining]
+            remaining -= len(chunk)
+        if chunk:
+            yield chunk
+        if remaining == 0:
+            return
+
+
+async def iterate_in_thread(iterator: Iterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Async iterator over a blocking one e.g stream_s3_file_bytes
+
+    Every chunk is read in a worker thread so a slow S3 read never blocks the event loop.
+    The iterator is closed (releasing its S3 connection) if the client goes away
+    """
+    read_next = sync_to_async(next, thread_sensitive=False)
+    try:
+        while True:
+            chunk = await read_next(iterator, None)
+            if chunk is None:
+                return
+            yield chunk
+    finally:
+        if hasattr(iterator, "close"):
+            await sync_to_async(iterator.close, thread_sensitive=False)()
+
+
+def streaming_content(request, iterator: Iterator[bytes]):
+    """
+    Content for a StreamingHttpResponse that streams under both ASGI and WSGI.
+
+    Django reads a sync iterator into a list before serving it under ASGI
+    (and an async one before serving it under WSGI) i.e the whole file in memory
+    """
+    if isinstance(getattr(request, "_request", request), ASGIRequest):
+        return iterate_in_thread(iterator)
+    return iterator
+
+
+def convert_s3_object_to_binary(bucket_name, file_name) -> bool:
+    """
+    Rewrites a base64 encoded (legacy) object in place as raw bytes,
+    keeping its metadata
+
+    Returns
+    -------
+    True if converted, False if it was already stored as raw bytes.
+    Raises binascii.Error if the object isn't valid base64
+    """
+    response = representative_s3_processor.get_file(bucket_name, file_name)
+    if get_body_encoding(response) == BINARY_BODY_ENCODING:
+        return False
+
+    encoded_data = response["Body"].read()
+    file_data = base64.b64decode(b"".join(encoded_data.split()), validate=True)
+    upload_response = representative_s3_processor.upload_file(
+        file_data,
+        bucket_name,
+        file_name=file_name,
+        metadata=response.get("Metadata"),
+    )
+    if upload_response.get("error"):
+        raise Exception(upload_response["error"])
+    s3_object_cache.invalidate(bucket_name, file_name)
+
+    logger.info(
+        f"Converted {bucket_name}/{file_name} to binary {len(encoded_data)}B ---> {len(file_data)}B"
+    )
+    return True
+
+
+def parse_range_header(range_header: str, size: int) -> tuple[int, int] | None:
+    """
+    Single range of a HTTP Range header e.g bytes=0-99, bytes=100- or bytes=-100
+
+    Returns
+    -------
+    (start, stop) inclusive or None if the header should be ignored
+    (malformed or multiple ranges), the full file is served in that case.
+    Raises ValueError for ranges that can't be satisfied
+    """
+    unit, _, ranges = range_header.partition("=")
+    if unit.strip() != "bytes" or "," in ranges:
+        return None
+
+    first, _, last = ranges.strip().partition("-")
+    try:
+        if not first:
+            # Suffix range i.e the last <last> bytes
+            start, stop = max(size - int(last), 0), size - 1
+        else:
+            start = int(first)
+            stop = min(int(last), size - 1) if last else size - 1
+    except ValueError:
+        return None
+
+    if start > stop or start >= size:
+        raise ValueError(f"Range {range_header} not satisfiable for size {size}")
+    return start, stop
+
+
+def iter_base64_decode(chunks: Iterable[bytes | str]) -> Iterator[bytes]:
+    """
+    Incrementally decodes a base64 stream
+
+    Only whole 4 character groups are decoded per chunk, the remainder is carried
+    over to the next chunk. Whitespace/line breaks in the encoding are ignored
+    """
+    remainder = b""
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("ascii")
+        data = remainder + b"".join(chunk.split())
+        cut = len(data) - (len(data) % 4)
+        remainder = data[cut:]
+        if cut:
+            yield base64.b64decode(data[:cut])
+
+    if remainder:
+        raise ValueError("Truncated base64 stream")
+
+
+def _skip_json_separators(buffer: str, position: int) -> int:
+    while position < len(buffer) and (
+        buffer[position].isspace() or buffer[position] == ","
+    ):
+        position += 1
+    return position
+
+
+def _skip_json_whitespace(buffer: str, position: int) -> int:
+    while position < len(buffer) and buffer[position].isspace():
+        position += 1
+    return position
+
+
+def iter_json_items(
+    chunks: Iterable[bytes], encoding: str = "utf-8", ndjson: bool = False
+) -> Iterator[tuple[str | int, object]]:
+    """
+    Incrementally parses a JSON document from byte chunks
+
+    Supports a top level object, a top level array or newline delimited JSON.
+    Only the current item and a chunk are held in memory at any time
+
+    Parameters
+    ----------
+    chunks: Iterable[bytes]
+        Raw (decoded) file chunks
+    encoding: str
+        Text encoding of the file
+    ndjson: bool
+        Parse as newline delimited JSON i.e one item per line
+
+    Returns
+    -------
+    Iterator of (key, value) pairs for objects or (index, value) for arrays/NDJSON
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder(encoding)()
+    buffer = ""
+    position = 0
+    container = "" if ndjson else None  # "{", "[" or "" for NDJSON
+    index = 0
+
+    for chunk in itertools.chain(chunks, [None]):
+        final = chunk is None
+        buffer = buffer[position:] + text_decoder.decode(chunk or b"", final=final)
+        position = 0
+
+        while True:
+            position = _skip_json_separators(buffer, position)
+            if position >= len(buffer):
+                break
+
+            if container is None:
+                if buffer[position] not in "{[":
+                    raise ValueError("Expected a JSON object or array")
+                container = buffer[position]
+                position += 1
+                continue
+            if container and buffer[position] in "}]":
+                # End of the document, anything after it is ignored
+                return
+
+            start = position
+            try:
+                if container == "{":
+                    key, position = decoder.raw_decode(buffer, position)
+                    position = _skip_json_whitespace(buffer, position)
+                    if position >= len(buffer):
+                        raise json.JSONDecodeError("Incomplete item", buffer, position)
+                    if buffer[position] != ":":
+                        raise ValueError(f"Expected ':' after key {key}")
+                    position = _skip_json_whitespace(buffer, position + 1)
+                    value, position = decoder.raw_decode(buffer, position)
+                else:
+                    key = index
+                    value, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as e:
+                # Most likely the item continues in the next chunk
+                position = start
+                if final:
+                    raise ValueError(
+                        f"Invalid JSON item at <{buffer[start : start + 50]}>"
+                    ) from e
+                if len(buffer) - start > MAX_JSON_ITEM_SIZE:
+                    raise ValueError("JSON item exceeds the maximum item size") from e
+                break
+
+            # A number/literal right at the end of a chunk may be cut short e.g 12|3
+            if (
+                not final
+                and position >= len(buffer)
+                and not isinstance(value, (dict, list, str))
+            ):
+                position = start
+                break
+
+            index += 1
+            yield key, value
+
+
+def split_s3_url(file_url: str, default_bucket: str | None = None) -> tuple[str, str]:
+    """
+    s3://<bucket>/<key> ---> (bucket, key). Plain keys are paired with default_bucket
+    """
+    if file_url.startswith("s3://"):
+        bucket_name, _, file_name = file_url[len("s3://") :].partition("/")
+        return bucket_name, file_name
+    return default_bucket, file_url
+
+
+def get_s3_file_url(
+    bucket_name,
+    file_name,
+    file_type: FileTypeEnum,
+    content_disposition: str | None = None,
+) -> tuple[str, int]:
+    """
+    Presigned GET url of an S3 object, cached until shortly before it expires
+
+    Parameters
+    ----------
+    file_name: str
+        Full file path of the file
+    file_type: FileTypeEnum
+        Picks the url lifetime from PRESIGNED_URL_TTLS
+    content_disposition [Optional]: str
+        e.g attachment; filename="x.json" for downloads
+
+    Returns
+    -------
+    (url, expires_at) expires_at being a unix timestamp
+    """
+    url_key = (
+        "presigned_url:"
+        + hashlib.md5(
+            f"{bucket_name}:{file_name}:{content_disposition}".encode("utf-8")
+        ).hexdigest()
+    )
+    cached_url = cache.get(url_key)
+    if cached_url:
+        return cached_url["url"], cached_url["expires_at"]
+
+    expires_in = PRESIGNED_URL_TTLS[file_type]
+    url = representative_s3_processor.generate_presigned_url(
+        bucket_name, file_name, expires_in, content_disposition=content_disposition
+    )
+    expires_at = int(time.time()) + expires_in
+    cache.set(
+        url_key,
+        {"url": url, "expires_at": expires_at},
+        max(expires_in - PRESIGNED_URL_EXPIRY_MARGIN, 1),
+    )
+    return url, expires_at
+
+
+def get_file_delivery_mode(request) -> str:
+    delivery = request.GET.get("delivery", FILE_DELIVERY_MODE)
+    if delivery not in FILE_DELIVERY_MODES:
+        raise exceptions.ValidationError(
+            f"delivery <{delivery}> not supported, use one of {FILE_DELIVERY_MODES}"
+        )
+    return delivery
+
+
+def presigned_file_response(
+    request,
+    bucket_name,
+    file_name,
+    file_type: FileTypeEnum,
+    content_disposition: str | None = None,
+):
+    """
+    Response for the url/redirect delivery modes
+
+    Returns
+    -------
+    Response/HttpResponseRedirect or None when the file should be served inline
+    """
+    delivery = get_file_delivery_mode(request)
+    if delivery == "inline" or not representative_s3_processor.supports_presigned_urls:
+        # Local/in memory storage has no urls of its own
+        return None
+
+    url, expires_at = get_s3_file_url(
+        bucket_name, file_name, file_type, content_disposition=content_disposition
+    )
+    expires_in = expires_at - int(time.time())
+
+    if delivery == "redirect":
+        response = HttpResponseRedirect(url)
+    else:
+        response = Response(
+            {"data": {"url": url, "expires_in": expires_in}},
+            status=status.HTTP_200_OK,
+        )
+    # Keeps browsers and cache_page from holding on to an expired url
+    patch_cache_control(
+        response, private=True, max_age=max(expires_in - PRESIGNED_URL_EXPIRY_MARGIN, 0)
+    )
+    return response
@@ -0,0 +1,77 @@
+import hashlib
+import io
+import logging
+import os
+from typing import Iterator
+from PIL import Image, ImageOps
+
+logger = logging.getLogger("app_logger")
+
+# Square edge lengths (px) of the display image variants, smallest first
+DISPLAY_IMAGE_SIZES = tuple(
+    sorted(
+        int(size)
+        for size in os.environ.get("DISPLAY_IMAGE_SIZES", "64,128,256,512").split(",")
+    )
+)
+DISPLAY_IMAGE_QUALITY = int(os.environ.get("DISPLAY_IMAGE_QUALITY", "80"))
+# extension ---> (Pillow format, content type)
+DISPLAY_IMAGE_FORMATS = {
+    "webp": ("WEBP", "image/webp"),
+    "jpeg": ("JPEG", "image/jpeg"),
+}
+
+
+def image_version(image_data: bytes) -> str:
+    """
+    Content hash of an original image, variants of different originals never share a key
+    """
+    return hashlib.sha256(image_data).hexdigest()[:16]
+
+
+def image_variant_key(directory: str, version: str, size: int, extension: str) -> str:
+    return f"{directory}/variants/{version}/{size}.{extension}"
+
+
+def generate_image_variants(
+    image_data: bytes, sizes: tuple[int, ...] = DISPLAY_IMAGE_SIZES
+) -> Iterator[tuple[int, str, bytes]]:
+    """
+    Center cropped square variants of an image in every DISPLAY_IMAGE_FORMATS
+
+    Sizes larger than the original are skipped (no upscaling),
+    the smallest size is always generated
+
+    Yields
+    ------
+    (size, extension, data)
+    """
+    with Image.open(io.BytesIO(image_data)) as original:
+        # Phone photos are often stored sideways with an EXIF orientation
+        image = ImageOps.exif_transpose(original).convert("RGB")
+
+    largest_fit = min(image.size)
+    for size in sizes:
+        if size > largest_fit and size != sizes[0]:
+            continue
+
+        variant = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        for extension, (image_format, _) in DISPLAY_IMAGE_FORMATS.items():
+            buffer = io.BytesIO()
+            variant.save(
+                buffer,
+                format=image_format,
+                quality=DISPLAY_IMAGE_QUALITY,
+                optimize=True,
+            )
+            yield size, extension, buffer.getvalue()
+
+
+def best_fit_size(requested: int, sizes: list[int]) -> int:
+    """
+    Smallest available size covering <requested>, the largest one otherwise
+    """
+    for size in sorted(sizes):
+        if size >= requested:
+            return size
+    return max(sizes)
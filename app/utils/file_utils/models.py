@@ -20,6 +20,32 @@ class GenericFileUploadSerilizer(serializers.Serializer):
     string_encoding_fmt = serializers.CharField(default="utf-8")
 
 
+class GenericMultipartFileUploadSerializer(serializers.Serializer):
+    file_source = serializers.CharField(
+        required=False, help_text="Where the file was gotten from e.g Gok Site"
+    )
+    file_type = serializers.ChoiceField(choices=FileTypeTextChoices.choices)
+    file = serializers.FileField(
+        help_text="Streamed to S3, use for large files instead of base64_encoding"
+    )
+    file_name = serializers.CharField(
+        required=False, help_text="Defaults to the name of the uploaded file"
+    )
+
+
+class FileListPaginationSerializer(serializers.Serializer):
+    page = serializers.IntegerField(default=1)
+    items_per_page = serializers.IntegerField(default=10)
+
+
+class FileDeliverySerializer(serializers.Serializer):
+    delivery = serializers.ChoiceField(
+        required=False,
+        choices=["inline", "url", "redirect"],
+        help_text="inline returns the file, url a short lived S3 url, redirect a 302 to it",
+    )
+
+
 class GenericObjectResponse(serializers.Serializer):
     data = serializers.DictField()
 
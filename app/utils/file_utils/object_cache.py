@@ -0,0 +1,263 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import NamedTuple
+from botocore.exceptions import ClientError
+from prometheus_client import Counter, Gauge
+
+logger = logging.getLogger("app_logger")
+
+# Read-through cache of whole S3 objects on local disk.
+# Entries are served without asking S3 for S3_OBJECT_CACHE_TTL seconds, after that they are
+# revalidated with a conditional GET (If-None-Match: <etag>) which costs no transfer when
+# the object has not changed. The directory is bounded to S3_OBJECT_CACHE_MAX_SIZE bytes,
+# least recently used entries (oldest mtime, bumped on every hit) are evicted first.
+# Workers on a host can share the directory, entries are written atomically
+S3_OBJECT_CACHE_DIR = os.environ.get(
+    "S3_OBJECT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "s3_object_cache")
+)
+# 0 disables the cache
+S3_OBJECT_CACHE_MAX_SIZE = int(
+    os.environ.get("S3_OBJECT_CACHE_MAX_SIZE", str(256 * 1024 * 1024))
+)
+# Larger objects are passed through without being cached
+S3_OBJECT_CACHE_MAX_OBJECT_SIZE = int(
+    os.environ.get("S3_OBJECT_CACHE_MAX_OBJECT_SIZE", str(16 * 1024 * 1024))
+)
+S3_OBJECT_CACHE_TTL = int(os.environ.get("S3_OBJECT_CACHE_TTL", "300"))
+
+HIT = "hit"
+REVALIDATED = "revalidated"
+MISS = "miss"
+BYPASS = "bypass"
+
+object_cache_requests = Counter(
+    "s3_object_cache_requests_total",
+    "S3 object cache lookups by result (hit/revalidated/miss/bypass)",
+    ["result"],
+)
+object_cache_size = Gauge(
+    "s3_object_cache_size_bytes", "Bytes held in the local S3 object cache"
+)
+
+BODY_SUFFIX = ".body"
+META_SUFFIX = ".json"
+
+
+class CachedObject(NamedTuple):
+    body: bytes
+    metadata: dict
+    etag: str | None
+
+
+class S3ObjectCache:
+    def __init__(
+        self,
+        s3_processor,
+        directory: str = S3_OBJECT_CACHE_DIR,
+        max_size: int = S3_OBJECT_CACHE_MAX_SIZE,
+        max_object_size: int = S3_OBJECT_CACHE_MAX_OBJECT_SIZE,
+        ttl: int = S3_OBJECT_CACHE_TTL,
+    ):
+        self.s3_processor = s3_processor
+        self.directory = directory
+        self.max_size = max_size
+        self.max_object_size = min(max_object_size, max_size)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._stats = {HIT: 0, REVALIDATED: 0, MISS: 0, BYPASS: 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def _paths(self, bucket_name, file_name) -> tuple[str, str]:
+        digest = hashlib.sha256(f"{bucket_name}/{file_name}".encode("utf-8"))
+        base = os.path.join(self.directory, digest.hexdigest())
+        return base + BODY_SUFFIX, base + META_SUFFIX
+
+    def _record(self, result: str):
+        object_cache_requests.labels(result=result).inc()
+        with self._lock:
+            self._stats[result] += 1
+
+    def stats(self) -> dict:
+        """
+        Lookup counts of this process and the share served from disk
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        served = stats[HIT] + stats[REVALIDATED]
+        lookups = served + stats[MISS]
+        stats["hit_ratio"] = served / lookups if lookups else 0.0
+        return stats
+
+    def _read_entry(self, body_path, meta_path) -> tuple[dict | None, bytes | None]:
+        try:
+            with open(meta_path, "r") as meta_file:
+                meta = json.load(meta_file)
+            with open(body_path, "rb") as body_file:
+                body = body_file.read()
+        except (OSError, ValueError):
+            # Never cached, evicted or half written by another worker
+            return None, None
+        return meta, body
+
+    def _write_atomic(self, path, data: bytes):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _write_meta(self, meta_path, meta: dict):
+        self._write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+
+    def _touch(self, body_path):
+        try:
+            os.utime(body_path)
+        except OSError:
+            pass
+
+    def _store(self, body_path, meta_path, obj: CachedObject):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Body first, an entry only counts once its metadata exists
+            self._write_atomic(body_path, obj.body)
+            self._write_meta(
+                meta_path,
+                {
+                    "etag": obj.etag,
+                    "metadata": obj.metadata,
+                    "validated_at": time.time(),
+                },
+            )
+            self.evict()
+        except OSError as e:
+            # A full/read only disk shouldn't fail the request
+            logger.error(f"Unable to cache S3 object in {self.directory} :: {e}")
+
+    def evict(self):
+        """
+        Removes least recently used entries until the cache fits in max_size
+        """
+        entries = []
+        total = 0
+        with self._lock:
+            with os.scandir(self.directory) as dir_entries:
+                for entry in dir_entries:
+                    if not entry.name.endswith(BODY_SUFFIX):
+                        continue
+                    try:
+                        entry_stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append(
+                        (entry_stat.st_mtime, entry.path, entry_stat.st_size)
+                    )
+                    total += entry_stat.st_size
+
+            entries.sort()
+            for _, body_path, size in entries:
+                if total <= self.max_size:
+                    break
+                self._remove(body_path, body_path[: -len(BODY_SUFFIX)] + META_SUFFIX)
+                total -= size
+
+        object_cache_size.set(total)
+
+    def _remove(self, body_path, meta_path):
+        for path in (meta_path, body_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def invalidate(self, bucket_name, file_name):
+        """
+        Drops the cached copy of an object e.g after it is overwritten
+        """
+        self._remove(*self._paths(bucket_name, file_name))
+
+    def get(self, bucket_name, file_name, etag: str | None = None) -> CachedObject:
+        """
+        Body, metadata and ETag of an S3 object, from disk when possible
+
+        Parameters
+        ----------
+        bucket_name: str
+            Bucket to read from
+        file_name:str
+            Full file path of the file to read
+        etag: str | None
+            ETag the object is known to have (e.g get_s3_file_etag), a copy on disk
+            with another one is revalidated right away instead of served until its TTL
+
+        Returns
+        -------
+        CachedObject
+        """
+        if not self.enabled:
+            response = self.s3_processor.get_file(bucket_name, file_name)
+            self._record(BYPASS)
+            return CachedObject(
+                response["Body"].read(),
+                response.get("Metadata") or {},
+                response.get("ETag"),
+            )
+
+        body_path, meta_path = self._paths(bucket_name, file_name)
+        meta, body = self._read_entry(body_path, meta_path)
+
+        if (
+            meta is not None
+            and time.time() - meta["validated_at"] < self.ttl
+            and etag in (None, meta["etag"])
+        ):
+            self._touch(body_path)
+            self._record(HIT)
+            return CachedObject(body, meta["metadata"], meta["etag"])
+
+        try:
+            response = self.s3_processor.get_file(
+                bucket_name,
+                file_name,
+                if_none_match=meta.get("etag") if meta is not None else None,
+            )
+        except ClientError as e:
+            if (
+                meta is None
+                or e.response.get("ResponseMetadata", {}).get("HTTPStatusCode") != 304
+            ):
+                raise
+            # Not modified, keep serving the copy on disk
+            meta["validated_at"] = time.time()
+            try:
+                self._write_meta(meta_path, meta)
+            except OSError as write_error:
+                logger.error(
+                    f"Unable to revalidate cached {file_name} :: {write_error}"
+                )
+            self._touch(body_path)
+            self._record(REVALIDATED)
+            return CachedObject(body, meta["metadata"], meta["etag"])
+
+        obj = CachedObject(
+            response["Body"].read(),
+            response.get("Metadata") or {},
+            response.get("ETag"),
+        )
+        if len(obj.body) <= self.max_object_size:
+            self._store(body_path, meta_path, obj)
+            self._record(MISS)
+        else:
+            self._record(BYPASS)
+        return obj
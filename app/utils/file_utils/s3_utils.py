@@ -1,37 +1,88 @@
+import base64
+import hashlib
 import logging
-import re
+import mimetypes
 import boto3
 import os
-import sys
 import threading
 import dotenv
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
-from utils.enum_utils import FileTypeEnum
+from utils.file_utils.storage import (
+    BASE64_BODY_ENCODING,
+    BINARY_BODY_ENCODING,
+    BODY_ENCODING_METADATA_KEY,
+    StorageBackend,
+)
 
 dotenv.load_dotenv()
 logger = logging.getLogger("app_logger")
 
 
+# Managed (multipart) transfers for streamed uploads.
+# Files above the threshold go up in parts of S3_MULTIPART_CHUNK_SIZE, S3_MAX_CONCURRENCY at a time
+# so memory use is bounded by chunk size * concurrency whatever the file size
+S3_MULTIPART_THRESHOLD = int(
+    os.environ.get("S3_MULTIPART_THRESHOLD", str(8 * 1024 * 1024))
+)
+S3_MULTIPART_CHUNK_SIZE = int(
+    os.environ.get("S3_MULTIPART_CHUNK_SIZE", str(8 * 1024 * 1024))
+)
+S3_MAX_CONCURRENCY = int(os.environ.get("S3_MAX_CONCURRENCY", "4"))
+
+# One client (and its connection pool) is shared by every thread of a worker.
+# The pool has to cover the transfer threads and the export fetches running at once
+# or requests queue for a connection
+S3_MAX_POOL_CONNECTIONS = int(os.environ.get("S3_MAX_POOL_CONNECTIONS", "32"))
+S3_MAX_ATTEMPTS = int(os.environ.get("S3_MAX_ATTEMPTS", "3"))
+S3_CONNECT_TIMEOUT = int(os.environ.get("S3_CONNECT_TIMEOUT", "5"))
+S3_READ_TIMEOUT = int(os.environ.get("S3_READ_TIMEOUT", "30"))
+
+
+def get_body_encoding(s3_response) -> str:
+    """
+    binary/base64 from the Metadata of a get_object/head_object response
+    """
+    return (s3_response.get("Metadata") or {}).get(
+        BODY_ENCODING_METADATA_KEY, BASE64_BODY_ENCODING
+    )
+
+
 class ProgressPercentage(object):
-    def __init__(self, filename):
+    """
+    Transfer callback logging progress every PROGRESS_LOG_STEP percent.
+    Called from the transfer threads, one instance per file
+    """
+
+    PROGRESS_LOG_STEP = 10
+
+    def __init__(self, filename, size: int | None = None):
         self._filename = filename
-        self._size = float(os.path.getsize(filename))
+        # Size of a local file unless given e.g for in flight uploads
+        self._size = float(size if size is not None else os.path.getsize(filename))
         self._seen_so_far = 0
+        self._logged_step = -1
         self._lock = threading.Lock()
 
     def __call__(self, bytes_amount):
         # To simplify, assume this is hooked up to a single filename
         with self._lock:
             self._seen_so_far += bytes_amount
-            percentage = (self._seen_so_far / self._size) * 100
-            sys.stdout.write(
-                "\r%s  %s / %s  (%.2f%%)"
-                % (self._filename, self._seen_so_far, self._size, percentage)
-            )
-            sys.stdout.flush()
+            percentage = (self._seen_so_far / self._size) * 100 if self._size else 100.0
+            step = int(percentage // self.PROGRESS_LOG_STEP)
+            if step > self._logged_step:
+                self._logged_step = step
+                logger.info(
+                    "%s  %s / %s  (%.2f%%)"
+                    % (self._filename, self._seen_so_far, self._size, percentage)
+                )
 
 
-class S3Processor:
+class S3Processor(StorageBackend):
+    supports_presigned_urls = True
+
     def __init__(self):
         self.region = os.environ.get("S3_BUCKET_REGION")
         self.s3_client = boto3.client(
@@ -39,63 +90,16 @@ class S3Processor:
             aws_access_key_id=os.environ.get("AWS_ACCESS_KEY_ID"),
             aws_secret_access_key=os.environ.get("AWS_SECRET_ACCESS_KEY"),
             region_name=self.region,
+            # Endpoint of an S3 compatible store e.g minio, AWS when unset
+            endpoint_url=os.environ.get("S3_ENDPOINT_URL") or None,
+            config=Config(
+                max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+                connect_timeout=S3_CONNECT_TIMEOUT,
+                read_timeout=S3_READ_TIMEOUT,
+                retries={"max_attempts": S3_MAX_ATTEMPTS, "mode": "standard"},
+            ),
         )
 
-    def compute_s3_file_directory(
-        self,
-        file_type: FileTypeEnum,
-        folder: str,
-        file_name: str | None = None,
-        id: str | None = None,
-        house: str | None = None,
-    ):
-        """
-        Based on the params passed it will compute the directory/filepath
-        to get file(s) or add file(s)
-
-        Parameters
-        ----------
-        file_type : str
-            String of <class FileTypeEnum> do determine where the file goes
-
-        file_name [Optional]:
-                Name of the file. Will determine which file to save or get.
-                If set to ALL during fetch with an ID specified, it will
-                fetch all files in the directory
-
-        id [Optional]:str
-            Id of the the item (Mostly models)
-
-        house [Optional]: str
-            If passed will be paired with file type to get/put a file
-
-        Returns
-        --------
-        string of the s3 file/directory path
-
-        """
-
-        logger.info(
-            f"Computing file dir for type:{file_type}, name:{file_name} : id {id}, house : {house}"
-        )
-        match file_type:
-            case FileTypeEnum.ALL:
-                return f"{folder}/{id}/"
-            case FileTypeEnum.IMAGE:
-                return f"{folder}/{id}/images/" + file_name
-            case FileTypeEnum.CASE:
-                return f"{folder}/{id}/cases/" + file_name
-            case FileTypeEnum.MANIFESTO:
-                return f"{folder}/{id}/manifestos/" + file_name
-            case FileTypeEnum.BILL:
-                return f"bills/{house}/{folder}/" + file_name
-            case FileTypeEnum.PROCEEDING:
-                # Folder will be the the proceeding date
-                return f"proceedings/{house}/{folder}/" + file_name
-            case FileTypeEnum.VOTE:
-                # Folder will be the bill title/name
-                return f"votes/{house}/{folder}/" + file_name
-
     def create_bucket(self, bucket_name, region=None):
         """
         Create an S3 bucket
@@ -132,19 +136,21 @@ class S3Processor:
 
     def upload_file(
         self,
-        base64encoding_of_the_the_file,
+        file_data: bytes | str,
         bucket,
         file_name=None,
         metadata=None,
         monitor_progress: bool = False,
+        content_type: str | None = None,
     ):
         """
         Upload a file to an S3 bucket
 
         Parameters
         ----------
-        base64encoding_of_the_the_file: str
-            Base64 encoding of the file
+        file_data: bytes | str
+            Raw bytes of the file, stored as is with ContentType, ContentLength
+            and a SHA256 checksum. A str is taken to be a (legacy) base64 encoding
         bucket:str
             Bucket to upload to
         file_name:str
@@ -152,6 +158,8 @@ class S3Processor:
         metadata: dict
             All metadata you need to add to the file.
             Ideally anything that allows referencing e.g. file sources etc.
+        content_type [Optional]: str
+            Guessed from the file name if not passed
 
         Return:
             S3 upload resposne or ClientError
@@ -162,22 +170,36 @@ class S3Processor:
             if metadata is None:
                 metadata = {}
 
+            object_params = {}
+            if isinstance(file_data, bytes):
+                metadata = {
+                    **metadata,
+                    BODY_ENCODING_METADATA_KEY: BINARY_BODY_ENCODING,
+                }
+                object_params = {
+                    "ContentType": content_type
+                    or mimetypes.guess_type(file_name or "")[0]
+                    or "application/octet-stream",
+                    "ContentLength": len(file_data),
+                    # Verified by S3 on upload and kept with the object
+                    "ChecksumSHA256": base64.b64encode(
+                        hashlib.sha256(file_data).digest()
+                    ).decode("utf-8"),
+                }
+
             response = self.s3_client.put_object(
                 # ACL='private'|'public-read'|'public-read-write'|'authenticated-read'|'aws-exec-read'|'bucket-owner-read'|'bucket-owner-full-control',
-                Body=base64encoding_of_the_the_file,
+                Body=file_data,
                 Bucket=bucket,
                 # CacheControl='string',
                 # ContentDisposition='string',
                 # ContentEncoding='string',
                 # ContentLanguage='string',
-                # ContentLength=123,
                 # ContentMD5='string',
-                # ContentType='string',
                 # ChecksumAlgorithm='CRC32'|'CRC32C'|'SHA1'|'SHA256',
                 # ChecksumCRC32='string',
                 # ChecksumCRC32C='string',
                 # ChecksumSHA1='string',
-                # ChecksumSHA256='string',
                 # Expires=datetime(2015, 1, 1),
                 # GrantFullControl='string',
                 # GrantRead='string',
@@ -199,6 +221,7 @@ class S3Processor:
                 # ObjectLockRetainUntilDate=datetime(2015, 1, 1),
                 # ObjectLockLegalHoldStatus='ON'|'OFF',
                 # ExpectedBucketOwner='string'
+                **object_params,
             )
 
             logger.info(f"File upload for {file_name} ---> {response}")
@@ -215,10 +238,11 @@ class S3Processor:
                     == 200
                 ):
                     response = self.upload_file(
-                        base64encoding_of_the_the_file,
+                        file_data,
                         bucket,
                         file_name=file_name,
                         metadata=metadata,
+                        content_type=content_type,
                     )
                 else:
                     return bucket_creation_response
@@ -228,13 +252,90 @@ class S3Processor:
             logging.exception(e)
             return {"error": e.__repr__()}
 
+    def upload_fileobj(
+        self,
+        file_obj,
+        bucket,
+        file_name,
+        metadata=None,
+        size: int | None = None,
+        monitor_progress: bool = True,
+        content_type: str | None = None,
+    ):
+        """
+        Streams a file like object to an S3 bucket with a managed transfer
+
+        Objects above S3_MULTIPART_THRESHOLD are uploaded as a multipart upload,
+        the object is read a part at a time so it never has to fit in memory
+
+        Parameters
+        ----------
+        file_obj: file like
+            Opened in binary mode e.g an UploadedFile, stored as is
+        bucket:str
+            Bucket to upload to
+        file_name:str
+            File name (key) to assign on upload
+        metadata: dict
+            All metadata you need to add to the file.
+        size [Optional]: int
+            Size of the file, needed to report progress
+        content_type [Optional]: str
+            Guessed from the file name if not passed
+
+        Return:
+            head_object response of the uploaded object or {"error": ...}
+        """
+        logger.info(f"Initating managed file upload for :: {file_name} to {bucket}")
+        extra_args = {
+            "Metadata": {
+                **(metadata or {}),
+                BODY_ENCODING_METADATA_KEY: BINARY_BODY_ENCODING,
+            },
+            "ContentType": content_type
+            or mimetypes.guess_type(file_name)[0]
+            or "application/octet-stream",
+            # Checksummed per part and verified by S3
+            "ChecksumAlgorithm": "SHA256",
+        }
+        callback_func = None
+        if monitor_progress and size is not None:
+            callback_func = ProgressPercentage(file_name, size)
+
+        try:
+            self.s3_client.upload_fileobj(
+                file_obj,
+                bucket,
+                file_name,
+                ExtraArgs=extra_args,
+                Callback=callback_func,
+                Config=TransferConfig(
+                    multipart_threshold=S3_MULTIPART_THRESHOLD,
+                    multipart_chunksize=S3_MULTIPART_CHUNK_SIZE,
+                    max_concurrency=S3_MAX_CONCURRENCY,
+                ),
+            )
+            # upload_fileobj has no response of its own
+            response = self.s3_client.head_object(Bucket=bucket, Key=file_name)
+            logger.info(f"File upload for {file_name} ---> {response}")
+            return response
+        except (ClientError, S3UploadFailedError) as e:
+            logging.exception(e)
+            return {"error": e.__repr__()}
+
     def update_file():
         return NotImplemented
 
     def remove_file(self):
         return NotImplemented
 
-    def get_file(self, bucket_name, obj_name, range: str | None = None):
+    def get_file(
+        self,
+        bucket_name,
+        obj_name,
+        range: str | None = None,
+        if_none_match: str | None = None,
+    ):
         """
         Get a stream response of the requested file
 
@@ -247,6 +348,9 @@ class S3Processor:
         range [Optional]: str
             Contains the range of bytes to get
             If not specified will, default retreaving the entire file at one go.
+        if_none_match [Optional]: str
+            ETag of a copy held by the caller, a ClientError (304) is raised
+            instead of sending the object again if it still matches
 
 
         Returns
@@ -254,71 +358,84 @@ class S3Processor:
         S3 stream or file object
 
         """
+        params = {"Bucket": bucket_name, "Key": obj_name}
         if range:
             # For streaming
-            response = self.s3_client.get_object(
-                Bucket=bucket_name, Key=obj_name, Range=range
-            )
-        else:
-            response = self.s3_client.get_object(Bucket=bucket_name, Key=obj_name)
-        return response
+            params["Range"] = range
+        if if_none_match:
+            params["IfNoneMatch"] = if_none_match
+        return self.s3_client.get_object(**params)
 
-    def get_bucket_file_list(self, bucket_name, directory: str | None = None):
+    def head_file(self, bucket_name, obj_name):
+        """
+        Metadata, ETag, ContentLength ... of an object without its body
+        """
+        return self.s3_client.head_object(Bucket=bucket_name, Key=obj_name)
+
+    def generate_presigned_url(
+        self,
+        bucket_name,
+        obj_name,
+        expires_in: int,
+        content_disposition: str | None = None,
+    ):
         """
+        Short lived GET url for an object, lets clients download straight from S3
+
         Parameters
         ----------
-        bucket_name : str
-            Bucket to search
-        file_type : str
-            Allows you to select which files about the rep you want to retrive
-            Will determine which directories will be searched
-            If set to ALL, for a path containing images/, manifestos/, cases/; All files
-            in all directories will be returned with the respective directories prefixed
-            e.g
-            [
-                "images/test.jpg",
-                ...
-                "cases/DPP_2022_Fetilizer.pdf",
-                ...
-            ]
-
+        bucket_name: str
+            Bucket to read from
+        obj_name:str
+            Full file path of the file
+        expires_in: int
+            Seconds the url stays valid
+        content_disposition [Optional]: str
+            Content-Disposition S3 should respond with e.g attachment; filename="x.json"
 
         Returns
         -------
-        files : List[str]
-            List of files as per specifed paths
+        Presigned url string
         """
-        objects_list = self.s3_client.list_objects_v2(
-            Bucket=bucket_name, Prefix=directory
-        ).get("Contents")
-        res = []
-        # Iterate over every object in bucket
-        if objects_list:
-            for obj in objects_list:
-                res.append(re.search("(?<=\\/).*$", obj["Key"]).group(0))
-
-        return res
-
-    def get_bucket_contents(self, bucket_name, directory: str | None = None):
-        objects_list = self.s3_client.list_objects_v2(
-            Bucket=bucket_name, Prefix=directory
-        ).get("Contents")
-
-        res = []
-
-        # Iterate over every object in bucket
-        for obj in objects_list:
-            # Read an object from the bucket
-            response = self.s3_client.get_object(Bucket=bucket_name, Key=obj["Key"])
-            res.append(
-                {
-                    "file": obj["Key"],
-                    "metadata": response["Metadata"],
-                    "body": response["Body"],
-                }
-            )
+        params = {"Bucket": bucket_name, "Key": obj_name}
+        if content_disposition:
+            params["ResponseContentDisposition"] = content_disposition
 
-        return res
+        return self.s3_client.generate_presigned_url(
+            "get_object", Params=params, ExpiresIn=expires_in
+        )
+
+    def iter_bucket_objects(
+        self,
+        bucket_name,
+        directory: str | None = None,
+        delimiter: str | None = None,
+    ):
+        """
+        Lazily lists every object under a prefix, following continuation tokens
+        a page (up to 1000 keys) at a time
+
+        Parameters
+        ----------
+        bucket_name : str
+            Bucket to search
+        directory [Optional]: str
+            Key prefix to list
+        delimiter [Optional]: str
+            e.g "/" to skip objects in "sub directories" of the prefix
+
+        Yields
+        ------
+        list_objects_v2 object dicts (Key, Size, ETag, LastModified ...)
+        """
+        params = {"Bucket": bucket_name}
+        if directory:
+            params["Prefix"] = directory
+        if delimiter:
+            params["Delimiter"] = delimiter
+
+        for page in self.s3_client.get_paginator("list_objects_v2").paginate(**params):
+            yield from page.get("Contents", [])
 
     def download_file(self, bucket_name, object_name, monitor_progress: bool = True):
         if monitor_progress:
@@ -0,0 +1,549 @@
+import datetime
+import hashlib
+import io
+import json
+import logging
+import mimetypes
+import os
+import shutil
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from typing import Iterator
+from botocore.exceptions import ClientError
+from django.conf import settings
+from django.utils.module_loading import import_string
+from utils.enum_utils import FileTypeEnum
+
+logger = logging.getLogger("app_logger")
+
+# FILE_STORAGE_BACKEND setting ---> backend class, a dotted path works as well
+STORAGE_BACKENDS = {
+    "s3": "utils.file_utils.s3_utils.S3Processor",
+    "local": "utils.file_utils.storage.LocalStorageBackend",
+    "memory": "utils.file_utils.storage.InMemoryStorageBackend",
+}
+
+# Objects are stored as raw bytes tagged with body_encoding=binary in their metadata.
+# Older objects have no tag and hold the base64 encoding of the file
+BODY_ENCODING_METADATA_KEY = "body_encoding"
+BINARY_BODY_ENCODING = "binary"
+BASE64_BODY_ENCODING = "base64"
+
+
+def get_storage_backend():
+    """
+    Storage backend selected by the FILE_STORAGE_BACKEND setting (s3 by default)
+    """
+    backend = getattr(settings, "FILE_STORAGE_BACKEND", "s3")
+    logger.info(f"Using {backend} file storage")
+    return import_string(STORAGE_BACKENDS.get(backend, backend))()
+
+
+class StorageBackend(ABC):
+    """
+    Everything file endpoints read/write goes through one of these.
+
+    Responses have the shape of the boto3 S3 ones, get_file returns
+    {"Body", "Metadata", "ETag", "ContentLength", "ContentRange", "LastModified" ...}
+    and missing keys, unsatisfiable ranges and matched If-None-Match are raised as
+    botocore ClientErrors (NoSuchKey, InvalidRange, 304), so callers work the same
+    against every backend
+    """
+
+    supports_presigned_urls = False
+
+    def compute_s3_file_directory(
+        self,
+        file_type: FileTypeEnum,
+        folder: str,
+        file_name: str | None = None,
+        id: str | None = None,
+        house: str | None = None,
+    ):
+        """
+        Based on the params passed it will compute the directory/filepath
+        to get file(s) or add file(s)
+
+        Parameters
+        ----------
+        file_type : str
+            String of <class FileTypeEnum> do determine where the file goes
+
+        file_name [Optional]:
+                Name of the file. Will determine which file to save or get.
+                If set to ALL during fetch with an ID specified, it will
+                fetch all files in the directory
+
+        id [Optional]:str
+            Id of the the item (Mostly models)
+
+        house [Optional]: str
+            If passed will be paired with file type to get/put a file
+
+        Returns
+        --------
+        string of the s3 file/directory path
+
+        """
+
+        logger.info(
+            f"Computing file dir for type:{file_type}, name:{file_name} : id {id}, house : {house}"
+        )
+        match file_type:
+            case FileTypeEnum.ALL:
+                return f"{folder}/{id}/"
+            case FileTypeEnum.IMAGE:
+                return f"{folder}/{id}/images/" + file_name
+            case FileTypeEnum.CASE:
+                return f"{folder}/{id}/cases/" + file_name
+            case FileTypeEnum.MANIFESTO:
+                return f"{folder}/{id}/manifestos/" + file_name
+            case FileTypeEnum.BILL:
+                return f"bills/{house}/{folder}/" + file_name
+            case FileTypeEnum.PROCEEDING:
+                # Folder will be the the proceeding date
+                return f"proceedings/{house}/{folder}/" + file_name
+            case FileTypeEnum.VOTE:
+                # Folder will be the bill title/name
+                return f"votes/{house}/{folder}/" + file_name
+
+    @abstractmethod
+    def upload_file(
+        self,
+        file_data: bytes | str,
+        bucket,
+        file_name=None,
+        metadata=None,
+        monitor_progress: bool = False,
+        content_type: str | None = None,
+    ):
+        raise NotImplementedError
+
+    @abstractmethod
+    def upload_fileobj(
+        self,
+        file_obj,
+        bucket,
+        file_name,
+        metadata=None,
+        size: int | None = None,
+        monitor_progress: bool = True,
+        content_type: str | None = None,
+    ):
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_file(
+        self,
+        bucket_name,
+        obj_name,
+        range: str | None = None,
+        if_none_match: str | None = None,
+    ):
+        raise NotImplementedError
+
+    @abstractmethod
+    def head_file(self, bucket_name, obj_name):
+        raise NotImplementedError
+
+    def generate_presigned_url(
+        self,
+        bucket_name,
+        obj_name,
+        expires_in: int,
+        content_disposition: str | None = None,
+    ):
+        # Optional, only called on backends with supports_presigned_urls
+        raise NotImplementedError("Presigned urls are only available on S3")
+
+    @abstractmethod
+    def iter_bucket_objects(
+        self,
+        bucket_name,
+        directory: str | None = None,
+        delimiter: str | None = None,
+    ) -> Iterator[dict]:
+        raise NotImplementedError
+
+    def get_bucket_file_list(
+        self,
+        bucket_name,
+        directory: str | None = None,
+        delimiter: str | None = None,
+    ):
+        """
+        Parameters
+        ----------
+        bucket_name : str
+            Bucket to search
+        file_type : str
+            Allows you to select which files about the rep you want to retrive
+            Will determine which directories will be searched
+            If set to ALL, for a path containing images/, manifestos/, cases/; All files
+            in all directories will be returned with the respective directories prefixed
+            e.g
+            [
+                "images/test.jpg",
+                ...
+                "cases/DPP_2022_Fetilizer.pdf",
+                ...
+            ]
+        delimiter [Optional]: str
+            e.g "/" to skip objects in "sub directories" of the prefix
+
+
+        Returns
+        -------
+        files : List[str]
+            List of files as per specifed paths
+        """
+        # Keys without their top level folder
+        return [
+            obj["Key"].partition("/")[2]
+            for obj in self.iter_bucket_objects(bucket_name, directory, delimiter)
+        ]
+
+    def get_bucket_contents(self, bucket_name, directory: str | None = None):
+        res = []
+
+        # Iterate over every object in bucket
+        for obj in self.iter_bucket_objects(bucket_name, directory):
+            # Read an object from the bucket
+            response = self.get_file(bucket_name, obj["Key"])
+            res.append(
+                {
+                    "file": obj["Key"],
+                    "metadata": response["Metadata"],
+                    "body": response["Body"],
+                }
+            )
+
+        return res
+
+
+def _client_error(code: str, message: str, status_code: int, operation: str):
+    return ClientError(
+        {
+            "Error": {"Code": code, "Message": message},
+            "ResponseMetadata": {"HTTPStatusCode": status_code},
+        },
+        operation,
+    )
+
+
+def _parse_byte_range(range: str, size: int) -> tuple[int, int]:
+    # bytes=<start>-<end> | bytes=<start>- | bytes=-<suffix length>, as S3 reads them
+    try:
+        start, _, end = range.split("=", 1)[1].strip().partition("-")
+        if start:
+            start, end = int(start), int(end) if end else size - 1
+        else:
+            start, end = max(size - int(end), 0), size - 1
+    except (IndexError, ValueError):
+        start, end = 0, -1
+
+    if start >= size or start > end:
+        raise _client_error(
+            "InvalidRange", "The requested range is not satisfiable", 416, "GetObject"
+        )
+    return start, min(end, size - 1)
+
+
+class StoredBody:
+    """
+    Stand in for botocore's StreamingBody over a local file object
+    """
+
+    def __init__(self, file_obj, length: int):
+        self._file_obj = file_obj
+        self._remaining = length
+
+    def read(self, amt: int | None = None) -> bytes:
+        if amt is None or amt > self._remaining:
+            amt = self._remaining
+        if not amt:
+            return b""
+        data = self._file_obj.read(amt)
+        self._remaining -= len(data)
+        if not self._remaining:
+            self.close()
+        return data
+
+    def iter_chunks(self, chunk_size: int = 1024) -> Iterator[bytes]:
+        while chunk := self.read(chunk_size):
+            yield chunk
+
+    def close(self):
+        self._file_obj.close()
+
+
+class _FileStorageBackend(StorageBackend):
+    """
+    Object semantics of S3 (metadata, ETags, ranges, prefix listings) on top of
+    _write/_open/_records, used to run the file endpoints without S3
+    """
+
+    @abstractmethod
+    def _write(self, bucket_name, obj_name, file_obj, record: dict) -> dict:
+        """
+        Stores <file_obj> and returns <record> with its size and etag
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def _open(self, bucket_name, obj_name) -> tuple[object, dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _records(self, bucket_name) -> Iterator[tuple[str, dict]]:
+        raise NotImplementedError
+
+    def _put(self, bucket, file_name, file_obj, metadata, content_type) -> dict:
+        record = self._write(
+            bucket,
+            file_name,
+            file_obj,
+            {
+                "metadata": metadata,
+                "content_type": content_type
+                or mimetypes.guess_type(file_name)[0]
+                or "application/octet-stream",
+                "last_modified": datetime.datetime.now(datetime.UTC).timestamp(),
+            },
+        )
+        logger.info(f"File upload for {file_name} ---> {record}")
+        return {
+            "ResponseMetadata": {"HTTPStatusCode": 200},
+            "ETag": record["etag"],
+        }
+
+    def upload_file(
+        self,
+        file_data: bytes | str,
+        bucket,
+        file_name=None,
+        metadata=None,
+        monitor_progress: bool = False,
+        content_type: str | None = None,
+    ):
+        metadata = dict(metadata or {})
+        if isinstance(file_data, bytes):
+            metadata[BODY_ENCODING_METADATA_KEY] = BINARY_BODY_ENCODING
+        else:
+            # Legacy base64 upload, stored as is like S3Processor does
+            file_data = file_data.encode("utf-8")
+            content_type = content_type or "binary/octet-stream"
+        return self._put(
+            bucket, file_name, io.BytesIO(file_data), metadata, content_type
+        )
+
+    def upload_fileobj(
+        self,
+        file_obj,
+        bucket,
+        file_name,
+        metadata=None,
+        size: int | None = None,
+        monitor_progress: bool = True,
+        content_type: str | None = None,
+    ):
+        self._put(
+            bucket,
+            file_name,
+            file_obj,
+            {**(metadata or {}), BODY_ENCODING_METADATA_KEY: BINARY_BODY_ENCODING},
+            content_type,
+        )
+        return self.head_file(bucket, file_name)
+
+    def _response(self, record: dict, **fields) -> dict:
+        return {
+            "ResponseMetadata": {"HTTPStatusCode": 200},
+            "Metadata": dict(record["metadata"]),
+            "ETag": record["etag"],
+            "ContentLength": record["size"],
+            "ContentType": record["content_type"],
+            "LastModified": datetime.datetime.fromtimestamp(
+                record["last_modified"], datetime.UTC
+            ),
+            **fields,
+        }
+
+    def head_file(self, bucket_name, obj_name):
+        file_obj, record = self._open(bucket_name, obj_name)
+        file_obj.close()
+        return self._response(record)
+
+    def get_file(
+        self,
+        bucket_name,
+        obj_name,
+        range: str | None = None,
+        if_none_match: str | None = None,
+    ):
+        file_obj, record = self._open(bucket_name, obj_name)
+        if if_none_match and if_none_match == record["etag"]:
+            file_obj.close()
+            raise _client_error("304", "Not Modified", 304, "GetObject")
+
+        if not range:
+            return self._response(record, Body=StoredBody(file_obj, record["size"]))
+
+        try:
+            start, end = _parse_byte_range(range, record["size"])
+        except ClientError:
+            file_obj.close()
+            raise
+        file_obj.seek(start)
+        response = self._response(
+            record,
+            Body=StoredBody(file_obj, end - start + 1),
+            ContentLength=end - start + 1,
+            ContentRange=f"bytes {start}-{end}/{record['size']}",
+        )
+        response["ResponseMetadata"]["HTTPStatusCode"] = 206
+        return response
+
+    def iter_bucket_objects(
+        self,
+        bucket_name,
+        directory: str | None = None,
+        delimiter: str | None = None,
+    ) -> Iterator[dict]:
+        directory = directory or ""
+        # S3 lists keys in lexicographic order
+        for obj_name, record in sorted(self._records(bucket_name)):
+            if not obj_name.startswith(directory):
+                continue
+            if delimiter and delimiter in obj_name[len(directory) :]:
+                continue
+            yield {
+                "Key": obj_name,
+                "Size": record["size"],
+                "ETag": record["etag"],
+                "LastModified": datetime.datetime.fromtimestamp(
+                    record["last_modified"], datetime.UTC
+                ),
+            }
+
+
+def _no_such_key(obj_name):
+    return _client_error(
+        "NoSuchKey", f"The specified key does not exist: {obj_name}", 404, "GetObject"
+    )
+
+
+def _copy_with_etag(file_obj, destination) -> tuple[int, str]:
+    md5 = hashlib.md5()
+    size = 0
+    while chunk := file_obj.read(1024 * 1024):
+        md5.update(chunk)
+        destination.write(chunk)
+        size += len(chunk)
+    return size, f'"{md5.hexdigest()}"'
+
+
+class LocalStorageBackend(_FileStorageBackend):
+    """
+    Objects as files under <root>/<bucket>/<key>, their metadata in
+    <root>/.metadata/<bucket>/<key>.json
+    """
+
+    METADATA_DIR = ".metadata"
+
+    def __init__(self, root: str | None = None):
+        self.root = os.path.abspath(
+            root or getattr(settings, "FILE_STORAGE_ROOT", "file_storage")
+        )
+
+    def _path(self, *parts) -> str:
+        path = os.path.abspath(os.path.join(self.root, *[str(part) for part in parts]))
+        # Keys like ../../etc/passwd stay in the root
+        if not path.startswith(self.root + os.sep):
+            raise ValueError(f"Invalid key {parts[-1]}")
+        return path
+
+    def _paths(self, bucket_name, obj_name) -> tuple[str, str]:
+        return (
+            self._path(bucket_name, obj_name),
+            self._path(self.METADATA_DIR, bucket_name, f"{obj_name}.json"),
+        )
+
+    def _write(self, bucket_name, obj_name, file_obj, record: dict) -> dict:
+        data_path, record_path = self._paths(bucket_name, obj_name)
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+        os.makedirs(os.path.dirname(record_path), exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(data_path), prefix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                record["size"], record["etag"] = _copy_with_etag(file_obj, tmp_file)
+            with open(record_path, "w") as record_file:
+                json.dump(record, record_file)
+            os.replace(tmp_path, data_path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return record
+
+    def _open(self, bucket_name, obj_name):
+        data_path, record_path = self._paths(bucket_name, obj_name)
+        try:
+            with open(record_path, "r") as record_file:
+                record = json.load(record_file)
+            return open(data_path, "rb"), record
+        except FileNotFoundError:
+            raise _no_such_key(obj_name)
+
+    def _records(self, bucket_name):
+        bucket_root = self._path(self.METADATA_DIR, bucket_name)
+        for directory, _, file_names in os.walk(bucket_root):
+            for file_name in file_names:
+                record_path = os.path.join(directory, file_name)
+                obj_name = os.path.relpath(record_path, bucket_root)[: -len(".json")]
+                try:
+                    with open(record_path, "r") as record_file:
+                        yield obj_name.replace(os.sep, "/"), json.load(record_file)
+                except (OSError, ValueError):
+                    # Removed or being written
+                    continue
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+class InMemoryStorageBackend(_FileStorageBackend):
+    """
+    Objects in a dict of this process, for tests and benchmarks
+    """
+
+    def __init__(self):
+        self._objects: dict[tuple[str, str], tuple[bytes, dict]] = {}
+        self._lock = threading.Lock()
+
+    def _write(self, bucket_name, obj_name, file_obj, record: dict) -> dict:
+        buffer = io.BytesIO()
+        record["size"], record["etag"] = _copy_with_etag(file_obj, buffer)
+        with self._lock:
+            self._objects[(str(bucket_name), obj_name)] = (buffer.getvalue(), record)
+        return record
+
+    def _open(self, bucket_name, obj_name):
+        try:
+            data, record = self._objects[(str(bucket_name), obj_name)]
+        except KeyError:
+            raise _no_such_key(obj_name)
+        return io.BytesIO(data), record
+
+    def _records(self, bucket_name):
+        with self._lock:
+            objects = list(self._objects.items())
+        for (bucket, obj_name), (_, record) in objects:
+            if bucket == str(bucket_name):
+                yield obj_name, record
+
+    def clear(self):
+        with self._lock:
+            self._objects.clear()
@@ -0,0 +1,173 @@
+import logging
+import os
+import tempfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterator
+from botocore.exceptions import ClientError
+from utils.file_utils.generic_file_utils import (
+    S3_STREAM_CHUNK_SIZE,
+    iter_base64_decode,
+    representative_s3_processor,
+)
+from utils.file_utils.s3_utils import BINARY_BODY_ENCODING, get_body_encoding
+
+logger = logging.getLogger("app_logger")
+
+# Objects fetched at the same time for an export
+S3_EXPORT_CONCURRENCY = int(os.environ.get("S3_EXPORT_CONCURRENCY", "8"))
+# Fetched objects above this size wait on disk instead of in memory
+S3_EXPORT_SPOOL_SIZE = int(os.environ.get("S3_EXPORT_SPOOL_SIZE", str(1024 * 1024)))
+# Already compressed formats are stored as is, deflating them only costs CPU
+STORED_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".gif", ".pdf", ".zip", ".gz")
+
+
+class _ZipSink:
+    """
+    Write only file the archive is written into, drained as the response is streamed.
+    zipfile falls back to data descriptors as it can't seek back into it
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _fetch_object(bucket_name, file_name) -> tuple[tempfile.SpooledTemporaryFile, int]:
+    # Runs in the export thread pool, the raw bytes are spooled so the object's
+    # connection is released as soon as it is read
+    response = representative_s3_processor.get_file(bucket_name, file_name)
+    chunks = response["Body"].iter_chunks(S3_STREAM_CHUNK_SIZE)
+    if get_body_encoding(response) != BINARY_BODY_ENCODING:
+        chunks = iter_base64_decode(chunks)
+
+    spool = tempfile.SpooledTemporaryFile(max_size=S3_EXPORT_SPOOL_SIZE)
+    for chunk in chunks:
+        spool.write(chunk)
+    size = spool.tell()
+    spool.seek(0)
+    return spool, size
+
+
+def _write_zip_entry(
+    archive: zipfile.ZipFile,
+    sink: _ZipSink,
+    name: str,
+    s3_object: dict,
+    spool,
+    size: int,
+) -> Iterator[bytes]:
+    last_modified = s3_object.get("LastModified")
+    date_time = last_modified.timetuple() if last_modified else time.localtime()
+    zip_info = zipfile.ZipInfo(name, date_time=date_time[:6])
+    zip_info.compress_type = (
+        zipfile.ZIP_STORED
+        if name.lower().endswith(STORED_EXTENSIONS)
+        else zipfile.ZIP_DEFLATED
+    )
+
+    with archive.open(
+        zip_info, "w", force_zip64=size > zipfile.ZIP64_LIMIT
+    ) as zip_entry:
+        while chunk := spool.read(S3_STREAM_CHUNK_SIZE):
+            zip_entry.write(chunk)
+            data = sink.drain()
+            if data:
+                yield data
+
+
+def stream_s3_zip(
+    bucket_name,
+    directory: str,
+    exclude_prefixes: tuple[str, ...] = (),
+    concurrency: int = S3_EXPORT_CONCURRENCY,
+) -> Iterator[bytes]:
+    """
+    ZIP archive of every object under <directory>, streamed as it is built
+
+    Objects are fetched <concurrency> at a time and added in the order they arrive,
+    so an export takes about as long as its slowest objects rather than the sum of all.
+    At most 2 * <concurrency> fetched objects are waiting at any time
+
+    Parameters
+    ----------
+    bucket_name: str
+        Bucket to read from
+    directory: str
+        Key prefix to export, entry names are the keys relative to it
+    exclude_prefixes [Optional]: tuple[str]
+        Keys starting with any of these are left out e.g generated files
+
+    Yields
+    ------
+    Chunks of the ZIP file
+    """
+    s3_objects = (
+        s3_object
+        for s3_object in representative_s3_processor.iter_bucket_objects(
+            bucket_name, directory
+        )
+        if not s3_object["Key"].endswith("/")
+        and not s3_object["Key"].startswith(exclude_prefixes)
+    )
+
+    sink = _ZipSink()
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    pending = {}
+
+    def submit_next() -> bool:
+        s3_object = next(s3_objects, None)
+        if s3_object is None:
+            return False
+        future = executor.submit(_fetch_object, bucket_name, s3_object["Key"])
+        pending[future] = s3_object
+        return True
+
+    try:
+        with zipfile.ZipFile(sink, "w") as archive:
+            for _ in range(concurrency * 2):
+                if not submit_next():
+                    break
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    s3_object = pending.pop(future)
+                    submit_next()
+
+                    try:
+                        spool, size = future.result()
+                    except ClientError as e:
+                        # Deleted since it was listed
+                        if e.response.get("Error", {}).get("Code") != "NoSuchKey":
+                            raise
+                        logger.warning(f"Skipping {s3_object['Key']} in export :: {e}")
+                        continue
+
+                    with spool:
+                        yield from _write_zip_entry(
+                            archive,
+                            sink,
+                            s3_object["Key"][len(directory) :],
+                            s3_object,
+                            spool,
+                            size,
+                        )
+
+        # Central directory
+        yield sink.drain()
+    finally:
+        # Client gone or a fetch failed, don't fetch the rest
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,115 @@
+import json
+import logging
+import os
+import threading
+import redis
+from django.contrib.auth.models import Permission
+from utils.redis_utils import get_redis_client, redis_key
+
+logger = logging.getLogger("app_logger")
+
+PERMISSIONS_CACHE_TTL = int(os.environ.get("PERMISSIONS_CACHE_TTL", "3600"))
+PERMISSIONS_LOCAL_CACHE_SIZE = 10000
+
+# Any change to groups, permissions or their assignments bumps the generation.
+# Cached entries are stamped with the generation they were computed in, so a bump
+# retires every entry in every worker at once without having to track who is affected
+_generation_key = redis_key("permissions", "generation")
+_local_generation = 0
+_local_cache: dict[str, tuple[int, frozenset[str]]] = {}
+_lock = threading.Lock()
+
+
+def _current_generation(client: redis.Redis | None) -> int | None:
+    if client is None:
+        return _local_generation
+    try:
+        return int(client.get(_generation_key) or 0)
+    except redis.RedisError as e:
+        logger.error(f"Unable to read permissions cache generation :: {e}")
+        return None
+
+
+def _fetch_permission_codenames(user_id: str) -> frozenset[str]:
+    # Single query for the permissions of all roles the user belongs to
+    return frozenset(
+        Permission.objects.filter(group__user__id=user_id)
+        .values_list("codename", flat=True)
+        .distinct()
+    )
+
+
+def get_user_permission_codenames(user_id) -> frozenset[str]:
+    """
+    Effective permission codenames of a user (union of all their roles)
+
+    Resolution order is process memory -> redis -> DB.
+    In the steady state a lookup costs no DB queries
+
+    Parameters
+    ----------
+    user_id: str | UUID
+        Id of the user
+
+    Returns
+    -------
+    frozenset of permission codenames
+    """
+    user_id = str(user_id)
+    client = get_redis_client()
+    generation = _current_generation(client)
+
+    if generation is None:
+        # Redis is unreachable, don't risk serving anything stale
+        return _fetch_permission_codenames(user_id)
+
+    cached = _local_cache.get(user_id)
+    if cached and cached[0] == generation:
+        return cached[1]
+
+    codenames = None
+    user_key = redis_key("permissions", generation, user_id)
+    if client is not None:
+        try:
+            shared_entry = client.get(user_key)
+            if shared_entry is not None:
+                codenames = frozenset(json.loads(shared_entry))
+        except redis.RedisError as e:
+            logger.error(f"Unable to read cached permissions for {user_id} :: {e}")
+
+    if codenames is None:
+        codenames = _fetch_permission_codenames(user_id)
+        if client is not None:
+            try:
+                client.set(
+                    user_key, json.dumps(sorted(codenames)), ex=PERMISSIONS_CACHE_TTL
+                )
+            except redis.RedisError as e:
+                logger.error(f"Unable to cache permissions for {user_id} :: {e}")
+
+    with _lock:
+        if len(_local_cache) >= PERMISSIONS_LOCAL_CACHE_SIZE:
+            _local_cache.clear()
+        _local_cache[user_id] = (generation, codenames)
+
+    return codenames
+
+
+def invalidate_permissions_cache():
+    """
+    Retires all cached permission sets, locally and for all other workers via redis
+    """
+    global _local_generation
+
+    with _lock:
+        _local_generation += 1
+        _local_cache.clear()
+
+    client = get_redis_client()
+    if client is not None:
+        try:
+            client.incr(_generation_key)
+        except redis.RedisError as e:
+            logger.error(f"Unable to bump permissions cache generation :: {e}")
+
+    logger.info("Permissions cache invalidated")
@@ -0,0 +1,46 @@
+import logging
+import os
+import redis
+import dotenv
+
+dotenv.load_dotenv()
+logger = logging.getLogger("app_logger")
+
+# Re-use the celery broker if no dedicated redis url is set
+REDIS_URL = os.environ.get("REDIS_URL") or os.environ.get("CELERY_BROKER_URL")
+REDIS_KEY_PREFIX = os.environ.get("REDIS_KEY_PREFIX", "fuatilia")
+
+_redis_client = None
+
+
+def get_redis_client() -> redis.Redis | None:
+    """
+    Shared redis client for state that has to be visible to every worker
+    e.g cache generations, counters etc.
+
+    Returns
+    -------
+    redis.Redis client or None if no redis url is configured.
+    Callers are expected to fall back to in-process state on None
+    """
+    global _redis_client
+
+    if not REDIS_URL or not REDIS_URL.startswith(("redis://", "rediss://")):
+        return None
+
+    if _redis_client is None:
+        logger.info("Initiating shared redis client")
+        _redis_client = redis.Redis.from_url(
+            REDIS_URL,
+            password=os.environ.get("REDIS_PASSWORD") or None,
+            socket_timeout=0.5,
+            socket_connect_timeout=0.5,
+        )
+    return _redis_client
+
+
+def redis_key(*parts) -> str:
+    """
+    Namespaced redis key e.g redis_key("permissions", 3, user_id) ---> fuatilia:permissions:3:<user_id>
+    """
+    return ":".join([REDIS_KEY_PREFIX, *[str(part) for part in parts]])
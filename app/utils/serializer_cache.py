@@ -0,0 +1,204 @@
+import logging
+import os
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from apps.helpers.values_serializer import get_values_serializer, serialize_values
+
+logger = logging.getLogger("app_logger")
+
+# Entries are written through on save and dropped on delete/bulk writes,
+# the TTL only catches writes that forgot to call invalidate_serialized
+SERIALIZED_CACHE_TTL = int(os.environ.get("SERIALIZED_CACHE_TTL", str(60 * 60)))
+
+# model ---> serializer classes (variants) whose output is cached per object
+_cached_serializers: dict = {}
+
+
+def _serialized_key(serializer_class, pk) -> str:
+    model = serializer_class.Meta.model
+    # URL kwargs and instances share keys e.g str vs UUID
+    pk = model._meta.pk.to_python(pk)
+    return f"serialized:{model._meta.label_lower}:{serializer_class.__name__}:{pk}"
+
+
+def _is_cached(serializer_class) -> bool:
+    # Unregistered serializers are never invalidated, so they are not cached either
+    return serializer_class in _cached_serializers.get(serializer_class.Meta.model, [])
+
+
+def _serialize(serializer_class, instance) -> dict:
+    # Plain dict, ReturnDict carries a backlink to its serializer
+    return dict(serializer_class(instance).data)
+
+
+def _write_through(model, instances):
+    entries = {
+        _serialized_key(serializer_class, instance.pk): _serialize(
+            serializer_class, instance
+        )
+        for instance in instances
+        for serializer_class in _cached_serializers.get(model, [])
+    }
+    if entries:
+        cache.set_many(entries, SERIALIZED_CACHE_TTL)
+
+
+def refresh_serialized(model, pk):
+    """
+    Re-caches every registered representation of one row from the database
+    """
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None:
+        invalidate_serialized(model, [pk])
+    else:
+        _write_through(model, [instance])
+
+
+def invalidate_serialized(model, pks):
+    """
+    Drops the cached representations of <pks>, for writes that skip save()/delete()
+    e.g queryset .update() or bulk_update. Runs once the current transaction commits
+    """
+    keys = [
+        _serialized_key(serializer_class, pk)
+        for pk in pks
+        for serializer_class in _cached_serializers.get(model, [])
+    ]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def _refresh_on_save(sender, instance, **kwargs):
+    # Serialized from the committed row, the saved instance may hold raw assigned values
+    pk = instance.pk
+    transaction.on_commit(lambda: refresh_serialized(sender, pk))
+
+
+def _invalidate_on_delete(sender, instance, **kwargs):
+    invalidate_serialized(sender, [instance.pk])
+
+
+def _invalidate_on_m2m_change(
+    sender, instance, action, reverse, model, pk_set, **kwargs
+):
+    # <instance>.<relation>.add() etc. only fires m2m_changed, not post_save
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            invalidate_serialized(type(instance), [instance.pk])
+        return
+
+    # Changed from the related side e.g group.user_set.add(user), <model> is the cached one
+    if action in ("post_add", "post_remove"):
+        invalidate_serialized(model, pk_set)
+    elif action == "pre_clear":
+        # The rows are gone by post_clear, which has no pk_set
+        for field in model._meta.many_to_many:
+            if field.remote_field.through is sender:
+                source = field.m2m_field_name()
+                target = field.m2m_reverse_field_name()
+                invalidate_serialized(
+                    model,
+                    sender.objects.filter(**{target: instance.pk}).values_list(
+                        sender._meta.get_field(source).attname, flat=True
+                    ),
+                )
+
+
+def register_serialized_cache(model, *serializer_classes):
+    """
+    Caches the output of <serializer_classes> per <model> row (see serialize_cached),
+    written through on save(), dropped on delete() and on changes to its many to
+    many relations. Call from AppConfig.ready
+    """
+    _cached_serializers[model] = list(serializer_classes)
+    post_save.connect(
+        _refresh_on_save, sender=model, dispatch_uid=f"serialized_save_{model}"
+    )
+    post_delete.connect(
+        _invalidate_on_delete, sender=model, dispatch_uid=f"serialized_delete_{model}"
+    )
+    for field in model._meta.many_to_many:
+        m2m_changed.connect(
+            _invalidate_on_m2m_change,
+            sender=field.remote_field.through,
+            dispatch_uid=f"serialized_m2m_{model}_{field.name}",
+        )
+
+
+def serialize_object_cached(serializer_class, pk) -> dict:
+    """
+    serializer_class(model.objects.get(pk=pk)).data from the cache,
+    the row is only fetched on a miss (raises DoesNotExist as .get does)
+    """
+    model = serializer_class.Meta.model
+    if not _is_cached(serializer_class):
+        return serializer_class(model.objects.get(pk=pk)).data
+
+    key = _serialized_key(serializer_class, pk)
+    data = cache.get(key)
+    if data is None:
+        data = _serialize(serializer_class, model.objects.get(pk=pk))
+        cache.set(key, data, SERIALIZED_CACHE_TTL)
+    return data
+
+
+def serialize_cached(serializer_class, rows) -> list[dict]:
+    """
+    serializer_class(rows, many=True).data assembled from cached per object fragments
+
+    Parameters
+    ----------
+    rows: QuerySet | list
+        A (sliced) queryset only has its primary keys read and the rows missing
+        from the cache fetched in one .values_list() query. A list of instances
+        is used as is for the misses
+
+    Returns
+    -------
+    Serialized rows in the order of <rows>
+    """
+    if not _is_cached(serializer_class):
+        return serialize_values(serializer_class, rows)
+
+    if isinstance(rows, QuerySet):
+        model = rows.model
+        pks = list(rows.values_list("pk", flat=True))
+        instances = None
+    else:
+        if not rows:
+            return []
+        model = type(rows[0])
+        pks = [row.pk for row in rows]
+        instances = {row.pk: row for row in rows}
+
+    if not pks:
+        return []
+
+    keys = {pk: _serialized_key(serializer_class, pk) for pk in pks}
+    cached = cache.get_many(list(keys.values()))
+    missing = [pk for pk in pks if keys[pk] not in cached]
+
+    if missing:
+        values_serializer = get_values_serializer(serializer_class)
+        if instances is None and values_serializer is not None:
+            fetched = {
+                keys[pk]: representation
+                for pk, representation in values_serializer.serialize_by_pk(
+                    model.objects.filter(pk__in=missing)
+                ).items()
+            }
+        else:
+            if instances is None:
+                instances = model.objects.in_bulk(missing)
+            fetched = {
+                keys[pk]: _serialize(serializer_class, instances[pk])
+                for pk in missing
+                # Deleted between reading the page and fetching it
+                if pk in instances
+            }
+        cache.set_many(fetched, SERIALIZED_CACHE_TTL)
+        cached.update(fetched)
+
+    return [cached[keys[pk]] for pk in pks if keys[pk] in cached]